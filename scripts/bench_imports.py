@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the experiment tooling.
+
+Imports each target module in a fresh interpreter with `-X importtime`, takes
+the best of several runs and reports the cumulative import time of the target
+and its heaviest dependencies. Results can be appended to a JSON-lines file
+so import time is tracked across commits.
+
+Usage:
+    python3 scripts/bench_imports.py [modules...] [--repeat N] [--record FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+TARGETS = [
+    'src.network',
+    'src.visualization',
+    'src.analysis',
+    'src.monitoring.cpu_track',
+    'src.monitoring.telemetry',
+    'src.visualization.create_graphs',
+    'src.analysis.compare',
+    'src.network.net',
+]
+
+
+def parse_importtime(stderr, module):
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Interpreter output
+        module: Imported target module
+
+    Returns:
+        Tuple (total, deps): cumulative import time of module and a dict of
+        its direct dependencies -> cumulative time, in microseconds
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # import time: self [us] | cumulative | imported package (indented by depth)
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(cumulative_us)))
+
+    # A module's dependencies are listed right before it, one level deeper
+    index = max(i for i, entry in enumerate(entries) if entry[0] == module)
+    _, depth, total = entries[index]
+    deps = {}
+    for name, dep_depth, cumulative in reversed(entries[:index]):
+        if dep_depth <= depth:
+            break
+        if dep_depth == depth + 1:
+            deps[name] = cumulative
+    return total, deps
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple (total, deps) from parse_importtime(), or None if the import
+        failed (e.g. mininet not installed)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return parse_importtime(result.stderr, module)
+
+
+def bench(module, repeat):
+    """
+    Return (best total ms, {direct dependency: ms}) over repeat runs, or None.
+    """
+    best = None
+    for _ in range(repeat):
+        measured = measure(module)
+        if measured is None:
+            return None
+        if best is None or measured[0] < best[0]:
+            best = measured
+    total, deps = best
+    return total / 1000, {name: us / 1000 for name, us in deps.items()}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark module import times')
+    parser.add_argument('modules', nargs='*', default=TARGETS, help='Modules to import')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per module (best is kept)')
+    parser.add_argument('--top', type=int, default=5, help='Heaviest dependencies listed')
+    parser.add_argument('--record', help='Append results as one JSON line to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        measured = bench(module, args.repeat)
+        if measured is None:
+            print(f"{module:<36} import failed")
+            results[module] = None
+            continue
+        total, deps = measured
+        results[module] = round(total, 2)
+        print(f"{module:<36} {total:8.1f} ms")
+        heaviest = sorted(((ms, name) for name, ms in deps.items()), reverse=True)
+        for ms, name in heaviest[:args.top]:
+            print(f"    {name:<32} {ms:8.1f} ms")
+
+    if args.record:
+        entry = {
+            'time': time.time(),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'import_ms': results,
+        }
+        with open(args.record, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        print(f"  Recorded: {args.record}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,10 @@ CONTROLLER="flood_cont"
 POX_DIR="$HOME/pox"
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 PROJECT_ROOT="$( cd "$SCRIPT_DIR/.." && pwd )"
+# Support modules imported by the controllers, relative to src/. They have no
+# POX dependency; the controllers import them relatively from pox/misc.
+SUPPORT_MODULES="controllers/prefix_trie controllers/runtime_config controllers/detectors
+controllers/rate_export controllers/profiling controllers/flow_table controllers/syn_guard monitoring/telemetry"
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -51,6 +55,9 @@ fi
 POX_MISC_DIR="$POX_DIR/pox/misc"
 mkdir -p "$POX_MISC_DIR"
 cp "$CONTROLLER_FILE" "$POX_MISC_DIR/"
+for module in $SUPPORT_MODULES; do
+    cp "$PROJECT_ROOT/src/${module}.py" "$POX_MISC_DIR/"
+done
 
 echo "Successfully copied ${CONTROLLER}.py to $POX_MISC_DIR"
 echo ""
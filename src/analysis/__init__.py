@@ -0,0 +1,21 @@
+"""Run analysis and comparison module."""
+
+import importlib
+
+# Exported name -> defining submodule, imported lazily by __getattr__
+_EXPORTS = {
+    'summarize_run': '.compare',
+    'compare_runs': '.compare',
+    'RunStore': '.run_store',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import exported names on first access so importing the package stays cheap."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
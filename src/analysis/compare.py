@@ -0,0 +1,446 @@
+"""
+Run comparison analytics.
+
+Computes summary metrics for experiment run directories and compares them
+across controllers:
+- Victim goodput during the attack (probe goodput when the run has probe
+  samples, otherwise the victim port's transmit rate)
+- Victim latency percentiles and probe loss during the attack
+- Peak and mean controller CPU and memory during the attack
+- Time for the controller CPU to recover after the attack
+- Fraction of the attack traffic that never reached the victim
+
+Summaries are cached per run in .summary_cache.json, keyed by the state of
+the run's metrics files, and stale runs are summarized in a process pool.
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ..visualization.loaders import (BANDWIDTH_FILE, CONTROLLER_FILE, PROBE_GOODPUT_FILE,
+                                     PROBE_LATENCY_FILE, TIMESTAMPS_FILE, load_bandwidth,
+                                     load_controller_name, load_controller_usage,
+                                     load_probe_goodput, load_probe_latency,
+                                     load_timestamps, same_sources, source_state)
+
+CACHE_FILE = '.summary_cache.json'
+SUMMARY_VERSION = 2
+
+ATTACKER_INTERFACE = 's1-eth1'  # switch port facing the attacker (h1)
+VICTIM_INTERFACE = 's1-eth2'    # switch port facing the victim (h2)
+RECOVERY_MARGIN = 5.0           # CPU points above the pre-attack mean counted as recovered
+
+# Summary metrics: key -> (report label, True if higher is better)
+METRICS = {
+    'victim_goodput_bps': ('Victim goodput during attack (B/s)', True),
+    'latency_p50_ms': ('Victim latency p50 during attack (ms)', False),
+    'latency_p99_ms': ('Victim latency p99 during attack (ms)', False),
+    'probe_loss_fraction': ('Probe loss during attack', False),
+    'dropped_attack_fraction': ('Dropped attack fraction', True),
+    'cpu_peak': ('Peak controller CPU (%)', False),
+    'cpu_mean': ('Mean controller CPU (%)', False),
+    'mem_peak': ('Peak controller memory (%)', False),
+    'mem_mean': ('Mean controller memory (%)', False),
+    'time_to_recover_s': ('Time to recover (s)', False),
+}
+
+
+def _number(value):
+    """Convert a pandas/numpy scalar to a JSON-friendly float or None."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _between(series, lo, hi):
+    """Return the part of a time-indexed series within [lo, hi]."""
+    return series[(series.index >= lo) & (series.index <= hi)]
+
+
+def find_runs(paths):
+    """
+    Expand paths into run directories.
+
+    A path containing timestamps.txt is a run; otherwise its immediate
+    subdirectories that contain one are used.
+
+    Args:
+        paths: Iterable of run directories or directories of runs
+
+    Returns:
+        Sorted list of run directories
+    """
+    runs = set()
+    for path in paths:
+        if os.path.exists(os.path.join(path, TIMESTAMPS_FILE)):
+            runs.add(path)
+            continue
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                sub = os.path.join(path, name)
+                if os.path.exists(os.path.join(sub, TIMESTAMPS_FILE)):
+                    runs.add(sub)
+    return sorted(runs)
+
+
+def bandwidth_metrics(bw_df, timestamps):
+    """
+    Compute victim goodput and dropped attack fraction from bwm-ng data.
+
+    Goodput is the mean rate the victim's switch port transmitted during the
+    attack. The dropped fraction compares the extra rate the victim port
+    transmitted during the attack with the extra rate the attacker port
+    received, both relative to the pre-attack baseline.
+
+    Args:
+        bw_df: Bandwidth DataFrame from load_bandwidth()
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+
+    Returns:
+        Dict with 'victim_goodput_bps' and 'victim_port_tx_bps' (both the
+        victim port rate), 'attack_offered_bps' and 'dropped_attack_fraction'
+    """
+    start, dos_start, dos_end, _ = timestamps
+    times = pd.to_datetime(bw_df[0], unit='s')
+
+    def rate(interface, column):
+        rows = bw_df[1] == interface
+        return pd.Series(bw_df.loc[rows, column].values, index=times[rows].values)
+
+    victim_tx = rate(VICTIM_INTERFACE, 2)      # bytes/s sent towards the victim
+    attacker_rx = rate(ATTACKER_INTERFACE, 3)  # bytes/s received from the attacker
+
+    goodput = _between(victim_tx, dos_start, dos_end).mean()
+    offered = (_between(attacker_rx, dos_start, dos_end).mean() -
+               _between(attacker_rx, start, dos_start).mean())
+    delivered = goodput - _between(victim_tx, start, dos_start).mean()
+
+    dropped = None
+    if offered > 0 and not math.isnan(delivered):
+        dropped = min(1.0, max(0.0, 1.0 - delivered / offered))
+
+    return {
+        'victim_goodput_bps': _number(goodput),
+        'victim_port_tx_bps': _number(goodput),
+        'attack_offered_bps': _number(offered),
+        'dropped_attack_fraction': _number(dropped),
+    }
+
+
+def probe_metrics(latency, goodput, timestamps):
+    """
+    Compute what the probe host experienced during the attack.
+
+    Args:
+        latency: DataFrame from load_probe_latency() (or None)
+        goodput: Series from load_probe_goodput() (or None)
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+
+    Returns:
+        Dict with 'latency_p50_ms', 'latency_p99_ms', 'probe_loss_fraction'
+        and, when goodput samples exist, 'victim_goodput_bps'
+    """
+    _, dos_start, dos_end, _ = timestamps
+    metrics = {}
+    if latency is not None:
+        attack = _between(latency, dos_start, dos_end)
+        rtt = attack['rtt_ms'].dropna()
+        metrics.update({
+            'latency_p50_ms': _number(rtt.quantile(0.5)) if len(rtt) else None,
+            'latency_p99_ms': _number(rtt.quantile(0.99)) if len(rtt) else None,
+            'probe_loss_fraction': _number(attack['rtt_ms'].isna().mean()) if len(attack) else None,
+        })
+    if goodput is not None:
+        metrics['victim_goodput_bps'] = _number(_between(goodput, dos_start, dos_end).mean())
+    return metrics
+
+
+def controller_metrics(con_df, timestamps):
+    """
+    Compute controller resource metrics for the attack window.
+
+    Time to recover is the delay between the end of the attack and the first
+    smoothed CPU sample within RECOVERY_MARGIN points of the pre-attack mean.
+
+    Args:
+        con_df: DataFrame from load_controller_usage()
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+
+    Returns:
+        Dict with cpu/mem peak and mean values and 'time_to_recover_s'
+    """
+    start, dos_start, dos_end, end = timestamps
+    attack = _between(con_df, dos_start, dos_end)
+    baseline = _between(con_df['cpu'], start, dos_start).mean()
+
+    recover = None
+    after = _between(con_df['cpu'], dos_end, end).rolling(window=3, min_periods=1).mean()
+    if not math.isnan(baseline):
+        recovered = after[after <= baseline + RECOVERY_MARGIN]
+        if len(recovered):
+            recover = (recovered.index[0] - dos_end).total_seconds()
+
+    return {
+        'cpu_peak': _number(attack['cpu'].max()),
+        'cpu_mean': _number(attack['cpu'].mean()),
+        'mem_peak': _number(attack['mem'].max()),
+        'mem_mean': _number(attack['mem'].mean()),
+        'cpu_baseline': _number(baseline),
+        'time_to_recover_s': _number(recover),
+    }
+
+
+def _sources(run_dir):
+    """Metrics files present in a run directory."""
+    return [name for name in (TIMESTAMPS_FILE, BANDWIDTH_FILE, CONTROLLER_FILE,
+                              PROBE_LATENCY_FILE, PROBE_GOODPUT_FILE)
+            if os.path.exists(os.path.join(run_dir, name))]
+
+
+def _cached_summary(run_dir):
+    """
+    Return (summary, state) for a run: summary is None if the cache is stale.
+    """
+    try:
+        with open(os.path.join(run_dir, CACHE_FILE), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    state = source_state(run_dir, _sources(run_dir), cache.get('sources'))
+    if cache.get('version') == SUMMARY_VERSION and same_sources(state, cache.get('sources')):
+        return cache['summary'], state
+    return None, state
+
+
+def _compute_summary(run_dir):
+    """Compute a run summary from its metrics files (no caching)."""
+    timestamps = load_timestamps(run_dir)
+    if timestamps is None:
+        raise ValueError(f"{os.path.join(run_dir, TIMESTAMPS_FILE)} not found or incomplete")
+    start, dos_start, dos_end, end = timestamps
+
+    summary = {
+        'run': os.path.basename(os.path.normpath(run_dir)),
+        'path': os.path.abspath(run_dir),
+        'controller': None,
+        'goodput_source': None,
+        'attack_duration_s': (dos_end - dos_start).total_seconds(),
+        'run_duration_s': (end - start).total_seconds(),
+    }
+    summary.update({metric: None for metric in METRICS})
+
+    bandwidth_file = os.path.join(run_dir, BANDWIDTH_FILE)
+    if os.path.exists(bandwidth_file):
+        summary.update(bandwidth_metrics(load_bandwidth(bandwidth_file), timestamps))
+        summary['goodput_source'] = 'victim_port'
+
+    latency_file = os.path.join(run_dir, PROBE_LATENCY_FILE)
+    goodput_file = os.path.join(run_dir, PROBE_GOODPUT_FILE)
+    latency = load_probe_latency(latency_file) if os.path.exists(latency_file) else None
+    goodput = load_probe_goodput(goodput_file) if os.path.exists(goodput_file) else None
+    summary.update(probe_metrics(latency, goodput, timestamps))
+    if goodput is not None:
+        summary['goodput_source'] = 'probe'
+
+    controller_file = os.path.join(run_dir, CONTROLLER_FILE)
+    if os.path.exists(controller_file):
+        summary['controller'] = load_controller_name(controller_file)
+        summary.update(controller_metrics(load_controller_usage(controller_file), timestamps))
+    return summary
+
+
+def _summarize_and_cache(args):
+    """Compute and cache one run's summary (runs in a worker process)."""
+    run_dir, state = args
+    summary = _compute_summary(run_dir)
+    cache_path = os.path.join(run_dir, CACHE_FILE)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': SUMMARY_VERSION, 'sources': state, 'summary': summary},
+                  f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+    return summary
+
+
+def summarize_run(run_dir, use_cache=True):
+    """
+    Compute the summary metrics of one run.
+
+    Args:
+        run_dir: Run directory containing the metrics files
+        use_cache: Reuse the cached summary if the metrics files are unchanged
+
+    Returns:
+        Dict of run information and the metrics listed in METRICS
+    """
+    summary, state = _cached_summary(run_dir)
+    if summary is not None and use_cache:
+        return summary
+    return _summarize_and_cache((run_dir, state))
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def compare_runs(run_dirs, baseline='flood_cont', use_cache=True, workers=None):
+    """
+    Summarize many runs and compare controllers against a baseline.
+
+    Args:
+        run_dirs: Run directories (or directories of runs)
+        baseline: Controller whose mean metrics the others are compared with
+        use_cache: Reuse cached run summaries
+        workers: Worker processes for stale runs (default: CPU count)
+
+    Returns:
+        Dict with 'runs' (per-run summaries), 'controllers' (mean metrics per
+        controller), 'baseline' and 'deltas' (relative change of each
+        controller's mean metrics versus the baseline)
+    """
+    summaries, stale = [], []
+    for run_dir in find_runs(run_dirs):
+        summary, state = _cached_summary(run_dir)
+        if summary is not None and use_cache:
+            summaries.append(summary)
+        else:
+            stale.append((run_dir, state))
+
+    if workers == 1 or len(stale) <= 1:
+        # Same per-run error handling as the pool below
+        for job in stale:
+            try:
+                summaries.append(_summarize_and_cache(job))
+            except Exception as e:
+                print(f"Error: summarizing {job[0]} failed: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_summarize_and_cache, job) for job in stale]
+            for (run_dir, _), future in zip(stale, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    print(f"Error: summarizing {run_dir} failed: {e}")
+    summaries.sort(key=lambda s: (s['controller'] or '', s['run']))
+
+    groups = {}
+    for summary in summaries:
+        groups.setdefault(summary['controller'] or 'unknown', []).append(summary)
+    controllers = {
+        name: dict({'runs': len(runs)},
+                   **{m: _mean([r[m] for r in runs]) for m in METRICS})
+        for name, runs in groups.items()
+    }
+
+    deltas = {}
+    if baseline in controllers:
+        base = controllers[baseline]
+        for name, metrics in controllers.items():
+            if name == baseline:
+                continue
+            deltas[name] = {
+                m: (metrics[m] - base[m]) / base[m]
+                if metrics[m] is not None and base[m] else None
+                for m in METRICS
+            }
+
+    return {
+        'runs': summaries,
+        'controllers': controllers,
+        'baseline': baseline if baseline in controllers else None,
+        'deltas': deltas,
+    }
+
+
+def _fmt(value, metric=None):
+    if value is None:
+        return '-'
+    if metric in ('dropped_attack_fraction', 'probe_loss_fraction'):
+        return f'{value:.1%}'
+    return f'{value:,.2f}'
+
+
+def format_report(comparison):
+    """
+    Render a comparison as a Markdown report.
+
+    Args:
+        comparison: Result of compare_runs()
+
+    Returns:
+        Report text
+    """
+    metrics = list(METRICS)
+    lines = ['# Run Comparison', '']
+
+    lines += ['## Controllers', '',
+              '| Metric | ' + ' | '.join(comparison['controllers']) + ' |',
+              '|---' * (len(comparison['controllers']) + 1) + '|']
+    lines.append('| Runs | ' + ' | '.join(str(c['runs']) for c in comparison['controllers'].values()) + ' |')
+    for metric in metrics:
+        cells = []
+        for name, values in comparison['controllers'].items():
+            cell = _fmt(values[metric], metric)
+            delta = comparison['deltas'].get(name, {}).get(metric)
+            if delta is not None:
+                cell += f' ({delta:+.0%})'
+            cells.append(cell)
+        lines.append(f'| {METRICS[metric][0]} | ' + ' | '.join(cells) + ' |')
+    if comparison['baseline']:
+        lines += ['', f"Changes in parentheses are relative to `{comparison['baseline']}`."]
+
+    lines += ['', '## Runs', '',
+              '| Run | Controller | ' + ' | '.join(METRICS[m][0] for m in metrics) + ' |',
+              '|---' * (len(metrics) + 2) + '|']
+    for run in comparison['runs']:
+        lines.append(f"| {run['run']} | {run['controller'] or '-'} | " +
+                     ' | '.join(_fmt(run[m], m) for m in metrics) + ' |')
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(comparison, output_dir):
+    """
+    Write report.md and summary.json for a comparison.
+
+    Args:
+        comparison: Result of compare_runs()
+        output_dir: Directory for the report files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    report_file = os.path.join(output_dir, 'report.md')
+    with open(report_file, 'w') as f:
+        f.write(format_report(comparison))
+    summary_file = os.path.join(output_dir, 'summary.json')
+    with open(summary_file, 'w') as f:
+        json.dump(comparison, f, indent=2, sort_keys=True)
+    print(f"  Created: {report_file}")
+    print(f"  Created: {summary_file}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare experiment runs across controllers')
+    parser.add_argument('run_dirs', nargs='+',
+                        help='Run directories, or directories containing runs')
+    parser.add_argument('--output', default='results/comparison',
+                        help='Directory for report.md and summary.json')
+    parser.add_argument('--baseline', default='flood_cont',
+                        help='Controller the others are compared with')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recompute all run summaries')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    comparison = compare_runs(args.run_dirs, baseline=args.baseline,
+                              use_cache=not args.no_cache, workers=args.workers)
+    print(f"* Compared {len(comparison['runs'])} runs across "
+          f"{len(comparison['controllers'])} controllers")
+    write_report(comparison, args.output)
@@ -0,0 +1,970 @@
+"""
+Run store: one directory per experiment run, a queryable index and archives.
+
+Layout of a store root:
+
+    runs/<run id>/       metrics files of one run and its manifest.json
+    index.jsonl          one JSON line per run: identity, configuration,
+                         location and summary metrics
+    archive/<month>.npz  compacted runs started in that month (UTC)
+
+A run ID is the UTC start time plus a short hash of the run configuration
+(e.g. 20261019-142501-3fa9c2), so IDs sort chronologically and repeated runs
+of one configuration share a suffix. The manifest records the configuration
+(including the POX controller module and its arguments, read from the running
+controller process), timing, host information and tool versions.
+
+The index is append-only: a run gets a line when it starts and another when it
+finishes, and the last line for a run ID wins. Querying thousands of runs
+therefore reads one small file instead of every run directory.
+
+The controller runs before net.py creates a run, so its per-run outputs
+need a directory that exists in advance: reserve() creates an empty run
+directory that create() adopts when given the same ID. ROOT/current always
+points at the latest run, for outputs written during the run such as
+profile sessions.
+
+Compaction moves finished runs past the retention limits into monthly
+archives. Each metrics table of all runs in an archive is stored column by
+column (one .npy per column, plus a run index column); lines that would not
+format back to the same text are stored verbatim. Every other file of a run,
+such as rate_hist.bin, profiles and telemetry recordings, is stored byte for
+byte; only plots and caches, which are rebuilt from the metrics, are dropped.
+A run directory is only removed once every file it holds reads back from the
+archive byte for byte. Archives are written deterministically: the same runs
+always give byte-identical files. extract() writes an archived run back
+exactly as it was.
+
+Usage:
+    python3 -m src.analysis.run_store list [--controller NAME] [--json]
+    python3 -m src.analysis.run_store compact [--keep N] [--older-than DAYS]
+    python3 -m src.analysis.run_store reserve [RUN_ID]
+    python3 -m src.analysis.run_store extract RUN_ID [--output DIR]
+"""
+
+import calendar
+import hashlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import zipfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+STORE_ROOT = 'results/store'
+RUNS_DIR = 'runs'
+ARCHIVE_DIR = 'archive'
+INDEX_FILE = 'index.jsonl'
+MANIFEST_FILE = 'manifest.json'
+TIMESTAMPS_FILE = 'timestamps.txt'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETE = 'complete'
+STATUS_FAILED = 'failed'
+
+# Tool name -> command printing its version
+TOOLS = {
+    'hping3': ['hping3', '-v'],
+    'bwm-ng': ['bwm-ng', '-V'],
+    'mininet': ['mn', '--version'],
+}
+PACKAGES = ('numpy', 'pandas', 'matplotlib', 'psutil', 'mininet')
+
+CURRENT_LINK = 'current'  # symlink to the directory of the latest run
+MANIFEST_VERSION = 1
+ARCHIVE_VERSION = 3
+
+CONTROLLER_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'  # as written by cpu_track.py
+
+
+# bwm-ng CSV columns after the timestamp and interface (-T rate)
+BANDWIDTH_COLUMNS = ('tx_bps', 'rx_bps', 'total_bps', 'bytes_in', 'bytes_out',
+                     'packets_out_s', 'packets_in_s', 'packets_total_s', 'packets_in',
+                     'packets_out', 'errors_out_s', 'errors_in_s', 'errors_in', 'errors_out')
+
+
+def _decimal(text):
+    """Value and number of decimals of a plain decimal number such as '20.00'."""
+    whole, _, fraction = text.lstrip('-').partition('.')
+    if not whole.isdigit() or (fraction and not fraction.isdigit()) or text.endswith('.'):
+        raise ValueError(f"not a plain decimal number: {text!r}")
+    return float(text), len(fraction)
+
+
+def _parse_bandwidth(line):
+    # Any number of numeric fields; 'layout' keeps their count and decimals
+    parts = line.split(',')
+    if len(parts) < 3 or len(parts) > 2 + len(BANDWIDTH_COLUMNS):
+        raise ValueError(f"unexpected bwm-ng line: {line!r}")
+    numbers = [_decimal(part) for part in [parts[0]] + parts[2:]]
+    values = [value for value, _ in numbers[1:]]
+    values += [math.nan] * (len(BANDWIDTH_COLUMNS) - len(values))
+    return (numbers[0][0], parts[1], *values, ' '.join(str(d) for _, d in numbers))
+
+
+def _format_bandwidth(t, interface, *values):
+    *values, layout = values
+    decimals = [int(d) for d in layout.split()]
+    fields = [f"{value:.{d}f}" for value, d in zip([t] + values, decimals)]
+    return ','.join([fields[0], interface] + fields[1:])
+
+
+def _parse_controller(line):
+    # Times are kept as written (local wall clock), encoded as if UTC
+    parts = line.split(', ', 3)
+    return (calendar.timegm(time.strptime(parts[0], CONTROLLER_TIME_FORMAT)),
+            float(parts[1].replace('CPU: ', '').rstrip('%')),
+            float(parts[2].replace('MEM: ', '').rstrip('%')),
+            parts[3][len('CMD: '):] if parts[3].startswith('CMD: ') else parts[3])
+
+
+def _format_controller(t, cpu, mem, command):
+    return (f"{time.strftime(CONTROLLER_TIME_FORMAT, time.gmtime(t))}, "
+            f"CPU: {cpu:.2f}%, MEM: {mem:.2f}%, CMD: {command}")
+
+
+def _parse_latency(line):
+    t, seq, rtt = line.split(',')
+    return float(t), int(seq), float(rtt) if rtt else math.nan
+
+
+def _format_latency(t, seq, rtt):
+    return f"{t:.6f},{seq}," + ('' if math.isnan(rtt) else f"{rtt:.3f}")
+
+
+def _parse_goodput(line):
+    t, goodput = line.split(',')
+    return float(t), float(goodput)
+
+
+def _format_goodput(t, goodput):
+    return f"{t:.6f},{goodput:.1f}"
+
+
+def _parse_flow_table(line):
+    t, dpid, entries, capacity, evictions = line.split(',')
+    return float(t), dpid, int(entries), int(capacity), int(evictions)
+
+
+def _format_flow_table(t, dpid, entries, capacity, evictions):
+    return f"{t:.3f},{dpid},{entries},{capacity},{evictions}"
+
+
+# Archived metrics tables: name -> (file, columns, parse, format). A column is
+# (name, kind) with kind 'f' (float64), 'i' (int64) or 's' (string, stored as
+# codes into a table of distinct values). Lines that do not format back to
+# exactly the same text are archived verbatim instead (see _read_table())
+TABLES = {
+    'bandwidth': ('bandwidth.txt',
+                  (('time', 'f'), ('interface', 's'),
+                   *((column, 'f') for column in BANDWIDTH_COLUMNS), ('layout', 's')),
+                  _parse_bandwidth, _format_bandwidth),
+    'controller': ('controller_usage.txt',
+                   (('time', 'f'), ('cpu', 'f'), ('mem', 'f'), ('command', 's')),
+                   _parse_controller, _format_controller),
+    'latency': ('probe_latency.txt',
+                (('time', 'f'), ('seq', 'i'), ('rtt_ms', 'f')),
+                _parse_latency, _format_latency),
+    'goodput': ('probe_goodput.txt',
+                (('time', 'f'), ('goodput', 'f')),
+                _parse_goodput, _format_goodput),
+    'flow_table': ('flow_table.txt',
+                   (('time', 'f'), ('dpid', 's'), ('entries', 'i'), ('capacity', 'i'),
+                    ('evictions', 'i')),
+                   _parse_flow_table, _format_flow_table),
+}
+
+
+def _regenerated(path):
+    """
+    True for files compaction does not keep: rendered plots and caches, which
+    create_graphs.py and compare.py rebuild from the archived metrics.
+    """
+    return path.endswith('.png') or os.path.basename(path).startswith('.')
+
+
+def _command_output(cmd, cwd=None):
+    """First line printed by a command, or None if it cannot be run."""
+    try:
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    lines = (result.stdout + result.stderr).strip().splitlines()
+    return lines[0].strip() if lines else None
+
+
+def git_revision(path=PROJECT_ROOT):
+    """
+    Describe the git checkout at path.
+
+    Returns:
+        Dict with 'commit' and 'dirty' (uncommitted changes), or None
+    """
+    commit = _command_output(['git', 'rev-parse', 'HEAD'], cwd=path)
+    if not commit or len(commit) != 40:
+        return None
+    status = _command_output(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=path)
+    return {'commit': commit, 'dirty': bool(status)}
+
+
+def host_info():
+    """Hostname, OS, CPU and memory of this machine."""
+    cpu_model = None
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu_model = line.partition(':')[2].strip()
+                    break
+    except OSError:
+        pass
+    try:
+        memory = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        memory = None
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'kernel': platform.release(),
+        'machine': platform.machine(),
+        'cpu_model': cpu_model,
+        'cpu_count': os.cpu_count(),
+        'memory_bytes': memory,
+    }
+
+
+def tool_versions(pox_dir=None):
+    """
+    Versions of Python, the packages and command line tools a run depends on,
+    and the git revisions of this project and of POX.
+    """
+    from importlib import metadata
+
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'packages': packages,
+        'tools': {name: _command_output(cmd) for name, cmd in TOOLS.items()},
+        'revision': git_revision(),
+        'pox_revision': git_revision(pox_dir) if pox_dir else None,
+    }
+
+
+def parse_pox_command(cmdline):
+    """
+    Find the controller component in a POX command line.
+
+    Args:
+        cmdline: Arguments, e.g. ['./pox.py', 'log.level', '--DEBUG',
+            'misc.rate_limit', '--threshold=100', '--syn_guard']
+
+    Returns:
+        Tuple (module, args): ('rate_limit', {'threshold': '100',
+        'syn_guard': True}), or (None, {}) if no misc.* component is given
+    """
+    module, args = None, {}
+    for arg in cmdline:
+        if not arg.startswith('-'):
+            if module is not None:
+                break
+            if arg.startswith('misc.'):
+                module = arg[len('misc.'):]
+        elif module is not None:
+            key, sep, value = arg.lstrip('-').partition('=')
+            args[key] = value if sep else True
+    return module, args
+
+
+def controller_info():
+    """
+    Describe the running POX controller.
+
+    Returns:
+        Dict with 'module', 'args', 'pid', 'command' and 'cwd', or None if
+        no controller is running (or psutil is not installed)
+    """
+    try:
+        import psutil
+        from ..monitoring.cpu_track import get_pox_pid
+    except ImportError:
+        return None
+    pid = get_pox_pid()
+    if pid is None:
+        return None
+    try:
+        proc = psutil.Process(pid)
+        cmdline, cwd = proc.cmdline(), proc.cwd()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+    module, args = parse_pox_command(cmdline)
+    return {'module': module, 'args': args, 'pid': pid, 'command': ' '.join(cmdline), 'cwd': cwd}
+
+
+def config_hash(config):
+    """SHA-1 of a configuration in canonical JSON form."""
+    canonical = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def new_run_id(config, now=None):
+    """Run ID from the UTC start time and the configuration hash."""
+    now = time.time() if now is None else now
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(now))}-{config_hash(config)[:6]}"
+
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(run_dir):
+    """Return the manifest of a run directory, or None if it has none."""
+    try:
+        with open(os.path.join(run_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_manifest(config, run_id=None):
+    """
+    Build the manifest of a run that is about to start.
+
+    The running controller's module and arguments are added to the
+    configuration before it is hashed.
+
+    Args:
+        config: JSON-serializable run configuration (topology, durations, ...)
+        run_id: Run ID (default: new_run_id())
+
+    Returns:
+        The manifest
+    """
+    controller = controller_info()
+    config = dict(config)
+    config['controller'] = ({'module': controller['module'], 'args': controller['args']}
+                            if controller else None)
+    started = time.time()
+    return {
+        'version': MANIFEST_VERSION,
+        'id': run_id or new_run_id(config, started),
+        'status': STATUS_RUNNING,
+        'config': config,
+        'config_hash': config_hash(config),
+        'controller_command': controller['command'] if controller else None,
+        'argv': sys.argv,
+        'timing': {'started': started, 'ended': None, 'phases': None},
+        'host': host_info(),
+        'tools': tool_versions(controller['cwd'] if controller else None),
+        'files': None,
+        'summary': None,
+    }
+
+
+def start_manifest(run_dir, manifest):
+    """Write the manifest from build_manifest() into a new run directory."""
+    os.makedirs(run_dir, exist_ok=True)
+    _write_json(os.path.join(run_dir, MANIFEST_FILE), manifest)
+
+
+def _read_timestamps(run_dir):
+    """Raw epoch timestamps of a run (at most four), or [] if there are none."""
+    try:
+        with open(os.path.join(run_dir, TIMESTAMPS_FILE)) as f:
+            return [float(line) for line in f if line.strip()][:4]
+    except (OSError, ValueError):
+        return []
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def finish_manifest(run_dir, status=STATUS_COMPLETE):
+    """
+    Complete the manifest of a finished run.
+
+    Adds the end time, the experiment phases from timestamps.txt, size and
+    hash of every file in the run directory and, when pandas is available,
+    the run's summary metrics from compare.py.
+
+    Args:
+        run_dir: Run directory with a manifest from start_manifest()
+        status: STATUS_COMPLETE or STATUS_FAILED
+
+    Returns:
+        The updated manifest
+    """
+    manifest = read_manifest(run_dir)
+    if manifest is None:
+        raise ValueError(f"{os.path.join(run_dir, MANIFEST_FILE)} not found")
+    manifest['status'] = status
+    manifest['timing']['ended'] = time.time()
+    phases = _read_timestamps(run_dir)
+    if phases:
+        manifest['timing']['phases'] = dict(zip(('start', 'attack_start', 'attack_end', 'end'),
+                                                phases))
+
+    manifest['files'] = {
+        name: {'size': os.path.getsize(path), 'sha1': _file_sha1(path)}
+        for name, path in ((name, os.path.join(run_dir, name)) for name in sorted(os.listdir(run_dir)))
+        if os.path.isfile(path) and name != MANIFEST_FILE and not name.startswith('.')
+    }
+
+    try:
+        from .compare import summarize_run
+        summary = summarize_run(run_dir)
+        manifest['summary'] = {k: v for k, v in summary.items() if k not in ('run', 'path')}
+    except ImportError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"** Run summary not available: {e}")
+
+    _write_json(os.path.join(run_dir, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def _index_entry(manifest, location):
+    """Index line of a run: what queries filter and sort on."""
+    config = manifest['config']
+    controller = config.get('controller') or {}
+    summary = manifest.get('summary') or {}
+    revision = manifest['tools'].get('revision') or {}
+    return {
+        'id': manifest['id'],
+        'status': manifest['status'],
+        'started': manifest['timing']['started'],
+        'ended': manifest['timing']['ended'],
+        'topology': config.get('topology'),
+        'controller': controller.get('module') or summary.get('controller'),
+        'controller_args': controller.get('args'),
+        'config_hash': manifest['config_hash'],
+        'revision': revision.get('commit'),
+        'location': location,
+        'summary': summary or None,
+    }
+
+
+def _write_npz(path, arrays):
+    """
+    Write arrays as an .npz file with fixed member timestamps and order, so
+    equal arrays always give identical bytes.
+    """
+    import numpy as np
+
+    tmp_path = path + '.tmp'
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for key in sorted(arrays):
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, np.asarray(arrays[key]), allow_pickle=False)
+            info = zipfile.ZipInfo(key + '.npy', date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, buffer.getvalue())
+    os.replace(tmp_path, path)
+
+
+def _read_table(text, columns, parse, format_row):
+    """
+    Split the text of a metrics file into columns and verbatim lines.
+
+    A line is stored in the columns only if formatting its parsed row gives
+    the line back exactly; partial, malformed or differently formatted lines
+    are kept as text with their line number, so the file can be rebuilt byte
+    for byte.
+
+    Returns:
+        Dict of column name -> array, plus 'lines.number' and 'lines.text'
+    """
+    import numpy as np
+
+    rows, numbers, texts = [], [], []
+    for number, line in enumerate(text.split('\n')):
+        try:
+            row = parse(line)
+            if format_row(*row) == line:
+                rows.append(row)
+                continue
+        except (ValueError, IndexError):
+            pass
+        numbers.append(number)
+        texts.append(line)
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    table = {
+        column: np.array(column_values, dtype={'f': np.float64, 'i': np.int64, 's': str}[kind])
+        for (column, kind), column_values in zip(columns, values)
+    }
+    table['lines.number'] = np.array(numbers, dtype=np.int64)
+    table['lines.text'] = np.array(texts, dtype=str)
+    return table
+
+
+def _format_table(table, columns, format_row):
+    """Rebuild the text of a metrics file from _read_table() output."""
+    rows = iter(zip(*(table[column].tolist() for column, _ in columns)))
+    verbatim = dict(zip(table['lines.number'].tolist(), table['lines.text'].tolist()))
+    lines = [verbatim[number] if number in verbatim else format_row(*next(rows))
+             for number in range(len(table[columns[0][0]]) + len(verbatim))]
+    return '\n'.join(lines)
+
+
+def _run_files(run_dir):
+    """Relative path -> bytes of every file of a run that compaction keeps."""
+    files = {}
+    for directory, _, names in os.walk(run_dir):
+        for name in names:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, run_dir)
+            if _regenerated(relative) or not os.path.isfile(path):
+                continue
+            with open(path, 'rb') as f:
+                files[relative] = f.read()
+    return files
+
+
+def _read_run(run_dir, manifest):
+    """
+    Load a run directory as an archive record.
+
+    Metrics files in TABLES are split into columns (see _read_table()).
+    Every other file (hping3 output, rate histograms, profiles, telemetry
+    recordings, ...) is kept byte for byte, except plots and caches (see
+    _regenerated()).
+
+    Returns:
+        Dict with 'id', 'manifest' (manifest.json text), 'timestamps',
+        'tables' (table name -> column name -> array) for the metrics files
+        present and 'files' (relative path -> bytes)
+    """
+    files = _run_files(run_dir)
+    timestamps = _read_timestamps(run_dir)
+    record = {
+        'id': manifest['id'],
+        'manifest': files.pop(MANIFEST_FILE).decode(),
+        'timestamps': timestamps + [math.nan] * (4 - len(timestamps)),
+        'tables': {},
+        'files': files,
+    }
+    for name, (filename, columns, parse, format_row) in TABLES.items():
+        if filename not in files:
+            continue
+        try:
+            text = files[filename].decode()
+        except UnicodeDecodeError:
+            continue  # archived as bytes
+        record['tables'][name] = _read_table(text, columns, parse, format_row)
+        del files[filename]
+    return record
+
+
+def _build_archive(records):
+    """Columnar archive arrays from records sorted by run ID."""
+    import numpy as np
+
+    arrays = {
+        'version': np.array(ARCHIVE_VERSION),
+        'runs': np.array([r['id'] for r in records], dtype=str),
+        'manifests': np.array([r['manifest'] for r in records], dtype=str),
+        'timestamps': np.array([r['timestamps'] for r in records], dtype=np.float64).reshape(-1, 4),
+    }
+    # Other files as one byte column plus per-file run, path and size
+    files = [(i, path, data) for i, r in enumerate(records) for path, data in sorted(r['files'].items())]
+    arrays['file.run'] = np.array([i for i, _, _ in files], dtype=np.int32)
+    arrays['file.path'] = np.array([path for _, path, _ in files], dtype=str)
+    arrays['file.size'] = np.array([len(data) for _, _, data in files], dtype=np.int64)
+    arrays['file.data'] = np.frombuffer(b''.join(data for _, _, data in files), dtype=np.uint8)
+
+    for name, (_, columns, _, _) in TABLES.items():
+        parts = [(i, r['tables'][name]) for i, r in enumerate(records) if name in r['tables']]
+        # Runs with the table, including those whose lines are all verbatim
+        arrays[f'{name}.runs'] = np.array([i for i, _ in parts], dtype=np.int32)
+        for key, rows in (('run', 'time'), ('lines.run', 'lines.number')):
+            arrays[f'{name}.{key}'] = np.concatenate(
+                [np.full(len(table[rows]), i, dtype=np.int32) for i, table in parts] +
+                [np.zeros(0, dtype=np.int32)])
+        for column, kind in columns + (('lines.number', 'i'), ('lines.text', 'S')):
+            dtype = {'f': np.float64, 'i': np.int64, 's': str, 'S': str}[kind]
+            values = np.concatenate([table[column].astype(dtype) for _, table in parts] +
+                                    [np.zeros(0, dtype=dtype)])
+            if kind == 's':
+                distinct, codes = np.unique(values, return_inverse=True)
+                arrays[f'{name}.{column}'] = codes.astype(np.int32)
+                arrays[f'{name}.{column}.values'] = distinct
+            else:
+                arrays[f'{name}.{column}'] = values
+    return arrays
+
+
+def _read_archive(path):
+    """Split an archive back into records (see _read_run())."""
+    import numpy as np
+
+    with np.load(path) as npz:
+        data = {key: npz[key] for key in npz.files}
+    if int(data['version']) != ARCHIVE_VERSION:
+        raise ValueError(f"{path}: unsupported archive version {int(data['version'])}")
+
+    records = [{
+        'id': str(run_id),
+        'manifest': str(data['manifests'][i]),
+        'timestamps': [float(t) for t in data['timestamps'][i]],
+        'tables': {},
+        'files': {},
+    } for i, run_id in enumerate(data['runs'])]
+
+    blob = data['file.data'].tobytes()
+    offset = 0
+    for i, path, size in zip(data['file.run'], data['file.path'], data['file.size']):
+        records[i]['files'][str(path)] = blob[offset:offset + size]
+        offset += size
+
+    for name, (_, columns, _, _) in TABLES.items():
+        runs, line_runs = data[f'{name}.run'], data[f'{name}.lines.run']
+        for i in data[f'{name}.runs']:
+            rows, lines = runs == i, line_runs == i
+            table = {}
+            for column, kind in columns:
+                values = data[f'{name}.{column}'][rows]
+                table[column] = data[f'{name}.{column}.values'][values] if kind == 's' else values
+            table['lines.number'] = data[f'{name}.lines.number'][lines]
+            table['lines.text'] = data[f'{name}.lines.text'][lines]
+            records[i]['tables'][name] = table
+    return records
+
+
+def _record_files(record):
+    """Relative path -> bytes of the run directory an archive record describes."""
+    files = dict(record['files'])
+    files[MANIFEST_FILE] = record['manifest'].encode()
+    for name, table in record['tables'].items():
+        filename, columns, _, format_row = TABLES[name]
+        files[filename] = _format_table(table, columns, format_row).encode()
+    return files
+
+
+def _write_run(record, run_dir):
+    """Write an archive record back as the files of a run directory."""
+    for relative, data in _record_files(record).items():
+        path = os.path.join(run_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+class RunStore:
+    """Directory of experiment runs with an index and monthly archives."""
+
+    def __init__(self, root=STORE_ROOT):
+        """
+        Initialize store.
+
+        Args:
+            root: Store directory (created on first write)
+        """
+        self.root = root
+        self.index_file = os.path.join(root, INDEX_FILE)
+
+    def run_dir(self, run_id):
+        """Directory of a run that has not been compacted."""
+        return os.path.join(self.root, RUNS_DIR, run_id)
+
+    def _append_index(self, entry):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_file, 'a') as f:
+            f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+    def _read_index(self):
+        """Return run ID -> latest index entry."""
+        entries = {}
+        try:
+            with open(self.index_file) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # partially written line
+                    entries[entry['id']] = entry
+        except OSError:
+            pass
+        return entries
+
+    def _write_index(self, entries):
+        """Rewrite the index with one line per run, ordered by run ID."""
+        tmp_path = self.index_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for run_id in sorted(entries):
+                f.write(json.dumps(entries[run_id], sort_keys=True) + '\n')
+        os.replace(tmp_path, self.index_file)
+
+    def reserve(self, run_id=None):
+        """
+        Create an empty run directory ahead of the run.
+
+        The controller is started before net.py, so its outputs (rate_log,
+        flow_log, profile) can only be pointed into a run directory that
+        already exists. A reserved directory is adopted by create() when it
+        is given the same run ID.
+
+        Args:
+            run_id: Run ID (default: UTC time and a random suffix)
+
+        Returns:
+            Run ID
+        """
+        if run_id is None:
+            run_id = f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}-{os.urandom(3).hex()}"
+        if run_id in self._read_index() or os.path.exists(self.run_dir(run_id)):
+            raise ValueError(f"run {run_id} already exists in {self.root}")
+        os.makedirs(self.run_dir(run_id))
+        return run_id
+
+    def _reserved(self, run_id, known):
+        """True if run_id names a directory from reserve() not yet used by a run."""
+        return (run_id not in known and os.path.isdir(self.run_dir(run_id)) and
+                read_manifest(self.run_dir(run_id)) is None)
+
+    def _point_current(self, run_id):
+        """Point the CURRENT_LINK symlink at a run directory."""
+        link = os.path.join(self.root, CURRENT_LINK)
+        tmp_link = link + '.tmp'
+        try:
+            if os.path.lexists(tmp_link):
+                os.remove(tmp_link)
+            os.symlink(os.path.join(RUNS_DIR, run_id), tmp_link)
+            os.replace(tmp_link, link)
+        except OSError as e:
+            print(f"** Cannot update {link}: {e}")
+
+    def create(self, config, run_id=None):
+        """
+        Create the directory and manifest of a new run.
+
+        Args:
+            config: JSON-serializable run configuration
+            run_id: Run ID (default: from start time and configuration). A
+                directory reserved with reserve() is adopted; otherwise a
+                numeric suffix is added if the ID is taken
+
+        Returns:
+            Run ID; the run's files go into run_dir(run_id), which
+            ROOT/current points to until the next run is created
+        """
+        manifest = build_manifest(config, run_id)
+        known = self._read_index()
+        base = run_id = manifest['id']
+        n = 1
+        while not self._reserved(run_id, known) and (
+                run_id in known or os.path.exists(self.run_dir(run_id))):
+            n += 1
+            run_id = f"{base}-{n}"
+        manifest['id'] = run_id
+        start_manifest(self.run_dir(run_id), manifest)
+        self._append_index(_index_entry(manifest, os.path.join(RUNS_DIR, run_id)))
+        self._point_current(run_id)
+        print(f"* Run {run_id} in {self.run_dir(run_id)}")
+        return run_id
+
+    def finish(self, run_id, status=STATUS_COMPLETE):
+        """
+        Complete a run's manifest and index entry.
+
+        Returns:
+            The run's manifest
+        """
+        manifest = finish_manifest(self.run_dir(run_id), status)
+        self._append_index(_index_entry(manifest, os.path.join(RUNS_DIR, run_id)))
+        return manifest
+
+    def runs(self, since=None, until=None, **filters):
+        """
+        Query the index.
+
+        Args:
+            since, until: Only runs started within [since, until) (epoch)
+            **filters: Index fields and required values, e.g.
+                controller='rate_limit', status=STATUS_COMPLETE
+
+        Returns:
+            Matching index entries ordered by run ID
+        """
+        matches = []
+        for run_id, entry in sorted(self._read_index().items()):
+            if since is not None and entry['started'] < since:
+                continue
+            if until is not None and entry['started'] >= until:
+                continue
+            if all(entry.get(key) == value for key, value in filters.items()):
+                matches.append(entry)
+        return matches
+
+    def get(self, run_id):
+        """Index entry of a run, or None."""
+        return self._read_index().get(run_id)
+
+    def compact(self, keep=100, older_than=None, now=None):
+        """
+        Move finished runs into the monthly archives.
+
+        A run is compacted when it is not among the keep most recent runs
+        still stored as directories and, if older_than is given, started more
+        than older_than seconds ago. Runs already archived for the same month
+        are merged with the new ones. The index is updated before the run
+        directories are removed.
+
+        Args:
+            keep: Most recent finished runs kept as directories
+            older_than: Minimum age in seconds (default: no age limit)
+            now: Current time (default: time.time())
+
+        Returns:
+            List of archive files written
+        """
+        now = time.time() if now is None else now
+        entries = self._read_index()
+        stored = sorted((entry for entry in entries.values()
+                         if entry['location'].startswith(RUNS_DIR) and entry['status'] != STATUS_RUNNING),
+                        key=lambda entry: (entry['started'], entry['id']))
+        candidates = stored[:max(0, len(stored) - keep)]
+        if older_than is not None:
+            candidates = [e for e in candidates if e['started'] < now - older_than]
+
+        months = {}
+        for entry in candidates:
+            month = time.strftime('%Y-%m', time.gmtime(entry['started']))
+            months.setdefault(month, []).append(entry)
+
+        written = []
+        os.makedirs(os.path.join(self.root, ARCHIVE_DIR), exist_ok=True)
+        for month, month_entries in sorted(months.items()):
+            location = os.path.join(ARCHIVE_DIR, f'{month}.npz')
+            path = os.path.join(self.root, location)
+            records = {r['id']: r for r in (_read_archive(path) if os.path.exists(path) else [])}
+            for entry in month_entries:
+                run_dir = self.run_dir(entry['id'])
+                manifest = read_manifest(run_dir)
+                if manifest is None:
+                    print(f"Error: {run_dir} has no manifest, not archived")
+                    continue
+                records[entry['id']] = _read_run(run_dir, manifest)
+            _write_npz(path, _build_archive([records[i] for i in sorted(records)]))
+            # Only delete runs whose files read back from the archive byte for byte
+            stored = {r['id']: r for r in _read_archive(path)}
+            archived = []
+            for entry in month_entries:
+                run_dir = self.run_dir(entry['id'])
+                if entry['id'] not in stored:
+                    continue
+                if _record_files(stored[entry['id']]) != _run_files(run_dir):
+                    print(f"Error: {run_dir} does not read back from {path}, not removed")
+                    continue
+                archived.append(entry)
+            written.append(path)
+            print(f"  Created: {path} ({len(records)} runs)")
+            for entry in archived:
+                entries[entry['id']] = dict(entry, location=location)
+            self._write_index(entries)
+            for entry in archived:
+                shutil.rmtree(self.run_dir(entry['id']))
+        return written
+
+    def extract(self, run_id, output_dir):
+        """
+        Write an archived run back as metrics files.
+
+        Args:
+            run_id: Run ID
+            output_dir: Directory receiving the run directory <run_id>
+
+        Returns:
+            Path of the run directory (the stored directory itself if the
+            run has not been compacted)
+        """
+        entry = self.get(run_id)
+        if entry is None:
+            raise KeyError(f"run {run_id} not in {self.index_file}")
+        if entry['location'].startswith(RUNS_DIR):
+            return self.run_dir(run_id)
+        for record in _read_archive(os.path.join(self.root, entry['location'])):
+            if record['id'] == run_id:
+                run_dir = os.path.join(output_dir, run_id)
+                _write_run(record, run_dir)
+                return run_dir
+        raise KeyError(f"run {run_id} not in {entry['location']}")
+
+
+def _fmt(value):
+    return '-' if value is None else f'{value:,.2f}'
+
+
+def main(argv=None):
+    """Command line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query, compact and extract stored runs')
+    parser.add_argument('--root', default=STORE_ROOT, help='Run store directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+    ls = sub.add_parser('list', help='List runs from the index')
+    ls.add_argument('--controller', help='Only runs of this controller module')
+    ls.add_argument('--topology', help='Only runs on this topology')
+    ls.add_argument('--status', help='Only runs with this status')
+    ls.add_argument('--since', type=float, help='Only runs started in the last N days')
+    ls.add_argument('--json', action='store_true', help='Print index entries as JSON lines')
+    compact = sub.add_parser('compact', help='Move old runs into monthly archives')
+    compact.add_argument('--keep', type=int, default=100,
+                         help='Most recent runs kept as directories')
+    compact.add_argument('--older-than', type=float, default=None,
+                         help='Only compact runs older than N days')
+    reserve = sub.add_parser('reserve', help='Create an empty run directory and print its ID')
+    reserve.add_argument('run_id', nargs='?', help='Run ID (default: generated)')
+    extract = sub.add_parser('extract', help='Write an archived run back as metrics files')
+    extract.add_argument('run_id')
+    extract.add_argument('--output', default='results/extracted',
+                         help='Directory receiving the run directory')
+    args = parser.parse_args(argv)
+
+    store = RunStore(args.root)
+    if args.command == 'list':
+        filters = {key: getattr(args, key) for key in ('controller', 'topology', 'status')
+                   if getattr(args, key) is not None}
+        since = time.time() - args.since * 86400 if args.since is not None else None
+        entries = store.runs(since=since, **filters)
+        for entry in entries:
+            if args.json:
+                print(json.dumps(entry, sort_keys=True))
+                continue
+            summary = entry['summary'] or {}
+            print(f"{entry['id']:<26} {entry['status']:<9} {entry['controller'] or '-':<12} "
+                  f"{entry['topology'] or '-':<9} goodput {_fmt(summary.get('victim_goodput_bps')):>12} "
+                  f"cpu peak {_fmt(summary.get('cpu_peak')):>7}  {entry['location']}")
+        if not args.json:
+            print(f"* {len(entries)} runs")
+    elif args.command == 'compact':
+        older_than = args.older_than * 86400 if args.older_than is not None else None
+        written = store.compact(keep=args.keep, older_than=older_than)
+        print(f"* Compacted into {len(written)} archives")
+    elif args.command == 'reserve':
+        # Only the ID on stdout, for RUN=$(python3 -m src.analysis.run_store reserve)
+        print(store.reserve(args.run_id))
+    elif args.command == 'extract':
+        run_dir = store.extract(args.run_id, args.output)
+        print(f"* Run {args.run_id} in {run_dir}")
+
+
+if __name__ == '__main__':
+    main()
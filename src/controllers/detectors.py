@@ -0,0 +1,96 @@
+"""
+Per-source packet rate detectors for the rate limiting controller.
+
+Each detector counts packets per source IP in windows of a configurable
+length and returns, for every packet, an estimate of how many packets that
+source sent in the last window. The controller compares that estimate with
+its threshold.
+"""
+
+from collections import defaultdict
+
+
+class FixedWindowDetector:
+    """Count packets per source, resetting all counters every window."""
+
+    def __init__(self, window=1.0, max_sources=65536, now=0.0):
+        """
+        Initialize detector.
+
+        Args:
+            window: Window length in seconds
+            max_sources: Maximum number of sources tracked per window
+            now: Start time of the first window
+        """
+        self.window = window
+        self.max_sources = max_sources
+        self.counts = defaultdict(int)
+        self.window_start = now
+        self.untracked = 0  # packets from sources beyond max_sources
+
+    def roll(self, now):
+        """
+        Start a new window if the current one has elapsed.
+
+        Returns:
+            The finished window's counts (source -> packets), or None if the
+            current window is still open
+        """
+        if now - self.window_start < self.window:
+            return None
+        finished = self.counts
+        self.counts = defaultdict(int)
+        self.window_start = now
+        self.untracked = 0
+        return finished
+
+    def observe(self, src, now):
+        """
+        Count a packet from src.
+
+        Returns:
+            Estimated packets from src over the last window
+        """
+        counts = self.counts
+        if src not in counts and len(counts) >= self.max_sources:
+            self.untracked += 1
+            return 0
+        counts[src] += 1
+        return counts[src]
+
+
+class SlidingWindowDetector(FixedWindowDetector):
+    """
+    Approximate a sliding window from the current and previous windows.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window, which avoids the burst allowance a fixed window gives
+    at window boundaries.
+    """
+
+    def __init__(self, window=1.0, max_sources=65536, now=0.0):
+        super().__init__(window, max_sources, now)
+        self.previous = {}
+
+    def roll(self, now):
+        start = self.window_start
+        finished = super().roll(now)
+        if finished is not None:
+            # A gap longer than one window means nothing overlaps any more
+            self.previous = finished if now - start < 2 * self.window else {}
+        return finished
+
+    def observe(self, src, now):
+        count = super().observe(src, now)
+        if not count:
+            return 0
+        overlap = 1.0 - (now - self.window_start) / self.window
+        if overlap <= 0:
+            return count
+        return count + self.previous.get(src, 0) * overlap
+
+
+DETECTORS = {
+    'fixed': FixedWindowDetector,
+    'sliding': SlidingWindowDetector,
+}
@@ -13,23 +13,62 @@ import pox.lib.packet as pkt
 from collections import defaultdict
 import time
 
+from .profiling import ProfileSession, StageProfiler, install_signal_handlers
+from .rate_export import RateExporter
+from .telemetry import KIND_CONTROL_BYTES, KIND_PACKETS, TelemetryPublisher
+
 log = core.getLogger()
 
+# Control channel configuration
+MISS_SEND_LEN = 128  # bytes of each buffered packet sent to the controller
+
+# Rate histogram export
+RATE_LOG = 'rate_hist.bin'  # per-interval source rate histograms
+TOP_SOURCES = 10            # busiest sources recorded per interval
+
+# Profiling (opt-in, see profiling.py)
+PROFILE_DIR = 'profile'  # stage timings and profile sessions
+PROFILE_STAGES = ('parse', 'window', 'count', 'build', 'send')
+STAGE_PARSE, STAGE_WINDOW, STAGE_COUNT, STAGE_BUILD, STAGE_SEND = range(len(PROFILE_STAGES))
+
 packet_counts = defaultdict(int)
 blocked_hosts = {}
 last_reset = time.time()
 
+use_buffer = True
+control_bytes_in = 0   # PacketIn bytes received since last reset
+control_bytes_out = 0  # PacketOut/FlowMod bytes sent since last reset
+
+exporter = None
+publisher = None          # TelemetryPublisher of the 'controller' channel
+interval_packets = 0      # packets counted in the current interval
+profiler = None           # StageProfiler when profiling is enabled
+session = None            # ProfileSession toggled by SESSION_SIGNAL
+profile_dir = PROFILE_DIR
+
+
+def _handle_ConnectionUp(event):
+    """Ask the switch to send only packet headers for buffered PacketIns."""
+    if not use_buffer:
+        return  # baseline: keep the miss_send_len POX configured on connect
+    event.connection.send(of.ofp_set_config(miss_send_len=MISS_SEND_LEN))
+    log.debug(f"Set miss_send_len={MISS_SEND_LEN} on {dpidToStr(event.dpid)}")
+
 
 def _handle_PacketIn(event):
     """
     Handle incoming packets by flooding them to all ports.
-    
+
     This is a basic implementation without any rate limiting
     or DoS protection mechanisms.
     """
-    global last_reset
+    global packet_counts, last_reset, control_bytes_in, control_bytes_out, interval_packets
     now = time.time()
-    
+    control_bytes_in += len(event.ofp)
+    prof = profiler
+    if prof:
+        t = prof.start()
+
     do_rl = True
     try:
         packet = event.parsed
@@ -37,25 +76,107 @@ def _handle_PacketIn(event):
         src = ip_packet.srcip
     except:
         do_rl = False
+    if prof:
+        t = prof.mark(STAGE_PARSE, t)
 
     if do_rl:
         if now - last_reset >= 1:
-            for key, value in packet_counts.items():
-                print(f"{key}: {value}")
-            packet_counts.clear()
+            elapsed = now - last_reset
+            if exporter:
+                exporter.submit(now, elapsed, packet_counts)
+            if publisher:
+                publisher.publish(KIND_PACKETS, 0, interval_packets, len(packet_counts), now)
+                publisher.publish(KIND_CONTROL_BYTES, 0, control_bytes_in / elapsed,
+                                  control_bytes_out / elapsed, now)
+            interval_packets = 0
+            packet_counts = defaultdict(int)
+            log.info(f"Control channel: {control_bytes_in / elapsed:.0f} B/s in, "
+                     f"{control_bytes_out / elapsed:.0f} B/s out")
+            control_bytes_in = 0
+            control_bytes_out = 0
             last_reset = now
+        if prof:
+            t = prof.mark(STAGE_WINDOW, t)
 
         packet_counts[src] += 1
+        interval_packets += 1
+        if prof:
+            t = prof.mark(STAGE_COUNT, t)
 
-    # Flood packet to all ports
+    # Flood packet to all ports, referencing the switch buffer when possible
     msg = of.ofp_packet_out()
-    msg.data = event.ofp
+    buffer_id = event.ofp.buffer_id
+    if not use_buffer:
+        # Baseline: POX copies buffer_id/in_port (or the frame) from the PacketIn
+        msg.data = event.ofp
+    elif buffer_id is not None and buffer_id != of.NO_BUFFER:
+        msg.buffer_id = buffer_id
+        msg.in_port = event.port
+    else:
+        msg.data = event.ofp.data
+        msg.in_port = event.port
     msg.actions.append(of.ofp_action_output(port=of.OFPP_FLOOD))
+    if prof:
+        t = prof.mark(STAGE_BUILD, t)
     event.connection.send(msg)
+    control_bytes_out += len(msg)
+    if prof:
+        prof.mark(STAGE_SEND, t)
+
+
+def _handle_GoingDown(event):
+    """Flush exports, remove the telemetry ring and write profiles before POX exits."""
+    if exporter and not exporter.close():
+        log.warning(f"Rate export thread did not stop; {exporter.path} may be incomplete")
+    if publisher:
+        publisher.close()
+    if session and session.active:
+        session.stop()
+    if profiler:
+        log.info(f"Wrote stage timings to {profiler.dump(profile_dir)}")
 
 
-def launch():
-    """Initialize the controller and register packet handler."""
+def launch(miss_send_len=MISS_SEND_LEN, baseline=False, rate_log=RATE_LOG, telemetry=False,
+           profile=None, profile_session='cprofile'):
+    """
+    Initialize the controller and register packet handler.
+
+    Args:
+        miss_send_len: Bytes of each buffered packet included in PacketIns
+        baseline: Keep the original PacketOut handling (msg.data = event.ofp)
+            and POX's default miss_send_len, for before/after comparison
+        rate_log: Binary log of per-interval source rate histograms
+            (empty to disable)
+        telemetry: Publish interval counters on the shared-memory
+            telemetry bus ('controller' channel)
+        profile: Record per-stage handler timings into this directory
+            ('profile' for a bare --profile); SIGUSR1 writes them immediately
+            and SIGUSR2 starts/stops a profile session
+        profile_session: Session type toggled by SIGUSR2 ('cprofile',
+            'tracemalloc' or 'both')
+    """
+    global MISS_SEND_LEN, use_buffer, exporter, publisher, \
+        profiler, session, profile_dir
+    MISS_SEND_LEN = int(miss_send_len)
+    use_buffer = not baseline
+
+    if rate_log:
+        exporter = RateExporter(rate_log, top_n=TOP_SOURCES, key=lambda ip: ip.toUnsigned())
+        log.info(f"Exporting source rate histograms to {rate_log}")
+    if telemetry:
+        publisher = TelemetryPublisher('controller')
+        log.info("Publishing counters on telemetry channel 'controller'")
+    if profile:
+        profile_dir = PROFILE_DIR if profile is True else profile
+        profiler = StageProfiler(PROFILE_STAGES)
+        session = ProfileSession(profile_dir, profile_session)
+        install_signal_handlers(profiler, session, profile_dir, core.callLater, log.info)
+        log.info(f"Profiling handler stages into {profile_dir} "
+                 f"(SIGUSR1: dump, SIGUSR2: {profile_session} session)")
+    core.addListenerByName("GoingDownEvent", _handle_GoingDown)
+
+    core.openflow.addListenerByName("ConnectionUp", _handle_ConnectionUp)
     core.openflow.addListenerByName("PacketIn", _handle_PacketIn)
     log.info("Flood controller started (no rate limiting)")
-
+    if use_buffer:
+        log.info(f"Using switch buffers (miss_send_len: {MISS_SEND_LEN} bytes)")
@@ -0,0 +1,143 @@
+"""
+Model of the mitigation rules installed on each switch.
+
+The controller cannot see how full a switch's flow table is, and a flow_mod
+that does not fit is rejected after the fact. FlowTable therefore mirrors the
+rules the controller installed on one datapath, enforces a rule budget and
+picks the rule to evict when the budget is exhausted: the one that has gone
+longest without matching a packet, judged from the flow statistics the
+controller polls. Rules are kept in an OrderedDict in least-recently-hit
+order, so installing, hitting and evicting are all O(1).
+"""
+
+from collections import OrderedDict
+
+
+class FlowEntry:
+    """One installed rule as seen by the controller."""
+
+    __slots__ = ('installed', 'expires', 'last_hit', 'packets')
+
+    def __init__(self, installed, expires):
+        self.installed = installed
+        self.expires = expires
+        self.last_hit = installed
+        self.packets = 0
+
+
+class FlowTable:
+    """Rule budget and least-recently-hit eviction for one datapath."""
+
+    def __init__(self, capacity):
+        """
+        Initialize table model.
+
+        Args:
+            capacity: Maximum number of rules the controller may install
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()  # key -> FlowEntry, least recently hit first
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @property
+    def utilization(self):
+        """Fraction of the budget in use."""
+        return len(self.entries) / self.capacity if self.capacity else 1.0
+
+    def add(self, key, now, timeout=None):
+        """
+        Record a rule installation, evicting rules to stay within budget.
+
+        Re-installing an existing rule refreshes it instead.
+
+        Args:
+            key: Rule identifier (e.g. source address)
+            now: Installation time
+            timeout: Hard timeout of the rule in seconds (None: permanent)
+
+        Returns:
+            List of keys evicted to make room; their rules must be deleted
+            from the switch
+        """
+        expires = None if timeout is None else now + timeout
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.expires = expires
+            entry.last_hit = now
+            self.entries.move_to_end(key)
+            return []
+
+        evicted = self.shrink(self.capacity - 1)
+        self.entries[key] = FlowEntry(now, expires)
+        return evicted
+
+    def shrink(self, size):
+        """
+        Evict least recently hit rules until at most size remain.
+
+        Returns:
+            List of evicted keys
+        """
+        evicted = []
+        while len(self.entries) > max(0, size):
+            key, _ = self.entries.popitem(last=False)
+            evicted.append(key)
+        self.evictions += len(evicted)
+        return evicted
+
+    def remove(self, key):
+        """Forget a rule the switch removed; returns True if it was known."""
+        return self.entries.pop(key, None) is not None
+
+    def update_stats(self, key, packets, now):
+        """
+        Apply a flow statistics sample.
+
+        A rule whose packet count grew since the last sample counts as hit
+        at now.
+
+        Returns:
+            False if the rule is not in the model
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if packets > entry.packets:
+            entry.last_hit = now
+            self.entries.move_to_end(key)
+        entry.packets = packets
+        return True
+
+    def reconcile(self, present, since):
+        """
+        Drop rules missing from a complete statistics reply.
+
+        Only rules installed before the statistics were requested can be
+        judged; younger rules may simply not be in the reply yet.
+
+        Args:
+            present: Keys of all rules reported by the switch
+            since: Time the statistics request was sent
+
+        Returns:
+            List of keys dropped from the model
+        """
+        missing = [key for key, entry in self.entries.items()
+                   if key not in present and entry.installed < since]
+        for key in missing:
+            del self.entries[key]
+        return missing
+
+    def expire(self, now):
+        """Drop rules whose hard timeout has passed; returns their keys."""
+        expired = [key for key, entry in self.entries.items()
+                   if entry.expires is not None and entry.expires <= now]
+        for key in expired:
+            del self.entries[key]
+        return expired
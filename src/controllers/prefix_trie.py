@@ -0,0 +1,179 @@
+"""
+IPv4 prefix trie for controller allowlists and denylists.
+
+A path-compressed binary (Patricia) trie over IPv4 prefixes. Lookups walk
+at most one node per prefix bit and only compare integers, so they are cheap
+enough to run on every PacketIn.
+"""
+
+import ipaddress
+
+ACL_ALLOW = 'allow'
+ACL_DENY = 'deny'
+
+# Node layout: [key, prefix_len, value, child0, child1]
+_KEY, _LEN, _VALUE, _CHILD = 0, 1, 2, 3
+
+
+def _mask(prefix_len):
+    """Return the 32-bit netmask for a prefix length."""
+    return (0xffffffff << (32 - prefix_len)) & 0xffffffff
+
+
+def _common_len(a, b, limit):
+    """Number of leading bits shared by two 32-bit keys, capped at limit."""
+    diff = (a ^ b) & 0xffffffff
+    return min(limit, 32 - diff.bit_length())
+
+
+class PrefixTrie:
+    """Longest-prefix-match table mapping IPv4 prefixes to values."""
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, network, prefix_len, value):
+        """
+        Insert or replace a prefix.
+
+        Args:
+            network: Network address as an unsigned 32-bit integer
+            prefix_len: Prefix length (0-32)
+            value: Value returned by lookups matching this prefix
+        """
+        if not 0 <= prefix_len <= 32:
+            raise ValueError(f"Invalid prefix length: {prefix_len}")
+        key = network & _mask(prefix_len)
+        if self._root is None:
+            self._root = [key, prefix_len, value, None, None]
+            self._size += 1
+            return
+
+        parent, slot, node = None, None, self._root
+        while True:
+            common = _common_len(key, node[_KEY], min(prefix_len, node[_LEN]))
+            if common == node[_LEN]:
+                if common == prefix_len:
+                    if node[_VALUE] is None:
+                        self._size += 1
+                    node[_VALUE] = value
+                    return
+                # Prefix continues below this node
+                bit = _CHILD + ((key >> (31 - common)) & 1)
+                if node[bit] is None:
+                    node[bit] = [key, prefix_len, value, None, None]
+                    self._size += 1
+                    return
+                parent, slot, node = node, bit, node[bit]
+                continue
+
+            # Split the edge leading to node
+            if common == prefix_len:
+                split = [key, prefix_len, value, None, None]
+            else:
+                split = [key & _mask(common), common, None, None, None]
+                split[_CHILD + ((key >> (31 - common)) & 1)] = [key, prefix_len, value, None, None]
+            split[_CHILD + ((node[_KEY] >> (31 - common)) & 1)] = node
+            if parent is None:
+                self._root = split
+            else:
+                parent[slot] = split
+            self._size += 1
+            return
+
+    def remove(self, network, prefix_len):
+        """
+        Remove a prefix, merging nodes it no longer needs.
+
+        Args:
+            network: Network address as an unsigned 32-bit integer
+            prefix_len: Prefix length (0-32)
+
+        Returns:
+            True if the prefix was present
+        """
+        if not 0 <= prefix_len <= 32:
+            raise ValueError(f"Invalid prefix length: {prefix_len}")
+        key = network & _mask(prefix_len)
+        path = []  # (parent, slot) pairs leading to node
+        node = self._root
+        while node is not None and node[_LEN] < prefix_len:
+            if node[_LEN] and (key ^ node[_KEY]) >> (32 - node[_LEN]):
+                return False
+            slot = _CHILD + ((key >> (31 - node[_LEN])) & 1)
+            path.append((node, slot))
+            node = node[slot]
+        if node is None or node[_LEN] != prefix_len or node[_KEY] != key or node[_VALUE] is None:
+            return False
+
+        node[_VALUE] = None
+        self._size -= 1
+        # Splice out valueless nodes that no longer branch
+        while node[_VALUE] is None:
+            children = [child for child in node[_CHILD:] if child is not None]
+            if len(children) == 2:
+                break
+            replacement = children[0] if children else None
+            if not path:
+                self._root = replacement
+                break
+            parent, slot = path.pop()
+            parent[slot] = replacement
+            node = parent
+        return True
+
+    def lookup(self, address, default=None):
+        """
+        Return the value of the longest prefix containing an address.
+
+        Args:
+            address: IPv4 address as an unsigned 32-bit integer
+            default: Value returned when no prefix matches
+        """
+        best = default
+        node = self._root
+        while node is not None:
+            prefix_len = node[1]
+            if prefix_len and (address ^ node[0]) >> (32 - prefix_len):
+                break
+            if node[2] is not None:
+                best = node[2]
+            if prefix_len == 32:
+                break
+            node = node[3 + ((address >> (31 - prefix_len)) & 1)]
+        return best
+
+
+def load_acl(path):
+    """
+    Load an allow/deny list file into a PrefixTrie.
+
+    Each non-empty line holds an action and an IPv4 address or prefix,
+    e.g. ``allow 10.0.0.254`` or ``deny 192.168.0.0/16``. Text after ``#``
+    is ignored. When prefixes overlap the longest one wins.
+
+    Args:
+        path: Path to the ACL file
+
+    Returns:
+        PrefixTrie mapping prefixes to ACL_ALLOW or ACL_DENY
+    """
+    trie = PrefixTrie()
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) != 2 or parts[0] not in (ACL_ALLOW, ACL_DENY):
+                raise ValueError(f"{path}:{line_no}: expected 'allow|deny <prefix>'")
+            try:
+                net = ipaddress.IPv4Network(parts[1], strict=False)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: {e}")
+            trie.insert(int(net.network_address), net.prefixlen, parts[0])
+    return trie
@@ -0,0 +1,237 @@
+"""
+Opt-in hot-path profiling for the POX controllers.
+
+StageProfiler records the duration of each stage of a packet handler with
+time.perf_counter_ns() into preallocated arrays, so profiling adds no
+allocations per packet. Handlers hold a module-level `profiler` that is None
+unless profiling is enabled; the disabled cost is one truth test per stage.
+
+ProfileSession wraps cProfile and/or tracemalloc around a window of interest
+(e.g. a DoS attack). Sessions must run on the thread that handles packets, so
+the signal handlers installed by install_signal_handlers() only schedule the
+work through the `schedule` callable (POX's core.callLater).
+"""
+
+import os
+import signal
+import time
+from array import array
+
+DUMP_SIGNAL = signal.SIGUSR1     # write stage statistics now
+SESSION_SIGNAL = signal.SIGUSR2  # start/stop a cProfile/tracemalloc session
+SESSION_TYPES = ('cprofile', 'tracemalloc', 'both')
+TRACEMALLOC_TOP = 30             # allocation sites listed per session
+
+
+class StageProfiler:
+    """Per-stage timings of a handler in preallocated ring buffers."""
+
+    def __init__(self, stages, capacity=1 << 16, root='PacketIn'):
+        """
+        Initialize profiler.
+
+        Args:
+            stages: Stage names; mark() takes the index of a stage
+            capacity: Samples retained per stage for percentiles
+            root: Frame name of the handler in folded stack output
+        """
+        self.stages = list(stages)
+        self.capacity = capacity
+        self.root = root
+        self.samples = [array('q', bytes(8 * capacity)) for _ in self.stages]
+        self.counts = [0] * len(self.stages)
+        self.totals = [0] * len(self.stages)
+        self.maxima = [0] * len(self.stages)
+
+    def start(self):
+        """Return the start timestamp of the first stage."""
+        return time.perf_counter_ns()
+
+    def mark(self, stage, start):
+        """
+        Record the time since start as one sample of a stage.
+
+        Args:
+            stage: Stage index
+            start: Timestamp returned by start() or the previous mark()
+
+        Returns:
+            Current timestamp, the start of the next stage
+        """
+        now = time.perf_counter_ns()
+        elapsed = now - start
+        n = self.counts[stage]
+        self.samples[stage][n % self.capacity] = elapsed
+        self.counts[stage] = n + 1
+        self.totals[stage] += elapsed
+        if elapsed > self.maxima[stage]:
+            self.maxima[stage] = elapsed
+        return now
+
+    def stats(self):
+        """
+        Aggregate the recorded samples.
+
+        Returns:
+            List of dicts per stage with 'stage', 'count', 'total_ns',
+            'mean_ns', 'p50_ns', 'p90_ns', 'p99_ns' and 'max_ns'; percentiles
+            cover the most recent `capacity` samples
+        """
+        result = []
+        for index, name in enumerate(self.stages):
+            count = self.counts[index]
+            retained = sorted(self.samples[index][:min(count, self.capacity)])
+
+            def percentile(q):
+                return retained[min(len(retained) - 1, int(q * len(retained)))] if retained else 0
+
+            result.append({
+                'stage': name,
+                'count': count,
+                'total_ns': self.totals[index],
+                'mean_ns': self.totals[index] // count if count else 0,
+                'p50_ns': percentile(0.50),
+                'p90_ns': percentile(0.90),
+                'p99_ns': percentile(0.99),
+                'max_ns': self.maxima[index],
+            })
+        return result
+
+    def format_stats(self):
+        """Return the statistics as a text table with each stage's share of time."""
+        stats = self.stats()
+        grand_total = sum(s['total_ns'] for s in stats) or 1
+        lines = [f"{'stage':<12}{'count':>10}{'share':>8}{'mean us':>10}{'p50 us':>10}"
+                 f"{'p90 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for s in stats:
+            lines.append(f"{s['stage']:<12}{s['count']:>10}{s['total_ns'] / grand_total:>8.1%}"
+                         f"{s['mean_ns'] / 1e3:>10.2f}{s['p50_ns'] / 1e3:>10.2f}"
+                         f"{s['p90_ns'] / 1e3:>10.2f}{s['p99_ns'] / 1e3:>10.2f}"
+                         f"{s['max_ns'] / 1e3:>10.2f}")
+        return '\n'.join(lines)
+
+    def folded(self):
+        """
+        Return total time per stage in folded stack format.
+
+        Each line is 'root;stage microseconds', the input format of
+        flamegraph.pl and speedscope.
+        """
+        return '\n'.join(f"{self.root};{s['stage']} {s['total_ns'] // 1000}"
+                         for s in self.stats() if s['count'])
+
+    def dump(self, directory):
+        """
+        Write stages.txt (table) and stages.folded (flame graph input).
+
+        Returns:
+            Path of the table
+        """
+        os.makedirs(directory, exist_ok=True)
+        table = os.path.join(directory, 'stages.txt')
+        with open(table, 'w') as f:
+            f.write(self.format_stats() + '\n')
+        with open(os.path.join(directory, 'stages.folded'), 'w') as f:
+            f.write(self.folded() + '\n')
+        return table
+
+
+class ProfileSession:
+    """cProfile and/or tracemalloc session toggled around a window of interest."""
+
+    def __init__(self, directory, kind='cprofile'):
+        """
+        Initialize session manager.
+
+        Args:
+            directory: Output directory for session-<n>.prof and
+                session-<n>-tracemalloc.txt
+            kind: 'cprofile', 'tracemalloc' or 'both'
+        """
+        if kind not in SESSION_TYPES:
+            raise ValueError(f"Invalid profile session {kind!r}, expected one of {SESSION_TYPES}")
+        self.directory = directory
+        self.kind = kind
+        self.number = 0
+        self._profile = None
+        self._tracing = False
+
+    @property
+    def active(self):
+        return self._profile is not None or self._tracing
+
+    def start(self):
+        """Start a session on the calling thread."""
+        if self.active:
+            return
+        self.number += 1
+        if self.kind in ('cprofile', 'both'):
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if self.kind in ('tracemalloc', 'both'):
+            import tracemalloc
+            tracemalloc.start()
+            self._tracing = True
+
+    def stop(self):
+        """
+        Stop the running session and write its results.
+
+        Returns:
+            List of files written
+        """
+        written = []
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, f'session-{self.number}')
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(prefix + '.prof')
+            written.append(prefix + '.prof')
+            self._profile = None
+        if self._tracing:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._tracing = False
+            with open(prefix + '-tracemalloc.txt', 'w') as f:
+                f.write(f"current: {current} B, peak: {peak} B\n")
+                for stat in snapshot.statistics('lineno')[:TRACEMALLOC_TOP]:
+                    f.write(f"{stat}\n")
+            written.append(prefix + '-tracemalloc.txt')
+        return written
+
+    def toggle(self):
+        """Start a session, or stop the running one; returns files written."""
+        if self.active:
+            return self.stop()
+        self.start()
+        return []
+
+
+def install_signal_handlers(profiler, session, directory, schedule, log=print):
+    """
+    Dump stage statistics on DUMP_SIGNAL and toggle sessions on SESSION_SIGNAL.
+
+    Must be called from the main thread.
+
+    Args:
+        profiler: StageProfiler to dump
+        session: ProfileSession to toggle
+        directory: Output directory of the stage statistics
+        schedule: Callable running a function on the packet-handling thread
+        log: Function receiving status messages
+    """
+    def dump():
+        log(f"Wrote stage timings to {profiler.dump(directory)}")
+
+    def toggle():
+        written = session.toggle()
+        if session.active:
+            log(f"Started {session.kind} session {session.number}")
+        else:
+            log(f"Stopped profile session, wrote {', '.join(written)}")
+
+    signal.signal(DUMP_SIGNAL, lambda *_: schedule(dump))
+    signal.signal(SESSION_SIGNAL, lambda *_: schedule(toggle))
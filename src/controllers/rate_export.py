@@ -0,0 +1,182 @@
+"""
+Background export of per-interval source packet-rate histograms.
+
+At the end of every counting interval the controller hands its finished
+counter table to a RateExporter by reference. A background thread reduces it
+to a log2 histogram of per-source packet counts plus the top-N sources and
+appends a fixed-layout binary record to a size-rotated log. This keeps all
+formatting and file I/O off the packet-handling path. The visualization
+module reads the log back with read_rate_log().
+"""
+
+import heapq
+import os
+import queue
+import struct
+import threading
+
+MAGIC = b'SDNR'
+HIST_BUCKETS = 32  # bucket i counts sources that sent [2**i, 2**(i+1)) packets
+
+# magic, timestamp, interval (s), packets, sources, untracked packets, top entries
+RECORD_HEADER = struct.Struct('<4sdfQIIH')
+HISTOGRAM = struct.Struct(f'<{HIST_BUCKETS}I')
+TOP_ENTRY = struct.Struct('<II')  # source IPv4 as unsigned int, packets
+
+
+def encode_record(timestamp, interval, counts, untracked=0, top_n=10, key=int):
+    """
+    Reduce a counter table to one binary histogram record.
+
+    Args:
+        timestamp: End time of the interval (epoch seconds)
+        interval: Interval length in seconds
+        counts: Mapping of source -> packet count
+        untracked: Packets from sources that were not counted individually
+        top_n: Number of busiest sources to include
+        key: Function converting a source to an unsigned 32-bit int
+
+    Returns:
+        Encoded record as bytes
+    """
+    histogram = [0] * HIST_BUCKETS
+    packets = 0
+    for count in counts.values():
+        if count > 0:
+            packets += count
+            histogram[min(count.bit_length() - 1, HIST_BUCKETS - 1)] += 1
+
+    top = heapq.nlargest(top_n, counts.items(), key=lambda item: item[1])
+    parts = [RECORD_HEADER.pack(MAGIC, timestamp, interval, packets + untracked,
+                                len(counts), untracked, len(top)),
+             HISTOGRAM.pack(*histogram)]
+    parts.extend(TOP_ENTRY.pack(key(src) & 0xffffffff, count) for src, count in top)
+    return b''.join(parts)
+
+
+def read_rate_log(path):
+    """
+    Read all records of a rate log, including rotated files, oldest first.
+
+    Args:
+        path: Path of the current log file
+
+    Returns:
+        List of dicts with 'time', 'interval', 'packets', 'sources',
+        'untracked', 'histogram' (tuple of HIST_BUCKETS counts) and 'top'
+        (list of (ipv4 int, packets))
+    """
+    files = []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        files.append(f'{path}.{index}')
+        index += 1
+    files.reverse()
+    if os.path.exists(path):
+        files.append(path)
+
+    records = []
+    for name in files:
+        with open(name, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + RECORD_HEADER.size + HISTOGRAM.size <= len(data):
+            magic, ts, interval, packets, sources, untracked, n_top = \
+                RECORD_HEADER.unpack_from(data, offset)
+            if magic != MAGIC:
+                raise ValueError(f"{name}: corrupt record at offset {offset}")
+            offset += RECORD_HEADER.size
+            histogram = HISTOGRAM.unpack_from(data, offset)
+            offset += HISTOGRAM.size
+            if offset + n_top * TOP_ENTRY.size > len(data):
+                break  # truncated final record
+            top = [TOP_ENTRY.unpack_from(data, offset + i * TOP_ENTRY.size)
+                   for i in range(n_top)]
+            offset += n_top * TOP_ENTRY.size
+            records.append({'time': ts, 'interval': interval, 'packets': packets,
+                            'sources': sources, 'untracked': untracked,
+                            'histogram': histogram, 'top': top})
+    return records
+
+
+class RateExporter:
+    """Write interval histograms to a rotating binary log from a worker thread."""
+
+    def __init__(self, path, top_n=10, max_bytes=16 << 20, backups=5,
+                 key=int, max_pending=64):
+        """
+        Initialize exporter and start its worker thread.
+
+        Args:
+            path: Log file path
+            top_n: Busiest sources recorded per interval
+            max_bytes: Size at which the log is rotated
+            backups: Rotated files kept (path.1 is the newest)
+            key: Function converting a source to an unsigned 32-bit int
+            max_pending: Intervals buffered before new ones are dropped
+        """
+        self.path = path
+        self.top_n = top_n
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.key = key
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._file = open(path, 'ab')
+        self._thread = threading.Thread(target=self._run, name='RateExporter', daemon=True)
+        self._thread.start()
+
+    def submit(self, timestamp, interval, counts, untracked=0):
+        """
+        Queue a finished counter table for export.
+
+        The table is passed by reference and must not be modified afterwards;
+        callers swap in a fresh table instead of clearing this one.
+        """
+        try:
+            self._queue.put_nowait((timestamp, interval, counts, untracked))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """
+        Flush pending intervals and stop the worker thread.
+
+        Waits at most about twice timeout, so a worker that died or is stuck
+        cannot hang POX shutdown; intervals it has not written are lost.
+
+        Returns:
+            True if the worker finished and the log was closed
+        """
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass  # worker stuck: join() below times out as well
+            self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+        self._file.close()  # no-op if the worker closed it
+        return True
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups, 0, -1):
+            src = self.path if index == 1 else f'{self.path}.{index - 1}'
+            if os.path.exists(src):
+                os.replace(src, f'{self.path}.{index}')
+        self._file = open(self.path, 'ab')
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            timestamp, interval, counts, untracked = item
+            record = encode_record(timestamp, interval, counts, untracked,
+                                   self.top_n, self.key)
+            if self.backups and self._file.tell() + len(record) > self.max_bytes:
+                self._rotate()
+            self._file.write(record)
+            self._file.flush()
+        self._file.close()
@@ -10,30 +10,340 @@ import pox.openflow.libopenflow_01 as of
 from pox.lib.util import dpidToStr
 from pox.lib.packet.ethernet import ethernet
 import pox.lib.packet as pkt
-from collections import defaultdict
+from pox.lib.recoco import Timer
+from pox.lib.addresses import IPAddr
+import os
 import time
 
+from .detectors import DETECTORS
+from .flow_table import FlowTable
+from .profiling import ProfileSession, StageProfiler, install_signal_handlers
+from .rate_export import RateExporter
+from .prefix_trie import ACL_ALLOW, ACL_DENY, load_acl
+from .runtime_config import ConfigWatcher, ControllerConfig
+from .syn_guard import SYN_DROP, SYN_FORWARD, SynGuard
+from .telemetry import KIND_CONTROL_BYTES, KIND_PACKETS, TelemetryPublisher
+
 log = core.getLogger()
 
-# Rate limiting configuration
+# Rate limiting defaults (override with launch() arguments or --config)
 RATE_THRESHOLD = 50  # packets per second
 BLOCK_DURATION = 5   # seconds
+WINDOW = 1.0         # seconds per counting window
+DETECTOR = 'fixed'   # 'fixed' or 'sliding' window counting
+MAX_SOURCES = 65536  # sources tracked per window
+FLOW_TABLE_CAPACITY = 1000  # drop rules installed per switch before evicting
+SYN_RATE = 0         # SYNs forwarded per second with the SYN guard (0: no limit)
+
+# Control channel configuration
+MISS_SEND_LEN = 128  # bytes of each buffered packet sent to the controller
+
+# Allow/deny list configuration
+ACL_RELOAD_INTERVAL = 2  # seconds between ACL file change checks
+CONFIG_RELOAD_INTERVAL = 1  # seconds between config file change checks
+
+# Flow table tracking
+BLOCK_PRIORITY = 1000       # priority of the drop rules
+FLOW_STATS_INTERVAL = 2     # seconds between flow statistics polls
+FLOW_LOG = 'flow_table.txt' # per-switch drop rule count over time
+
+# SYN guard (handshake validation)
+SYN_GUARD_BITS = 1 << 23     # Bloom filter bits per generation (1 MiB)
+SYN_GUARD_TIMEOUT = 5.0      # seconds a client has to complete its handshake
+CONNECTION_PRIORITY = 500    # validated connections, below the drop rules
+CONNECTION_IDLE_TIMEOUT = 10 # seconds before an idle connection's flows expire
 
-packet_counts = defaultdict(int)
+# Rate histogram export
+RATE_LOG = 'rate_hist.bin'  # per-interval source rate histograms
+TOP_SOURCES = 10            # busiest sources recorded per interval
+
+# Profiling (opt-in, see profiling.py)
+PROFILE_DIR = 'profile'  # stage timings and profile sessions
+PROFILE_STAGES = ('parse', 'acl', 'syn', 'window', 'count', 'block', 'build', 'send')
+(STAGE_PARSE, STAGE_ACL, STAGE_SYN, STAGE_WINDOW, STAGE_COUNT, STAGE_BLOCK,
+ STAGE_BUILD, STAGE_SEND) = range(len(PROFILE_STAGES))
+
+config = ControllerConfig(
+    choices={'detector': set(DETECTORS)},
+    # window divides counts and the others size tables: 0 would break them.
+    # block_duration is a flow_mod hard_timeout, where 0 means permanent
+    positive=('threshold', 'window', 'max_sources', 'flow_table_capacity', 'block_duration'),
+    non_negative=('syn_rate',),  # 0: no limit
+    maximum={'block_duration': 0xffff},  # 16-bit timeout field
+    threshold=RATE_THRESHOLD,
+    block_duration=BLOCK_DURATION,
+    window=WINDOW,
+    detector=DETECTOR,
+    max_sources=MAX_SOURCES,
+    flow_table_capacity=FLOW_TABLE_CAPACITY,
+    syn_rate=SYN_RATE,
+)
+detector = DETECTORS[DETECTOR](WINDOW, MAX_SOURCES, time.time())
 blocked_hosts = {}
-last_reset = time.time()
+flow_tables = {}      # dpid -> FlowTable of installed drop rules
+stats_requested = {}  # dpid -> time of the last flow statistics request
+flow_log_file = None  # file receiving flow table utilization samples
+guard = None          # SynGuard when handshake validation is enabled
+
+use_buffer = True
+control_bytes_in = 0   # PacketIn bytes received since last reset
+control_bytes_out = 0  # PacketOut/FlowMod bytes sent since last reset
+
+acl = None        # PrefixTrie of allowed/denied source prefixes
+acl_file = None
+acl_mtime = None
+config_watcher = None
+exporter = None
+publisher = None          # TelemetryPublisher of the 'controller' channel
+interval_packets = 0      # packets counted in the current interval
+profiler = None           # StageProfiler when profiling is enabled
+session = None            # ProfileSession toggled by SESSION_SIGNAL
+profile_dir = PROFILE_DIR
+
+
+def _handle_ConnectionUp(event):
+    """Start the switch's rule model and ask for header-only PacketIns."""
+    flow_tables[event.dpid] = FlowTable(config.flow_table_capacity)
+    if not use_buffer:
+        return  # baseline: keep the miss_send_len POX configured on connect
+    event.connection.send(of.ofp_set_config(miss_send_len=MISS_SEND_LEN))
+    log.debug(f"Set miss_send_len={MISS_SEND_LEN} on {dpidToStr(event.dpid)}")
+
+
+def _handle_ConnectionDown(event):
+    """Forget the rule model of a disconnected switch."""
+    flow_tables.pop(event.dpid, None)
+    stats_requested.pop(event.dpid, None)
+
+
+def _flow_table(dpid):
+    """Return the rule model of a switch, creating it if needed."""
+    if dpid not in flow_tables:
+        flow_tables[dpid] = FlowTable(config.flow_table_capacity)
+    return flow_tables[dpid]
+
+
+def _unblock(connection, key):
+    """Delete the drop rule of a source (IPv4 as unsigned int) from a switch."""
+    global control_bytes_out
+    msg = of.ofp_flow_mod(command=of.OFPFC_DELETE_STRICT)
+    msg.match.dl_type = ethernet.IP_TYPE
+    msg.match.nw_src = IPAddr(key)
+    msg.priority = BLOCK_PRIORITY
+    connection.send(msg)
+    control_bytes_out += len(msg)
+
+
+def _connection_match(key):
+    """Match of one direction of a validated connection, keyed as in _rule_key()."""
+    nw_src, nw_dst, tp_src, tp_dst = key
+    match = of.ofp_match()
+    match.dl_type = ethernet.IP_TYPE
+    match.nw_proto = pkt.ipv4.TCP_PROTOCOL
+    match.nw_src = IPAddr(nw_src)
+    match.nw_dst = IPAddr(nw_dst)
+    match.tp_src = tp_src
+    match.tp_dst = tp_dst
+    return match
+
+
+def _rule_key(priority, match):
+    """
+    FlowTable key of a rule this controller installs, or None.
+
+    Drop rules are keyed by source address (unsigned int), connection flows
+    by (source, destination, source port, destination port).
+    """
+    if match.nw_src is None:
+        return None
+    if priority == BLOCK_PRIORITY:
+        return match.nw_src.toUnsigned()
+    if priority == CONNECTION_PRIORITY and match.nw_dst is not None:
+        return (match.nw_src.toUnsigned(), match.nw_dst.toUnsigned(), match.tp_src, match.tp_dst)
+    return None
+
+
+def _disallow(connection, key):
+    """Delete one direction of a validated connection's flows from a switch."""
+    global control_bytes_out
+    msg = of.ofp_flow_mod(command=of.OFPFC_DELETE_STRICT)
+    msg.match = _connection_match(key)
+    msg.priority = CONNECTION_PRIORITY
+    connection.send(msg)
+    control_bytes_out += len(msg)
+
+
+def _evict(connection, keys):
+    """Remove evicted drop rules and connection flows from the switch."""
+    for key in keys:
+        if isinstance(key, tuple):
+            _disallow(connection, key)
+        else:
+            _unblock(connection, key)
+    if keys:
+        log.warning(f"Flow table budget of {dpidToStr(connection.dpid)} exhausted, "
+                    f"evicted {len(keys)} least recently hit rules")
+
+
+def _request_flow_stats():
+    """Poll every switch for its flow statistics and expire timed-out rules."""
+    now = time.time()
+    for table in flow_tables.values():
+        table.expire(now)
+    for connection in core.openflow.connections:
+        connection.send(of.ofp_stats_request(body=of.ofp_flow_stats_request()))
+        stats_requested[connection.dpid] = now
+
+
+def _handle_FlowStatsReceived(event):
+    """Mark hit rules, forget rules the switch no longer has and log utilization."""
+    now = time.time()
+    dpid = event.connection.dpid
+    table = _flow_table(dpid)
+    present = set()
+    for stat in event.stats:
+        key = _rule_key(stat.priority, stat.match)
+        if key is None:
+            continue
+        present.add(key)
+        table.update_stats(key, stat.packet_count, now)
+    table.reconcile(present, stats_requested.get(dpid, now))
+
+    if flow_log_file:
+        flow_log_file.write(f"{now:.3f},{dpidToStr(dpid)},{len(table)},{table.capacity},"
+                            f"{table.evictions}\n")
+        flow_log_file.flush()
+
+
+def _handle_FlowRemoved(event):
+    """Keep the rule model in sync with rules that timed out or were deleted."""
+    key = _rule_key(event.ofp.priority, event.ofp.match)
+    table = flow_tables.get(event.dpid)
+    if key is not None and table is not None:
+        table.remove(key)
+
+
+def _handle_ErrorIn(event):
+    """Report drop rules the switch refused because its table is full."""
+    if (event.ofp.type == of.OFPET_FLOW_MOD_FAILED and
+            event.ofp.code == of.OFPFMFC_ALL_TABLES_FULL):
+        table = flow_tables.get(event.dpid)
+        log.error(f"Flow table of {dpidToStr(event.dpid)} is full with "
+                  f"{len(table) if table else 0} drop rules installed by this controller; "
+                  f"lower flow_table_capacity")
+
+
+def _load_acl():
+    """(Re)load the ACL file and swap it in if it changed on disk."""
+    global acl, acl_mtime
+    try:
+        mtime = os.stat(acl_file).st_mtime
+    except OSError as e:
+        log.error(f"Cannot stat ACL file {acl_file}: {e}")
+        return
+    if mtime == acl_mtime:
+        return
+    try:
+        new_acl = load_acl(acl_file)
+    except (OSError, ValueError) as e:
+        log.error(f"Keeping previous ACL, failed to load {acl_file}: {e}")
+        return
+    acl = new_acl
+    acl_mtime = mtime
+    log.info(f"Loaded {len(new_acl)} ACL prefixes from {acl_file}")
+
+
+def _apply_config(changed):
+    """Propagate changed parameters to the running detector."""
+    global detector
+    log.info("Configuration changed: " +
+             ", ".join(f"{name}={value}" for name, value in changed.items()))
+    if 'detector' in changed:
+        # Counting restarts with the new detector; switch state is untouched
+        detector = DETECTORS[config.detector](config.window, config.max_sources, time.time())
+    detector.window = config.window
+    detector.max_sources = config.max_sources
+    if guard is not None:
+        guard.syn_rate = config.syn_rate
+    if 'flow_table_capacity' in changed:
+        for dpid, table in flow_tables.items():
+            table.capacity = config.flow_table_capacity
+            evicted = table.shrink(table.capacity)
+            connection = core.openflow.getConnection(dpid)
+            if connection is not None:
+                _evict(connection, evicted)
+
+
+def _poll_config():
+    """Apply the config file if it changed, keeping all controller state."""
+    try:
+        config_watcher.poll()
+    except (OSError, ValueError) as e:
+        log.error(f"Keeping previous configuration, failed to load {config_watcher.path}: {e}")
+
+
+def _block(event, packet, src, duration):
+    """
+    Install a drop rule for a source IP on the switch that sent event.
+
+    The rule is recorded in the switch's FlowTable; if the rule budget is
+    exhausted, the least recently hit drop rules are deleted first.
+    """
+    global control_bytes_out
+    _evict(event.connection, _flow_table(event.dpid).add(src.toUnsigned(), time.time(), duration))
+    match = of.ofp_match()
+    match.dl_type = packet.type
+    match.nw_src = src
+    msg = of.ofp_flow_mod()
+    msg.match = match
+    msg.priority = BLOCK_PRIORITY
+    msg.hard_timeout = duration
+    msg.flags = of.OFPFF_SEND_FLOW_REM  # keeps the rule model in sync
+    msg.actions = []  # Empty actions = drop packet
+    event.connection.send(msg)
+    control_bytes_out += len(msg)
+
+
+def _allow_connection(event, ip_packet, tcp):
+    """
+    Install forwarding flows for both directions of a validated TCP connection.
+
+    The flows share the switch's rule budget with the drop rules. They expire
+    when idle, so the model drops them on FlowRemoved or when a statistics
+    reply no longer lists them rather than at a fixed time.
+    """
+    global control_bytes_out
+    table = _flow_table(event.dpid)
+    src, dst = ip_packet.srcip.toUnsigned(), ip_packet.dstip.toUnsigned()
+    for key in ((src, dst, tcp.srcport, tcp.dstport), (dst, src, tcp.dstport, tcp.srcport)):
+        _evict(event.connection, table.add(key, time.time()))
+        msg = of.ofp_flow_mod()
+        msg.match = _connection_match(key)
+        msg.priority = CONNECTION_PRIORITY
+        msg.idle_timeout = CONNECTION_IDLE_TIMEOUT
+        msg.flags = of.OFPFF_SEND_FLOW_REM  # keeps the rule model in sync
+        msg.actions.append(of.ofp_action_output(port=of.OFPP_FLOOD))
+        event.connection.send(msg)
+        control_bytes_out += len(msg)
 
 
 def _handle_PacketIn(event):
     """
     Handle incoming packets with rate limiting protection.
-    
+
     If a source IP exceeds the rate threshold, it will be blocked
-    for a specified duration.
+    for a specified duration. Allowlisted sources skip counting and
+    denylisted sources are dropped before counting. With the SYN guard,
+    a source's first SYN is recorded in the guard instead of being counted,
+    and flows are installed only for completed handshakes.
     """
-    global last_reset
+    global control_bytes_in, control_bytes_out, interval_packets
     now = time.time()
-    
+    control_bytes_in += len(event.ofp)
+    prof = profiler
+    if prof:
+        t = prof.start()
+
     do_rl = True
     try:
         packet = event.parsed
@@ -41,40 +351,208 @@ def _handle_PacketIn(event):
         src = ip_packet.srcip
     except:
         do_rl = False
+    if prof:
+        t = prof.mark(STAGE_PARSE, t)
+
+    verdict = acl.lookup(src.toUnsigned()) if do_rl and acl is not None else None
+    if prof:
+        t = prof.mark(STAGE_ACL, t)
+    if verdict == ACL_DENY:
+        _block(event, packet, src, config.block_duration)
+        if prof:
+            prof.mark(STAGE_BLOCK, t)
+        return
+    if verdict == ACL_ALLOW:
+        do_rl = False
+
+    if guard is not None and do_rl:
+        tcp = packet.find('tcp')
+        if tcp is not None:
+            flow = (src.toUnsigned(), ip_packet.dstip.toUnsigned(), tcp.srcport, tcp.dstport)
+            port = (event.dpid, event.port)
+            if tcp.SYN and not tcp.ACK:
+                verdict = guard.syn(*flow, tcp.seq, port, now)
+                if verdict == SYN_DROP:
+                    return
+                # A source's first SYN is not counted, so spoofed SYNs from ever
+                # new sources stay out of the detector; repeated SYNs are counted
+                if verdict == SYN_FORWARD:
+                    do_rl = False
+            elif tcp.SYN and tcp.ACK:
+                guard.syn_ack(*flow, tcp.seq, tcp.ack, port, now)
+            elif tcp.ACK and guard.ack(*flow, tcp.seq, tcp.ack, port, now):
+                _allow_connection(event, ip_packet, tcp)
+        if prof:
+            t = prof.mark(STAGE_SYN, t)
 
     if do_rl:
-        # Reset packet counts every second
-        if now - last_reset >= 1:
-            for key, value in packet_counts.items():
-                print(f"{key}: {value}")
-            packet_counts.clear()
-            last_reset = now
+        # Reset packet counts every window
+        window_start = detector.window_start
+        untracked = detector.untracked
+        finished = detector.roll(now)
+        if finished is not None:
+            elapsed = now - window_start
+            if exporter:
+                exporter.submit(now, elapsed, finished, untracked)
+            if publisher:
+                publisher.publish(KIND_PACKETS, 0, interval_packets, len(finished), now)
+                publisher.publish(KIND_CONTROL_BYTES, 0, control_bytes_in / elapsed,
+                                  control_bytes_out / elapsed, now)
+            interval_packets = 0
+            log.info(f"Control channel: {control_bytes_in / elapsed:.0f} B/s in, "
+                     f"{control_bytes_out / elapsed:.0f} B/s out")
+            control_bytes_in = 0
+            control_bytes_out = 0
+        if prof:
+            t = prof.mark(STAGE_WINDOW, t)
 
-        packet_counts[src] += 1
+        count = detector.observe(src, now)
+        interval_packets += 1
+        if prof:
+            t = prof.mark(STAGE_COUNT, t)
 
         # Rate limiting: block if threshold exceeded
-        if packet_counts[src] > RATE_THRESHOLD:
-            log.warning(f"Rate limit exceeded for {src}: {packet_counts[src]} pps")
-            match = of.ofp_match()
-            match.dl_type = packet.type
-            match.nw_src = src
-            msg = of.ofp_flow_mod()
-            msg.match = match
-            msg.priority = 1000
-            msg.hard_timeout = BLOCK_DURATION
-            msg.actions = []  # Empty actions = drop packet
-            event.connection.send(msg)
-            log.info(f"Blocked {src} for {BLOCK_DURATION} seconds")
-
-    # Flood packet to all ports
+        if count > config.threshold * config.window:
+            log.warning(f"Rate limit exceeded for {src}: {count / config.window:.0f} pps")
+            _block(event, packet, src, config.block_duration)
+            log.info(f"Blocked {src} for {config.block_duration} seconds")
+            if prof:
+                t = prof.mark(STAGE_BLOCK, t)
+
+    # Flood packet to all ports, referencing the switch buffer when possible
     msg = of.ofp_packet_out()
-    msg.data = event.ofp
+    buffer_id = event.ofp.buffer_id
+    if not use_buffer:
+        # Baseline: POX copies buffer_id/in_port (or the frame) from the PacketIn
+        msg.data = event.ofp
+    elif buffer_id is not None and buffer_id != of.NO_BUFFER:
+        msg.buffer_id = buffer_id
+        msg.in_port = event.port
+    else:
+        msg.data = event.ofp.data
+        msg.in_port = event.port
     msg.actions.append(of.ofp_action_output(port=of.OFPP_FLOOD))
+    if prof:
+        t = prof.mark(STAGE_BUILD, t)
     event.connection.send(msg)
+    control_bytes_out += len(msg)
+    if prof:
+        prof.mark(STAGE_SEND, t)
 
 
-def launch():
-    """Initialize the controller and register packet handler."""
-    core.openflow.addListenerByName("PacketIn", _handle_PacketIn)
-    log.info(f"Rate limiting controller started (threshold: {RATE_THRESHOLD} pps)")
+def _handle_GoingDown(event):
+    """Flush exports, remove the telemetry ring and write profiles before POX exits."""
+    if exporter and not exporter.close():
+        log.warning(f"Rate export thread did not stop; {exporter.path} may be incomplete")
+    if publisher:
+        publisher.close()
+    if flow_log_file:
+        flow_log_file.close()
+    if guard is not None:
+        log.info(f"SYN guard: {guard.syns} SYNs ({guard.dropped} over budget), "
+                 f"{guard.validated} handshakes validated, {guard.unmatched} unmatched ACKs")
+    if session and session.active:
+        session.stop()
+    if profiler:
+        log.info(f"Wrote stage timings to {profiler.dump(profile_dir)}")
 
+
+def launch(miss_send_len=MISS_SEND_LEN, baseline=False, rate_log=RATE_LOG, acl=None, config_file=None,
+           threshold=RATE_THRESHOLD, block_duration=BLOCK_DURATION, window=WINDOW,
+           detector=DETECTOR, max_sources=MAX_SOURCES,
+           flow_table_capacity=FLOW_TABLE_CAPACITY, flow_log=FLOW_LOG, syn_guard=False,
+           syn_rate=SYN_RATE, telemetry=False,
+           profile=None, profile_session='cprofile'):
+    """
+    Initialize the controller and register packet handler.
+
+    Args:
+        miss_send_len: Bytes of each buffered packet included in PacketIns
+        baseline: Keep the original PacketOut handling (msg.data = event.ofp)
+            and POX's default miss_send_len, for before/after comparison
+        rate_log: Binary log of per-interval source rate histograms
+            (empty to disable)
+        telemetry: Publish interval counters on the shared-memory
+            telemetry bus ('controller' channel)
+        profile: Record per-stage handler timings into this directory
+            ('profile' for a bare --profile); SIGUSR1 writes them immediately
+            and SIGUSR2 starts/stops a profile session
+        profile_session: Session type toggled by SIGUSR2 ('cprofile',
+            'tracemalloc' or 'both')
+        acl: Allow/deny list file, reloaded automatically when it changes
+        config_file: ``key = value`` parameter file, reloaded automatically when
+            it changes; its values override the arguments below
+        threshold: Packets per second above which a source is blocked
+        block_duration: Seconds a blocked source stays blocked
+        window: Counting window length in seconds
+        detector: Counting strategy ('fixed' or 'sliding')
+        max_sources: Maximum sources tracked per window
+        flow_table_capacity: Drop rules and connection flows installed per
+            switch before the least recently hit ones are evicted
+        flow_log: File receiving per-switch rule counts every
+            FLOW_STATS_INTERVAL seconds (empty to disable)
+        syn_guard: Validate TCP handshakes; only completed handshakes get
+            forwarding flows
+        syn_rate: SYNs forwarded per second by the SYN guard (0: no limit)
+    """
+    global MISS_SEND_LEN, use_buffer, acl_file, config_watcher, exporter, publisher, \
+        profiler, session, profile_dir, flow_log_file, guard
+    MISS_SEND_LEN = int(miss_send_len)
+    use_buffer = not baseline
+
+    changed = config.update({
+        'threshold': threshold,
+        'block_duration': block_duration,
+        'window': window,
+        'detector': detector,
+        'max_sources': max_sources,
+        'flow_table_capacity': flow_table_capacity,
+        'syn_rate': syn_rate,
+    })
+    if changed:
+        _apply_config(changed)
+
+    if config_file:
+        config_watcher = ConfigWatcher(config_file, config, on_change=_apply_config)
+        config_watcher.poll()
+        Timer(CONFIG_RELOAD_INTERVAL, _poll_config, recurring=True)
+
+    if acl:
+        acl_file = acl
+        _load_acl()
+        Timer(ACL_RELOAD_INTERVAL, _load_acl, recurring=True)
+
+    if rate_log:
+        exporter = RateExporter(rate_log, top_n=TOP_SOURCES, key=lambda ip: ip.toUnsigned())
+        log.info(f"Exporting source rate histograms to {rate_log}")
+    if telemetry:
+        publisher = TelemetryPublisher('controller')
+        log.info("Publishing counters on telemetry channel 'controller'")
+    if profile:
+        profile_dir = PROFILE_DIR if profile is True else profile
+        profiler = StageProfiler(PROFILE_STAGES)
+        session = ProfileSession(profile_dir, profile_session)
+        install_signal_handlers(profiler, session, profile_dir, core.callLater, log.info)
+        log.info(f"Profiling handler stages into {profile_dir} "
+                 f"(SIGUSR1: dump, SIGUSR2: {profile_session} session)")
+    core.addListenerByName("GoingDownEvent", _handle_GoingDown)
+
+    if flow_log:
+        flow_log_file = open(flow_log, 'a')
+    if syn_guard:
+        guard = SynGuard(SYN_GUARD_BITS, timeout=SYN_GUARD_TIMEOUT, syn_rate=config.syn_rate,
+                         now=time.time())
+        log.info(f"SYN guard enabled ({guard.nbytes >> 10} KiB, "
+                 f"SYN budget: {config.syn_rate or 'unlimited'}/s)")
+    Timer(FLOW_STATS_INTERVAL, _request_flow_stats, recurring=True)
+
+    core.openflow.addListenerByName("ConnectionUp", _handle_ConnectionUp)
+    core.openflow.addListenerByName("ConnectionDown", _handle_ConnectionDown)
+    core.openflow.addListenerByName("PacketIn", _handle_PacketIn)
+    core.openflow.addListenerByName("FlowStatsReceived", _handle_FlowStatsReceived)
+    core.openflow.addListenerByName("FlowRemoved", _handle_FlowRemoved)
+    core.openflow.addListenerByName("ErrorIn", _handle_ErrorIn)
+    log.info(f"Rate limiting controller started (threshold: {config.threshold} pps, "
+             f"detector: {config.detector})")
+    if use_buffer:
+        log.info(f"Using switch buffers (miss_send_len: {MISS_SEND_LEN} bytes)")
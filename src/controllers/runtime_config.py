@@ -0,0 +1,153 @@
+"""
+Runtime-configurable controller parameters.
+
+Holds the tunables of a controller as typed attributes that can be set from
+POX launch() arguments and changed while the controller runs by editing a
+config file.
+"""
+
+import os
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def _coerce(value, kind):
+    """Convert a launch()/file string to the type of a parameter's default."""
+    if not isinstance(value, str) or kind is str:
+        return kind(value)
+    if kind is bool:
+        if value.lower() in _TRUE:
+            return True
+        if value.lower() in _FALSE:
+            return False
+        raise ValueError(f"Expected a boolean, got {value!r}")
+    return kind(value)
+
+
+class ControllerConfig:
+    """Named controller parameters with fixed types, choices and ranges."""
+
+    def __init__(self, choices=None, positive=(), non_negative=(), maximum=None, **defaults):
+        """
+        Initialize configuration.
+
+        Args:
+            choices: Optional mapping of parameter name to allowed values
+            positive: Names of numeric parameters that must be greater than 0
+            non_negative: Names of numeric parameters that must be 0 or more
+            maximum: Optional mapping of numeric parameter name to its
+                largest allowed value
+            **defaults: Parameter names and their default values
+        """
+        self._types = {name: type(value) for name, value in defaults.items()}
+        self._choices = choices or {}
+        self._positive = frozenset(positive)
+        self._non_negative = frozenset(non_negative)
+        self._maximum = maximum or {}
+        self.__dict__.update(defaults)
+
+    def as_dict(self):
+        """Return the current parameter values."""
+        return {name: getattr(self, name) for name in self._types}
+
+    def update(self, values):
+        """
+        Validate and apply new parameter values.
+
+        All values are checked before any is applied, so a bad entry leaves
+        the configuration untouched.
+
+        Args:
+            values: Mapping of parameter name to new value (or string)
+
+        Returns:
+            Dict of the parameters whose value changed, name -> new value
+
+        Raises:
+            ValueError: On an unknown parameter or an invalid value
+        """
+        parsed = {}
+        for name, value in values.items():
+            if name not in self._types:
+                raise ValueError(f"Unknown parameter: {name}")
+            try:
+                value = _coerce(value, self._types[name])
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid value for {name}: {e}")
+            if name in self._choices and value not in self._choices[name]:
+                raise ValueError(f"{name} must be one of {sorted(self._choices[name])}")
+            if name in self._positive and not value > 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+            if name in self._non_negative and not value >= 0:
+                raise ValueError(f"{name} must not be negative, got {value}")
+            if name in self._maximum and not value <= self._maximum[name]:
+                raise ValueError(f"{name} must be at most {self._maximum[name]}, got {value}")
+            parsed[name] = value
+
+        changed = {name: value for name, value in parsed.items()
+                   if getattr(self, name) != value}
+        self.__dict__.update(changed)
+        return changed
+
+
+def read_config_file(path):
+    """
+    Read ``key = value`` lines from a config file.
+
+    Blank lines and text after ``#`` are ignored.
+
+    Args:
+        path: Path to the config file
+
+    Returns:
+        Dict of parameter name -> string value
+    """
+    values = {}
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if '=' not in line:
+                raise ValueError(f"{path}:{line_no}: expected 'key = value'")
+            key, value = line.split('=', 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+class ConfigWatcher:
+    """Apply a config file to a ControllerConfig whenever the file changes."""
+
+    def __init__(self, path, config, on_change=None):
+        """
+        Initialize watcher.
+
+        Args:
+            path: Config file to watch
+            config: ControllerConfig to update
+            on_change: Optional callback called with the dict of changed values
+        """
+        self.path = path
+        self.config = config
+        self.on_change = on_change
+        self._mtime = None
+
+    def poll(self):
+        """
+        Reload the file if its mtime changed.
+
+        Returns:
+            Dict of changed parameters (empty if nothing changed)
+
+        Raises:
+            OSError, ValueError: If the file cannot be read or is invalid
+        """
+        mtime = os.stat(self.path).st_mtime
+        if mtime == self._mtime:
+            return {}
+        self._mtime = mtime
+        changed = self.config.update(read_config_file(self.path))
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
@@ -0,0 +1,219 @@
+"""
+TCP handshake validation for SYN floods.
+
+Spoofed SYNs defeat per-source counting because every SYN comes from a new
+source, and tracking each of them would grow controller state without bound.
+SynGuard instead remembers handshakes in a rotating Bloom filter of fixed
+size and only validates a connection once its client has acknowledged the
+server's SYN-ACK:
+
+1. A client SYN records (client, server, ports, client ISN + 1), once on its
+   own and once together with the switch port it arrived on
+2. The server's SYN-ACK must acknowledge a recorded SYN and arrive on a
+   different port than that SYN; it records (client, server, ports, server
+   ISN + 1)
+3. The client's ACK must acknowledge the server ISN + 1 and carry the client
+   ISN + 1, arriving on the SYN's port
+
+The client chooses its own ISN, so the ACK's sequence number proves nothing;
+its acknowledgment number does, because only a host that received the
+SYN-ACK knows the server's ISN. A blind spoofer cannot complete step 3, and a
+SYN-ACK forged from the attacker's own port fails step 2. Validation relies on
+the attacker not seeing the server's replies: a controller that floods every
+packet to all ports delivers the SYN-ACK to the attacker as well.
+
+Memory is the same for a thousand SYNs or a billion; under overload only the
+false-positive rate rises. The filter has a current and a previous
+generation, swapped every `timeout` seconds, so a handshake is remembered for
+between one and two timeouts.
+
+The first SYN of a source is kept out of per-source counting, so spoofed
+floods do not fill the detector, but a source that sends SYNs again within
+the timeout is counted as usual. Optionally, SYNs beyond `syn_rate` per
+second are not forwarded at all.
+"""
+
+import math
+import random
+
+SYN_FORWARD = 'forward'  # first SYN of its source: forward without counting
+SYN_REPEAT = 'repeat'    # source sent SYNs before: forward and count it
+SYN_DROP = 'drop'        # SYN over the rate budget, do not forward
+
+# Key tags, so the different records share one filter
+_SYN, _SYN_PORT, _SYN_ACK, _SOURCE = range(4)
+
+_MASK64 = (1 << 64) - 1
+
+
+class RotatingBloomFilter:
+    """Two-generation Bloom filter whose entries expire after one to two intervals."""
+
+    def __init__(self, bits, hashes, interval, now=0.0):
+        """
+        Initialize filter.
+
+        Args:
+            bits: Bits per generation (rounded up to a power of two)
+            hashes: Bit positions set per key
+            interval: Seconds between generation swaps
+            now: Current time
+        """
+        self.bits = 1 << max(3, (bits - 1).bit_length())
+        self.mask = self.bits - 1
+        self.hashes = hashes
+        self.interval = interval
+        self.rotated_at = now
+        self._current = bytearray(self.bits // 8)
+        self._previous = bytearray(self.bits // 8)
+        self._zeros = bytes(self.bits // 8)
+        self._salt = random.getrandbits(64)  # keeps colliding keys unpredictable
+        self.count = 0  # keys added to the current generation
+
+    @property
+    def nbytes(self):
+        """Memory held by the bit arrays."""
+        return len(self._current) + len(self._previous) + len(self._zeros)
+
+    def _rotate(self, now):
+        elapsed = now - self.rotated_at
+        if elapsed < self.interval:
+            return
+        if elapsed >= 2 * self.interval:
+            self._previous[:] = self._zeros
+        else:
+            self._previous, self._current = self._current, self._previous
+        self._current[:] = self._zeros
+        self.rotated_at = now
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: positions h1 + i * h2 from one 64-bit hash
+        h = hash((self._salt, key)) & _MASK64
+        h1, h2 = h & 0xffffffff, (h >> 32) | 1
+        return [(h1 + i * h2) & self.mask for i in range(self.hashes)]
+
+    def add(self, key, now):
+        """Insert a hashable key."""
+        self._rotate(now)
+        current = self._current
+        for pos in self._positions(key):
+            current[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def contains(self, key, now):
+        """Return True if key was probably added within the last one to two intervals."""
+        self._rotate(now)
+        positions = self._positions(key)
+        for generation in (self._current, self._previous):
+            if all(generation[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return True
+        return False
+
+    def false_positive_rate(self):
+        """Estimated false-positive rate of the current generation."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+
+class SynGuard:
+    """Validate TCP handshakes with constant memory."""
+
+    def __init__(self, bits=1 << 23, hashes=4, timeout=5.0, syn_rate=0, now=0.0):
+        """
+        Initialize guard.
+
+        Args:
+            bits: Bloom filter bits per generation (1 MiB for the default)
+            hashes: Bloom filter hash functions
+            timeout: Seconds a client has to complete its handshake (at least)
+            syn_rate: SYNs forwarded per second, 0 for no limit
+            now: Current time
+        """
+        self.pending = RotatingBloomFilter(bits, hashes, timeout, now)
+        self.syn_rate = syn_rate
+        self.window_start = now
+        self.window_syns = 0
+        self.syns = 0       # SYNs seen
+        self.dropped = 0    # SYNs over the rate budget
+        self.validated = 0  # handshakes completed
+        self.unmatched = 0  # ACKs without a recorded SYN
+
+    @property
+    def nbytes(self):
+        """Memory held by the handshake filter."""
+        return self.pending.nbytes
+
+    def syn(self, src, dst, sport, dport, seq, port, now):
+        """
+        Record a client SYN.
+
+        Args:
+            src, dst: IPv4 addresses as unsigned ints
+            sport, dport: TCP ports
+            seq: Sequence number of the SYN (client ISN)
+            port: Hashable ingress point, e.g. (dpid, in_port)
+            now: Current time
+
+        Returns:
+            SYN_FORWARD, SYN_REPEAT or SYN_DROP
+        """
+        self.syns += 1
+        if self.syn_rate:
+            if now - self.window_start >= 1.0:
+                self.window_start = now
+                self.window_syns = 0
+            if self.window_syns >= self.syn_rate:
+                self.dropped += 1
+                return SYN_DROP
+            self.window_syns += 1
+        pending = self.pending
+        isn = (seq + 1) & 0xffffffff
+        pending.add((_SYN, src, dst, sport, dport, isn), now)
+        pending.add((_SYN_PORT, port, src, dst, sport, dport, isn), now)
+        if pending.contains((_SOURCE, src), now):
+            return SYN_REPEAT
+        pending.add((_SOURCE, src), now)
+        return SYN_FORWARD
+
+    def syn_ack(self, src, dst, sport, dport, seq, ack, port, now):
+        """
+        Record a server SYN-ACK answering a recorded SYN.
+
+        Args:
+            src, dst, sport, dport: Connection as seen from the server
+            seq: Sequence number of the SYN-ACK (server ISN)
+            ack: Acknowledgment number (client ISN + 1)
+            port: Ingress point of the SYN-ACK
+            now: Current time
+
+        Returns:
+            True if the SYN-ACK was recorded
+        """
+        pending = self.pending
+        if (not pending.contains((_SYN, dst, src, dport, sport, ack), now) or
+                pending.contains((_SYN_PORT, port, dst, src, dport, sport, ack), now)):
+            return False
+        pending.add((_SYN_ACK, dst, src, dport, sport, (seq + 1) & 0xffffffff), now)
+        return True
+
+    def ack(self, src, dst, sport, dport, seq, ack, port, now):
+        """
+        Check whether a client ACK completes a recorded handshake.
+
+        Args:
+            src, dst, sport, dport: Connection as seen from the client
+            seq: Sequence number of the ACK (client ISN + 1)
+            ack: Acknowledgment number (server ISN + 1)
+            port: Ingress point of the ACK
+            now: Current time
+
+        Returns:
+            True if the handshake is valid
+        """
+        pending = self.pending
+        if (pending.contains((_SYN_ACK, src, dst, sport, dport, ack), now) and
+                pending.contains((_SYN_PORT, port, src, dst, sport, dport, seq), now)):
+            self.validated += 1
+            return True
+        self.unmatched += 1
+        return False
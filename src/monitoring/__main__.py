@@ -0,0 +1,10 @@
+"""
+Lightweight controller monitor entry point.
+
+Usage:
+    python3 -m src.monitoring [log_file] [--telemetry]
+"""
+
+from .cpu_track import main
+
+main()
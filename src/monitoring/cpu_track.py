@@ -1,13 +1,21 @@
 """
 Controller Resource Monitoring Tool.
 
-Monitors CPU and memory usage of the POX SDN controller process.
+Monitors CPU and memory usage of the POX SDN controller process. Only psutil
+is imported up front so sampling starts as soon as possible; the telemetry
+bus is imported only when --telemetry is given.
+
+Usage:
+    python3 cpu_track.py [log_file] [--telemetry]
+    python3 -m src.monitoring [log_file] [--telemetry]
 """
 
+import os
 import sys
 import time
 import psutil
-import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 
 def get_pox_pid():
@@ -21,37 +29,66 @@ def get_pox_pid():
     return None
 
 
-def monitor_controller(pid, log_file='controller_usage.txt'):
+def monitor_controller(pid, log_file='controller_usage.txt', publisher=None):
     """
     Monitor controller CPU and memory usage.
     
     Args:
         pid: Process ID of the POX controller
         log_file: File path to write monitoring data
+        publisher: Optional TelemetryPublisher receiving every sample
     """
+    if publisher:
+        from src.monitoring.telemetry import KIND_RESOURCES
     with open(log_file, 'a') as f:
+        try:
+            proc = psutil.Process(pid)
+            cmdline = ' '.join(proc.cmdline())
+        except psutil.NoSuchProcess:
+            print("Controller process ended.")
+            return
         while True:
             try:
-                proc = psutil.Process(pid)
                 cpu = proc.cpu_percent(interval=0.20)
                 mem = proc.memory_percent()
-                cmdline = ' '.join(proc.cmdline())
                 timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
                 f.write(f"{timestamp}, CPU: {cpu:.2f}%, MEM: {mem:.2f}%, CMD: {cmdline}\n")
                 f.flush()
+                if publisher:
+                    publisher.publish(KIND_RESOURCES, 0, cpu, mem)
             except psutil.NoSuchProcess:
                 print("Controller process ended.")
                 break
 
 
-if __name__ == "__main__":
-    log_file = sys.argv[1] if len(sys.argv) > 1 else 'controller_usage.txt'
-    
+def main(argv=None):
+    """Command line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Monitor POX controller CPU and memory')
+    parser.add_argument('log_file', nargs='?', default='controller_usage.txt',
+                        help='File to append samples to')
+    parser.add_argument('--telemetry', action='store_true',
+                        help="Publish samples on the 'resources' telemetry channel")
+    args = parser.parse_args(argv)
+
     pid = get_pox_pid()
     if pid:
         print(f"Monitoring POX controller with PID {pid}")
-        print(f"Logging to: {log_file}")
-        monitor_controller(pid, log_file)
+        print(f"Logging to: {args.log_file}")
+        publisher = None
+        if args.telemetry:
+            from src.monitoring.telemetry import TelemetryPublisher
+            publisher = TelemetryPublisher('resources')
+        try:
+            monitor_controller(pid, args.log_file, publisher)
+        finally:
+            if publisher:
+                publisher.close()
     else:
         print("POX controller not found.")
 
+
+if __name__ == "__main__":
+    main()
+
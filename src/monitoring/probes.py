@@ -0,0 +1,266 @@
+"""
+Victim-side latency and goodput probes.
+
+Measures what a legitimate user of the victim experiences during an attack.
+A benign probe host runs two clients against two servers on the victim:
+
+- latency: UDP echo requests at a fixed interval; every request is logged
+  with its round-trip time, or as lost after a timeout
+- goodput: a rate-capped TCP stream; the sink on the victim logs the bytes
+  received per interval
+
+Each sample is one CSV line with an epoch timestamp, so the files line up with
+bandwidth.txt and timestamps.txt. The probes only use the standard library
+and run over loopback as well as between Mininet hosts.
+
+Usage:
+    python3 probes.py echo [--port PORT]
+    python3 probes.py latency TARGET [--port PORT] [--output FILE]
+    python3 probes.py sink [--port PORT] [--output FILE]
+    python3 probes.py send TARGET [--port PORT] [--rate BYTES_PER_S]
+"""
+
+import select
+import signal
+import socket
+import struct
+import threading
+import time
+
+ECHO_PORT = 5201
+GOODPUT_PORT = 5202
+LATENCY_FILE = 'probe_latency.txt'  # timestamp, seq, rtt_ms (empty if lost)
+GOODPUT_FILE = 'probe_goodput.txt'  # timestamp, bytes/s received
+
+# Defaults keep the probe host well below the rate limiting controller's
+# default threshold of 50 packets/s, so the probe itself is never blocked
+LATENCY_INTERVAL = 0.2  # seconds between echo requests
+LATENCY_TIMEOUT = 1.0   # seconds before a request counts as lost
+GOODPUT_RATE = 40000    # bytes/s offered by the sender
+GOODPUT_INTERVAL = 1.0  # seconds per goodput sample
+CHUNK_SIZE = 4096
+
+PROBE = struct.Struct('!Id')  # sequence number, send time (perf_counter)
+
+
+def run_echo_server(port=ECHO_PORT, bind='0.0.0.0', stop=None):
+    """
+    Echo UDP datagrams back to their sender until stop is set.
+
+    Args:
+        port: UDP port to listen on
+        bind: Address to bind
+        stop: threading.Event ending the server (default: run forever)
+    """
+    stop = stop or threading.Event()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind((bind, port))
+        sock.settimeout(0.2)
+        while not stop.is_set():
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            sock.sendto(data, addr)
+
+
+def run_latency_probe(target, port=ECHO_PORT, output=LATENCY_FILE, interval=LATENCY_INTERVAL,
+                      timeout=LATENCY_TIMEOUT, duration=None, stop=None):
+    """
+    Send echo requests at a fixed interval and log every round-trip time.
+
+    Requests are sent on schedule even while earlier ones are outstanding;
+    a request without a reply within timeout is logged with an empty RTT.
+
+    Args:
+        target: Address of the echo server
+        port: UDP port of the echo server
+        output: CSV file to append samples to
+        interval: Seconds between requests
+        timeout: Seconds before a request counts as lost
+        duration: Stop after this many seconds (default: until stop is set)
+        stop: threading.Event ending the probe
+
+    Returns:
+        Tuple (sent, lost)
+    """
+    stop = stop or threading.Event()
+    pending = {}  # seq -> (epoch send time, perf_counter send time)
+    sent = lost = 0
+    deadline = None if duration is None else time.monotonic() + duration
+    next_send = time.perf_counter()
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock, open(output, 'a') as f:
+        sock.connect((target, port))
+        while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+            now = time.perf_counter()
+            if now >= next_send:
+                pending[sent] = (time.time(), now)
+                try:
+                    sock.send(PROBE.pack(sent, now))
+                except OSError:
+                    pass  # unreachable right now: the request times out as lost
+                sent += 1
+                next_send += interval
+
+            ready, _, _ = select.select([sock], [], [], max(0.0, next_send - time.perf_counter()))
+            if ready:
+                try:
+                    seq, sent_at = PROBE.unpack(sock.recv(2048)[:PROBE.size])
+                except (OSError, struct.error):
+                    continue
+                if seq in pending:
+                    epoch, _ = pending.pop(seq)
+                    f.write(f"{epoch:.6f},{seq},{(time.perf_counter() - sent_at) * 1000:.3f}\n")
+
+            expired = [seq for seq, (_, at) in pending.items()
+                       if time.perf_counter() - at > timeout]
+            for seq in expired:
+                epoch, _ = pending.pop(seq)
+                f.write(f"{epoch:.6f},{seq},\n")
+                lost += 1
+            f.flush()
+
+        for seq, (epoch, _) in sorted(pending.items()):
+            f.write(f"{epoch:.6f},{seq},\n")
+            lost += 1
+    return sent, lost
+
+
+def run_goodput_sink(port=GOODPUT_PORT, output=GOODPUT_FILE, interval=GOODPUT_INTERVAL,
+                     bind='0.0.0.0', stop=None, ready=None):
+    """
+    Accept TCP streams and log the bytes received per interval.
+
+    An interval without any data is logged as 0, so stalls show up in the
+    goodput series. A sender may reconnect at any time.
+
+    Args:
+        port: TCP port to listen on
+        output: CSV file to append samples to
+        interval: Seconds per sample
+        bind: Address to bind
+        stop: threading.Event ending the sink
+        ready: threading.Event set once the sink is listening
+
+    Returns:
+        Total bytes received
+    """
+    stop = stop or threading.Event()
+    total = received = 0
+    connections = []
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server, open(output, 'a') as f:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((bind, port))
+        server.listen()
+        if ready:
+            ready.set()
+        window_start = time.time()
+        while not stop.is_set():
+            readable, _, _ = select.select([server] + connections, [], [], 0.1)
+            for sock in readable:
+                if sock is server:
+                    conn, _ = server.accept()
+                    connections.append(conn)
+                    continue
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    data = b''
+                if not data:
+                    connections.remove(sock)
+                    sock.close()
+                received += len(data)
+
+            now = time.time()
+            if now - window_start >= interval:
+                f.write(f"{now:.6f},{received / (now - window_start):.1f}\n")
+                f.flush()
+                total += received
+                received = 0
+                window_start = now
+        for conn in connections:
+            conn.close()
+    return total + received
+
+
+def run_goodput_sender(target, port=GOODPUT_PORT, rate=GOODPUT_RATE, duration=None, stop=None):
+    """
+    Stream data to a goodput sink at a capped rate, reconnecting on errors.
+
+    Args:
+        target: Address of the sink
+        port: TCP port of the sink
+        rate: Bytes per second to offer
+        duration: Stop after this many seconds (default: until stop is set)
+        stop: threading.Event ending the sender
+
+    Returns:
+        Total bytes handed to the kernel
+    """
+    stop = stop or threading.Event()
+    chunk = b'\0' * CHUNK_SIZE
+    sent = 0
+    deadline = None if duration is None else time.monotonic() + duration
+    while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+        try:
+            with socket.create_connection((target, port), timeout=1.0) as sock:
+                start, start_sent = time.monotonic(), sent
+                while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+                    # Token bucket: never get ahead of rate * elapsed
+                    ahead = (sent - start_sent) / rate - (time.monotonic() - start)
+                    if ahead > 0:
+                        stop.wait(ahead)
+                        continue
+                    sock.sendall(chunk)
+                    sent += len(chunk)
+        except OSError:
+            stop.wait(0.5)
+    return sent
+
+
+def main(argv=None):
+    """Command line entry point; SIGTERM and SIGINT stop the probe cleanly."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Victim latency and goodput probes')
+    sub = parser.add_subparsers(dest='command', required=True)
+    echo = sub.add_parser('echo', help='UDP echo server (victim)')
+    echo.add_argument('--port', type=int, default=ECHO_PORT)
+    latency = sub.add_parser('latency', help='UDP latency probe (probe host)')
+    latency.add_argument('target')
+    latency.add_argument('--port', type=int, default=ECHO_PORT)
+    latency.add_argument('--output', default=LATENCY_FILE)
+    latency.add_argument('--interval', type=float, default=LATENCY_INTERVAL)
+    latency.add_argument('--timeout', type=float, default=LATENCY_TIMEOUT)
+    sink = sub.add_parser('sink', help='TCP goodput sink (victim)')
+    sink.add_argument('--port', type=int, default=GOODPUT_PORT)
+    sink.add_argument('--output', default=GOODPUT_FILE)
+    sink.add_argument('--interval', type=float, default=GOODPUT_INTERVAL)
+    send = sub.add_parser('send', help='TCP goodput sender (probe host)')
+    send.add_argument('target')
+    send.add_argument('--port', type=int, default=GOODPUT_PORT)
+    send.add_argument('--rate', type=float, default=GOODPUT_RATE, help='Bytes per second')
+    for p in (latency, send):
+        p.add_argument('--duration', type=float, default=None, help='Stop after N seconds')
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    if args.command == 'echo':
+        run_echo_server(args.port, stop=stop)
+    elif args.command == 'latency':
+        sent, lost = run_latency_probe(args.target, args.port, args.output, args.interval,
+                                       args.timeout, args.duration, stop)
+        print(f"Latency probe: {sent} requests, {lost} lost")
+    elif args.command == 'sink':
+        total = run_goodput_sink(args.port, args.output, args.interval, stop=stop)
+        print(f"Goodput sink: {total} bytes received")
+    elif args.command == 'send':
+        run_goodput_sender(args.target, args.port, args.rate, args.duration, stop)
+
+
+if __name__ == '__main__':
+    main()
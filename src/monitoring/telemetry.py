@@ -0,0 +1,383 @@
+"""
+Shared-memory live telemetry bus.
+
+Each publisher (controller counters, resource sampler, bandwidth collector)
+owns one ring buffer in a multiprocessing.shared_memory segment named after
+its channel and appends fixed-size records to it. Any number of subscribers
+(live viewer, offline recorder) attach to the segment and read records
+straight out of shared memory with their own cursor; publishers never wait
+for subscribers, and a subscriber that falls more than a ring behind skips
+ahead and counts the records it lost.
+
+Segment layout (little-endian):
+    header   magic 'SDNT', version, capacity, record size, write count
+    names    MAX_KEYS x KEY_NAME_SIZE bytes of key names (e.g. interfaces)
+    records  capacity x RECORD.size bytes
+
+Usage:
+    python3 telemetry.py record --output DIR [channels...]
+"""
+
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+MAGIC = b'SDNT'
+VERSION = 1
+SEGMENT_PREFIX = 'sdn_telemetry_'
+DEFAULT_CAPACITY = 4096
+
+CHANNELS = ['controller', 'resources', 'bandwidth']
+
+# Record kinds: meaning of the (a, b) values
+KIND_PACKETS = 1        # controller: packets in interval, distinct sources
+KIND_CONTROL_BYTES = 2  # controller: PacketIn B/s, PacketOut/FlowMod B/s
+KIND_RESOURCES = 3      # resources: CPU %, memory %
+KIND_BANDWIDTH = 4      # bandwidth: bytes out/s, bytes in/s of interface `key`
+
+HEADER = struct.Struct('<4sHHIIQ')  # magic, version, reserved, capacity, record size, write count
+WRITE_COUNT_OFFSET = 16
+MAX_KEYS = 32
+KEY_NAME_SIZE = 16
+NAMES_OFFSET = 32
+RECORDS_OFFSET = NAMES_OFFSET + MAX_KEYS * KEY_NAME_SIZE
+RECORD = struct.Struct('<QdHH4xdd')  # seq, timestamp, kind, key, a, b
+COUNT = struct.Struct('<Q')
+
+Record = namedtuple('Record', 'seq timestamp kind key a b')
+
+_published = set()  # segments created by publishers in this process
+
+
+def segment_name(channel):
+    """Return the shared memory segment name of a channel."""
+    return SEGMENT_PREFIX + channel
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attachment with the resource tracker,
+        # which would destroy the publisher's segment when we exit
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _published:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class TelemetryPublisher:
+    """Single writer of one telemetry channel."""
+
+    def __init__(self, channel, capacity=DEFAULT_CAPACITY):
+        """
+        Create (or replace) the channel's shared memory ring.
+
+        Args:
+            channel: Channel name, e.g. 'controller'
+            capacity: Number of records the ring holds
+        """
+        self.channel = channel
+        self.capacity = capacity
+        size = RECORDS_OFFSET + capacity * RECORD.size
+        try:
+            # Remove a ring left behind by a publisher that did not exit cleanly
+            stale = shared_memory.SharedMemory(name=segment_name(channel))
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = shared_memory.SharedMemory(name=segment_name(channel), create=True, size=size)
+        _published.add(segment_name(channel))
+        self._buf = self._shm.buf
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, 0, capacity, RECORD.size, 0)
+        self._count = 0
+        self._keys = {}
+
+    def key(self, name):
+        """
+        Return the numeric key for a name, registering it on first use.
+
+        Subscribers resolve keys back to names through the segment.
+        """
+        if name not in self._keys:
+            index = len(self._keys)
+            if index >= MAX_KEYS:
+                raise ValueError(f"Channel {self.channel} has more than {MAX_KEYS} keys")
+            encoded = name.encode()[:KEY_NAME_SIZE]
+            offset = NAMES_OFFSET + index * KEY_NAME_SIZE
+            self._buf[offset:offset + KEY_NAME_SIZE] = encoded.ljust(KEY_NAME_SIZE, b'\0')
+            self._keys[name] = index
+        return self._keys[name]
+
+    def publish(self, kind, key, a, b=0.0, timestamp=None):
+        """
+        Append one record to the ring.
+
+        Args:
+            kind: Record kind (KIND_* constant)
+            key: Key index (see key()), 0 if unused
+            a, b: Record values
+            timestamp: Epoch seconds (default: now)
+        """
+        seq = self._count
+        offset = RECORDS_OFFSET + (seq % self.capacity) * RECORD.size
+        RECORD.pack_into(self._buf, offset, seq, time.time() if timestamp is None else timestamp,
+                         kind, key, a, b)
+        # Publish the record only after it is fully written
+        self._count = seq + 1
+        COUNT.pack_into(self._buf, WRITE_COUNT_OFFSET, self._count)
+
+    def close(self, unlink=True):
+        """Detach from the ring, removing it unless unlink is False."""
+        self._buf.release()
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+            _published.discard(self._shm.name)
+
+
+class TelemetrySubscriber:
+    """Reader of one telemetry channel with its own cursor."""
+
+    def __init__(self, channel, from_start=False):
+        """
+        Initialize subscriber. Attaching is retried on every poll until the
+        publisher has created the channel.
+
+        Args:
+            channel: Channel name
+            from_start: Read the records already in the ring instead of only
+                new ones
+        """
+        self.channel = channel
+        self.from_start = from_start
+        self.lost = 0
+        self._shm = None
+        self._cursor = 0
+
+    def _connect(self):
+        try:
+            shm = _attach(segment_name(self.channel))
+        except FileNotFoundError:
+            return False
+        magic, version, _, capacity, record_size, count = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            shm.close()
+            raise ValueError(f"Channel {self.channel} has an incompatible layout")
+        self._shm = shm
+        self._buf = shm.buf
+        self.capacity = capacity
+        self._cursor = max(0, count - capacity) if self.from_start else count
+        return True
+
+    @property
+    def connected(self):
+        return self._shm is not None
+
+    def _write_count(self):
+        return COUNT.unpack_from(self._buf, WRITE_COUNT_OFFSET)[0]
+
+    def key_name(self, key):
+        """Return the name registered by the publisher for a key."""
+        offset = NAMES_OFFSET + key * KEY_NAME_SIZE
+        return bytes(self._buf[offset:offset + KEY_NAME_SIZE]).rstrip(b'\0').decode()
+
+    def _available(self):
+        """Return (start, end) of unread record sequence numbers."""
+        if self._shm is None and not self._connect():
+            return None
+        end = self._write_count()
+        if end < self._cursor:
+            # The publisher restarted and recreated the ring under our feet
+            self.close()
+            return None
+        start = self._cursor
+        if end - start > self.capacity:
+            self.lost += end - self.capacity - start
+            start = end - self.capacity
+        return start, end
+
+    def poll(self, max_records=None):
+        """
+        Read records published since the last poll.
+
+        Args:
+            max_records: Maximum number of records to return
+
+        Returns:
+            List of Record tuples, oldest first
+        """
+        span = self._available()
+        if span is None:
+            return []
+        start, end = span
+        if max_records is not None:
+            end = min(end, start + max_records)
+
+        records = []
+        for seq in range(start, end):
+            offset = RECORDS_OFFSET + (seq % self.capacity) * RECORD.size
+            records.append(Record._make(RECORD.unpack_from(self._buf, offset)))
+
+        # Drop records the publisher overwrote while we were reading them
+        overwritten = self._write_count() - self.capacity
+        if overwritten > start:
+            valid = [r for r in records if r.seq >= overwritten]
+            self.lost += len(records) - len(valid)
+            records = valid
+        self._cursor = end
+        return records
+
+    def poll_raw(self, write):
+        """
+        Pass unread records to write() as memoryviews of the shared segment.
+
+        write() is called at most twice (the ring may wrap) with contiguous
+        slices of packed records, and must consume them before returning.
+
+        Returns:
+            Number of records passed on
+        """
+        span = self._available()
+        if span is None:
+            return 0
+        start, end = span
+        first = start % self.capacity
+        count = end - start
+        head = min(count, self.capacity - first)
+        chunks = [(first, head)]
+        if count > head:
+            chunks.append((0, count - head))
+        for index, length in chunks:
+            offset = RECORDS_OFFSET + index * RECORD.size
+            write(self._buf[offset:offset + length * RECORD.size])
+        self._cursor = end
+        return count
+
+    def close(self):
+        """Detach from the ring."""
+        if self._shm is not None:
+            self._buf.release()
+            self._shm.close()
+            self._shm = None
+
+
+def bandwidth_sink(publisher):
+    """
+    Return a line callback publishing bwm-ng CSV lines to a channel.
+
+    Records of interfaces beyond the channel's MAX_KEYS keys are dropped.
+
+    Args:
+        publisher: TelemetryPublisher of the 'bandwidth' channel
+    """
+    def on_line(line):
+        parts = line.split(',')
+        if len(parts) < 4:
+            return
+        try:
+            timestamp, out_rate, in_rate = float(parts[0]), float(parts[2]), float(parts[3])
+        except ValueError:
+            return
+        try:
+            key = publisher.key(parts[1])
+        except ValueError:
+            # More interfaces than the channel has keys: drop this one's records
+            # rather than stop the pump feeding bandwidth.txt
+            return
+        publisher.publish(KIND_BANDWIDTH, key, out_rate, in_rate, timestamp)
+    return on_line
+
+
+def read_recording(path):
+    """
+    Read a channel recording written by record().
+
+    Args:
+        path: Path of a telemetry-<channel>.bin file
+
+    Returns:
+        Tuple (records, key_names) where records is a list of Record tuples
+        and key_names maps key index -> name
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    records = []
+    for fields in RECORD.iter_unpack(data[:len(data) - len(data) % RECORD.size]):
+        # Skip records a lapping publisher overwrote while they were copied
+        if records and fields[0] <= records[-1].seq:
+            continue
+        records.append(Record._make(fields))
+    names_file = os.path.splitext(path)[0] + '.json'
+    key_names = {}
+    if os.path.exists(names_file):
+        with open(names_file, 'r') as f:
+            key_names = {int(k): v for k, v in json.load(f).items()}
+    return records, key_names
+
+
+def record(output_dir, channels=CHANNELS, interval=0.2, duration=None):
+    """
+    Append every record of the given channels to files until interrupted.
+
+    Records are copied straight from shared memory into
+    telemetry-<channel>.bin; key names go to telemetry-<channel>.json.
+
+    Args:
+        output_dir: Directory for the recordings
+        channels: Channel names to record
+        interval: Seconds between polls
+        duration: Stop after this many seconds (default: run until SIGTERM/SIGINT)
+    """
+    import signal
+
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    os.makedirs(output_dir, exist_ok=True)
+    subscribers = {c: TelemetrySubscriber(c, from_start=True) for c in channels}
+    files = {c: open(os.path.join(output_dir, f'telemetry-{c}.bin'), 'ab') for c in channels}
+    deadline = None if duration is None else time.time() + duration
+    try:
+        while not stop and (deadline is None or time.time() < deadline):
+            for channel, subscriber in subscribers.items():
+                subscriber.poll_raw(files[channel].write)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for channel, subscriber in subscribers.items():
+            subscriber.poll_raw(files[channel].write)
+            files[channel].close()
+            if subscriber.connected:
+                names = {}
+                for key in range(MAX_KEYS):
+                    name = subscriber.key_name(key)
+                    if not name:
+                        break
+                    names[key] = name
+                with open(os.path.join(output_dir, f'telemetry-{channel}.json'), 'w') as f:
+                    json.dump(names, f)
+            if subscriber.lost:
+                print(f"Warning: {subscriber.lost} {channel} records lost (recorder too slow)")
+            subscriber.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Telemetry bus tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record', help='Record channels to files')
+    rec.add_argument('channels', nargs='*', default=CHANNELS)
+    rec.add_argument('--output', default='results', help='Output directory')
+    rec.add_argument('--interval', type=float, default=0.2, help='Poll interval (s)')
+    rec.add_argument('--duration', type=float, default=None, help='Stop after N seconds')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.output, args.channels, args.interval, args.duration)
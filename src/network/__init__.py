@@ -1,7 +1,22 @@
 """Network topology and management module."""
 
-from .topologies import SimpleTopo, LessSimpleTopo
-from .net import MyNetwork
+import importlib
 
-__all__ = ['SimpleTopo', 'LessSimpleTopo', 'MyNetwork']
+# Exported name -> defining submodule, imported lazily by __getattr__
+_EXPORTS = {
+    'SimpleTopo': '.topologies',
+    'LessSimpleTopo': '.topologies',
+    'MyNetwork': '.net',
+    'ProcessSupervisor': '.supervisor',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import exported names on first access so importing the package stays cheap."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -7,38 +7,44 @@ and metrics collection for evaluating SDN-based defense mechanisms.
 
 from datetime import datetime
 import os
+import signal
 import sys
-import psutil
 from subprocess import Popen, DEVNULL
 import time
-from mininet.topo import Topo
-from mininet.log import setLogLevel, info
+from mininet.log import setLogLevel
 from mininet.net import Mininet
 from mininet.node import RemoteController
-from mininet.cli import CLI
 from mininet.util import dumpNodeConnections
 
 # Add project root to path for imports
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 sys.path.insert(0, project_root)
 
-from src.network.topologies import SimpleTopo, LessSimpleTopo
-from src.visualization.create_graphs import create_all_graphs
+from src.network.topologies import PROBE_HOST, SimpleTopo, LessSimpleTopo
+from src.network.supervisor import FileSink, ProcessSupervisor, TeeSink
 
 
 class MyNetwork:
     """Manages SDN network setup, DoS attacks, and metrics collection."""
 
-    def __init__(self, topology='simple', output_dir='results'):
+    def __init__(self, topology='simple', output_dir='results', telemetry=False,
+                 profile_controller=False):
         """
         Initialize network manager.
         
         Args:
             topology: 'simple' or 'extended' topology
             output_dir: Directory to save results and metrics
+            telemetry: Publish bandwidth and controller resource samples on
+                the shared-memory telemetry bus and record all channels
+            profile_controller: Signal the controller (started with --profile)
+                to run a profile session for the duration of the attack
         """
         self.output_dir = output_dir
         self.topology_type = topology
+        self.telemetry = telemetry
+        self.bw_publisher = None
+        self.profile_controller = profile_controller
         os.makedirs(output_dir, exist_ok=True)
         
         timestamps_file = os.path.join(output_dir, 'timestamps.txt')
@@ -46,7 +52,7 @@ class MyNetwork:
             os.remove(timestamps_file)
         self.ts_file = open(timestamps_file, 'w')
         
-        self.cont_proc = None
+        self.supervisor = ProcessSupervisor()
         self.net = None
 
     def clean_env(self):
@@ -75,72 +81,160 @@ class MyNetwork:
         """Stop Mininet with current network."""
         if self.net:
             self.net.stop()
+            self.net = None
+
+    def shutdown(self):
+        """
+        Stop every supervised child, the telemetry publisher and Mininet.
+
+        Safe to call after a partial run and more than once, so it can run
+        from a finally block whatever stage the experiment reached.
+        """
+        self.supervisor.close()
+        if self.bw_publisher:
+            self.bw_publisher.close()
+            self.bw_publisher = None
+        if not self.ts_file.closed:
+            self.ts_file.close()
+        self.stop_net()
+        self.clean_env()
 
     def clear_metrics(self):
         """Clear previous metrics files."""
         print('* Clearing metrics')
-        bandwidth_file = os.path.join(self.output_dir, 'bandwidth.txt')
-        controller_usage_file = os.path.join(self.output_dir, 'controller_usage.txt')
-        
-        if os.path.exists(bandwidth_file):
-            os.remove(bandwidth_file)
-        if os.path.exists(controller_usage_file):
-            os.remove(controller_usage_file)
+        for name in ('bandwidth.txt', 'controller_usage.txt',
+                     'probe_latency.txt', 'probe_goodput.txt'):
+            path = os.path.join(self.output_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
 
     def start_metrics(self):
         """Start monitoring bandwidth and controller resources."""
         print('* Starting monitor')
         bandwidth_file = os.path.join(self.output_dir, 'bandwidth.txt')
-        cmd = f"bwm-ng -o csv -T rate -C ',' > {bandwidth_file} &"
-        Popen(cmd, shell=True).wait()
-        
         controller_usage_file = os.path.join(self.output_dir, 'controller_usage.txt')
         # Get absolute path for the script
         script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../monitoring/cpu_track.py'))
-        c_cmd = f"sudo python3 {script_path} {controller_usage_file}"
-        self.cont_proc = Popen(c_cmd, shell=True)
+
+        bw_sink = FileSink(bandwidth_file)
+        cpu_cmd = [sys.executable, script_path, controller_usage_file]
+        monitors = []
+        if self.telemetry:
+            from src.monitoring.telemetry import TelemetryPublisher, bandwidth_sink
+            self.bw_publisher = TelemetryPublisher('bandwidth')
+            bw_sink = TeeSink(bw_sink, bandwidth_sink(self.bw_publisher))
+            cpu_cmd.append('--telemetry')
+            telemetry_script = os.path.abspath(os.path.join(os.path.dirname(__file__), '../monitoring/telemetry.py'))
+            monitors.append(('telemetry', [sys.executable, telemetry_script, 'record',
+                                           '--output', self.output_dir], None))
+
+        self.supervisor.start_many([
+            ('bwm-ng', ['bwm-ng', '-o', 'csv', '-T', 'rate', '-C', ','], bw_sink),
+            ('cpu_track', cpu_cmd, None),
+        ] + monitors)
         self.ts_file.write(str(time.time())+'\n')
 
     def stop_metrics(self):
-        """Stop monitoring and clean up processes."""
+        """Stop monitoring processes started by start_metrics."""
         print('* Stopping monitor')
-        cmd = "killall bwm-ng"
-        Popen(cmd, shell=True).wait()
-        
-        if self.cont_proc:
-            self.cont_proc.terminate()
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                cmdline = proc.info['cmdline']
-                if cmdline and 'cpu_track.py' in ' '.join(cmdline):
-                    proc.kill()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        self.supervisor.stop_many(['bwm-ng', 'cpu_track'])
+        # Stop the recorder last so it drains what the monitors published
+        self.supervisor.stop('telemetry')
+        if self.bw_publisher:
+            self.bw_publisher.close()
+            self.bw_publisher = None
         self.ts_file.write(str(time.time())+'\n')
         self.ts_file.close()
 
+    def toggle_controller_profile(self):
+        """
+        Start or stop a profile session in the POX controller (SIGUSR2).
+
+        Only a controller started with --profile handles SIGUSR2; for any
+        other the signal's default action would kill it, so it is not sent.
+        """
+        import psutil
+        from src.monitoring.cpu_track import get_pox_pid
+        pid = get_pox_pid()
+        if pid is None:
+            print("** POX controller not found, not profiling")
+            return
+        try:
+            cmdline = psutil.Process(pid).cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            print("** POX controller command line not readable, not profiling")
+            return
+        if not any(arg == '--profile' or arg.startswith('--profile=') for arg in cmdline):
+            print(f"** POX controller (pid {pid}) was not started with --profile, not profiling")
+            return
+        os.kill(pid, signal.SIGUSR2)
+        print(f"** Toggled profile session of POX controller (pid {pid})")
+
+    def start_probes(self):
+        """Start latency and goodput probes from the probe host to the victim (h2)."""
+        print('* Starting probes')
+        script = os.path.abspath(os.path.join(os.path.dirname(__file__), '../monitoring/probes.py'))
+        victim = self.net.get('h2')
+        probe = self.net.get(PROBE_HOST)
+
+        def on_host(host, *args):
+            return ['mnexec', '-a', str(host.pid), sys.executable, script] + list(args)
+
+        self.supervisor.start_many([
+            ('probe-echo', on_host(victim, 'echo'), None),
+            ('probe-sink', on_host(victim, 'sink', '--output',
+                                   os.path.join(self.output_dir, 'probe_goodput.txt')), None),
+        ])
+        time.sleep(0.5)  # let the servers bind before the clients start
+        self.supervisor.start_many([
+            ('probe-latency', on_host(probe, 'latency', victim.IP(), '--output',
+                                      os.path.join(self.output_dir, 'probe_latency.txt')), None),
+            ('probe-send', on_host(probe, 'send', victim.IP()), None),
+        ])
+
+    def stop_probes(self):
+        """Stop the probe clients, then the servers on the victim."""
+        print('* Stopping probes')
+        self.supervisor.stop_many(['probe-latency', 'probe-send'])
+        self.supervisor.stop_many(['probe-echo', 'probe-sink'])
+
     def start_dos_attack(self):
         """Start DoS attack from h1 targeting h2."""
         print('* Starting DoS Attack')
-        print("** Attack started at:", datetime.now())
-        self.ts_file.write(str(time.time())+'\n')
+        # The process scan of the toggle happens before the attack start mark,
+        # so it does not delay hping3 relative to the timestamp
+        if self.profile_controller:
+            self.toggle_controller_profile()
         h1 = self.net.get('h1')
         h2_ip = self.net.get('h2').IP()
-        h1.cmd(f"hping3 --flood {h2_ip} &")
+        # mnexec runs hping3 inside h1's namespaces as our direct child
+        attack_file = os.path.join(self.output_dir, 'attack.txt')
+        print("** Attack started at:", datetime.now())
+        self.ts_file.write(str(time.time())+'\n')
+        self.supervisor.start('hping3', ['mnexec', '-a', str(h1.pid), 'hping3', '--flood', h2_ip],
+                              FileSink(attack_file))
 
     def stop_dos_attack(self):
         """Stop DoS attack."""
         print('* Stopping DoS Attack')
         self.ts_file.write(str(time.time())+'\n')
-        cmd = "killall hping3"
-        Popen(cmd, shell=True).wait()
+        # SIGINT makes hping3 print its packet statistics before exiting
+        self.supervisor.stop('hping3', sig=signal.SIGINT)
+        if self.profile_controller:
+            self.toggle_controller_profile()
         print("** Attack stopped at:", datetime.now())
     
-    def create_graphs(self):
-        """Generate visualization graphs from collected metrics."""
+    def create_graphs(self, workers=None):
+        """
+        Generate visualization graphs from collected metrics.
+
+        Args:
+            workers: Worker processes rendering the graphs (default: CPU count)
+        """
         print('* Creating Graphs')
-        create_all_graphs(self.output_dir)
+        # pandas and matplotlib are only imported once the experiment is over
+        from src.visualization.create_graphs import create_all_graphs
+        create_all_graphs(self.output_dir, workers=workers)
 
 
 if __name__ == '__main__':
@@ -157,29 +251,78 @@ if __name__ == '__main__':
                         help='SDN controller IP address')
     parser.add_argument('--controller-port', type=int, default=6633,
                         help='SDN controller port')
+    parser.add_argument('--telemetry', action='store_true',
+                        help='Publish live telemetry and record it to the output directory')
+    parser.add_argument('--no-probes', action='store_true',
+                        help='Do not run the victim latency/goodput probes')
+    parser.add_argument('--profile-controller', action='store_true',
+                        help='Profile the controller (started with --profile) during the attack')
+    parser.add_argument('--store', metavar='ROOT',
+                        help='Save the run in a new directory of the run store at ROOT '
+                             '(instead of --output) and add it to the store index')
+    parser.add_argument('--run-id',
+                        help='Run ID (default: start time and configuration hash)')
+    parser.add_argument('--graph-workers', type=int, default=None,
+                        help='Worker processes rendering the graphs (default: CPU count)')
     
     args = parser.parse_args()
+
+    from src.analysis.run_store import (STATUS_COMPLETE, STATUS_FAILED, RunStore,
+                                        build_manifest, finish_manifest, start_manifest)
+    config = {
+        'topology': args.topology,
+        'attack_duration': args.attack_duration,
+        'controller_ip': args.controller_ip,
+        'controller_port': args.controller_port,
+        'telemetry': args.telemetry,
+        'probes': not args.no_probes,
+        'profile_controller': args.profile_controller,
+    }
+    store = RunStore(args.store) if args.store else None
+    if store:
+        run_id = store.create(config, run_id=args.run_id)
+        output_dir = store.run_dir(run_id)
+    else:
+        output_dir = args.output
+        start_manifest(output_dir, build_manifest(config, run_id=args.run_id))
     
     setLogLevel('info')
-    net = MyNetwork(topology=args.topology, output_dir=args.output)
-    net.clean_env()
-    net.clear_metrics()
-    net.start_net(controller_ip=args.controller_ip, controller_port=args.controller_port)
-    net.start_metrics()
-    time.sleep(5)
-    
-    # Start DoS attack
-    net.start_dos_attack()
-    time.sleep(args.attack_duration)
-    
-    # Stop attack and collect recovery metrics
-    net.stop_dos_attack()
-    time.sleep(15)
-    
-    net.stop_metrics()
-    net.stop_net()
-    net.clean_env()
-    net.create_graphs()
+    net = MyNetwork(topology=args.topology, output_dir=output_dir, telemetry=args.telemetry,
+                    profile_controller=args.profile_controller)
+    status = STATUS_FAILED
+    try:
+        try:
+            net.clean_env()
+            net.clear_metrics()
+            net.start_net(controller_ip=args.controller_ip, controller_port=args.controller_port)
+            net.start_metrics()
+            if not args.no_probes:
+                net.start_probes()
+            time.sleep(5)
+
+            # Start DoS attack
+            net.start_dos_attack()
+            time.sleep(args.attack_duration)
+
+            # Stop attack and collect recovery metrics
+            net.stop_dos_attack()
+            time.sleep(15)
+
+            if not args.no_probes:
+                net.stop_probes()
+            net.stop_metrics()
+        finally:
+            # Stop hping3, the monitors, the probes and Mininet even if the
+            # run failed or was interrupted
+            net.shutdown()
+        net.create_graphs(workers=args.graph_workers)
+        status = STATUS_COMPLETE
+    finally:
+        # Record the outcome even if the run was interrupted
+        if store:
+            store.finish(run_id, status)
+        else:
+            finish_manifest(output_dir, status)
     
-    print(f"\n* Results saved in: {args.output}")
+    print(f"\n* Results saved in: {output_dir}")
 
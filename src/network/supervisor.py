@@ -0,0 +1,180 @@
+"""
+Asyncio process supervisor for experiment tooling.
+
+Monitors and attack tools are started as direct child processes (no shell),
+tracked by name and stopped through their own handles, so shutdown never
+depends on killall or scanning the process table. An asyncio event loop runs
+in a background thread; the synchronous methods used by MyNetwork submit
+coroutines to it. Child stdout can be streamed line by line into a callback
+such as a FileSink.
+"""
+
+import asyncio
+import signal
+import threading
+from asyncio.subprocess import DEVNULL, PIPE
+
+
+class FileSink:
+    """Line callback that appends a child's stdout to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w')
+
+    def __call__(self, line):
+        self._file.write(line)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class TeeSink:
+    """Line callback that forwards each line to several callbacks."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def __call__(self, line):
+        for sink in self.sinks:
+            sink(line)
+
+    def close(self):
+        for sink in self.sinks:
+            if hasattr(sink, 'close'):
+                sink.close()
+
+
+class _Child:
+    """A supervised child process and the task streaming its stdout."""
+
+    def __init__(self, name, process, reader, on_line):
+        self.name = name
+        self.process = process
+        self.reader = reader
+        self.on_line = on_line
+
+
+class ProcessSupervisor:
+    """Start, stream and stop named child processes on an asyncio loop."""
+
+    def __init__(self):
+        self._children = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='ProcessSupervisor', daemon=True)
+        self._thread.start()
+
+    def _call(self, coro):
+        """Run a coroutine on the supervisor loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _pump(self, child):
+        """Forward a child's stdout lines to its callback until EOF."""
+        try:
+            while True:
+                line = await child.process.stdout.readline()
+                if not line:
+                    break
+                child.on_line(line.decode(errors='replace'))
+        finally:
+            if hasattr(child.on_line, 'close'):
+                child.on_line.close()
+
+    async def _start(self, name, argv, on_line=None):
+        try:
+            if name in self._children and self._children[name].process.returncode is None:
+                raise RuntimeError(f"Process '{name}' is already running")
+            process = await asyncio.create_subprocess_exec(
+                *argv, stdin=DEVNULL, stdout=PIPE if on_line else DEVNULL)
+        except BaseException:
+            # The sink (e.g. an open FileSink) is ours once passed in
+            if hasattr(on_line, 'close'):
+                on_line.close()
+            raise
+        child = _Child(name, process, None, on_line)
+        if on_line:
+            child.reader = asyncio.ensure_future(self._pump(child))
+        self._children[name] = child
+        print(f"** Started {name} (pid {process.pid}): {' '.join(argv)}")
+        return process.pid
+
+    async def _stop(self, name, sig=signal.SIGTERM, timeout=5.0):
+        child = self._children.pop(name, None)
+        if child is None:
+            return None
+        process = child.process
+        if process.returncode is None:
+            process.send_signal(sig)
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                print(f"** {name} did not exit after {timeout}s, killing it")
+                process.kill()
+                await process.wait()
+        if child.reader:
+            await child.reader
+        print(f"** Stopped {name} (exit code {process.returncode})")
+        return process.returncode
+
+    def start(self, name, argv, on_line=None):
+        """
+        Start a child process.
+
+        Args:
+            name: Unique name used to stop the process later
+            argv: Program and arguments (executed directly, not via a shell)
+            on_line: Optional callback receiving each stdout line; stdout is
+                discarded if omitted
+
+        Returns:
+            PID of the child
+        """
+        return self._call(self._start(name, argv, on_line))
+
+    def start_many(self, specs):
+        """
+        Start several child processes concurrently.
+
+        Args:
+            specs: Iterable of (name, argv, on_line) tuples
+
+        Returns:
+            List of child PIDs in the order of specs
+        """
+        async def start_all():
+            return await asyncio.gather(*(self._start(*spec) for spec in specs))
+        return self._call(start_all())
+
+    def stop(self, name, sig=signal.SIGTERM, timeout=5.0):
+        """
+        Stop a child process and wait for its output to be drained.
+
+        The child receives sig and is killed if it has not exited after
+        timeout seconds.
+
+        Returns:
+            Exit code of the child, or None if no such child was started
+        """
+        return self._call(self._stop(name, sig, timeout))
+
+    def stop_many(self, names, sig=signal.SIGTERM, timeout=5.0):
+        """Stop several child processes concurrently; returns their exit codes."""
+        async def stop_all():
+            return await asyncio.gather(*(self._stop(name, sig, timeout) for name in names))
+        return self._call(stop_all())
+
+    def running(self):
+        """Return the names of children that have not exited."""
+        return [name for name, child in self._children.items()
+                if child.process.returncode is None]
+
+    def close(self, timeout=5.0):
+        """Stop all remaining children and shut down the event loop (idempotent)."""
+        if self._loop.is_closed():
+            return
+        self.stop_many(list(self._children), timeout=timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -4,9 +4,11 @@ Network topology definitions for SDN DoS attack simulation.
 
 from mininet.topo import Topo
 
+PROBE_HOST = 'p1'  # benign host measuring the victim's latency and goodput
+
 
 class SimpleTopo(Topo):
-    """Simple topology with 2 hosts and 1 switch."""
+    """Simple topology with 2 hosts, a probe host and 1 switch."""
     
     def build(self):
         s1 = self.addSwitch('s1')
@@ -14,10 +16,12 @@ class SimpleTopo(Topo):
         h2 = self.addHost('h2')
         self.addLink(h1, s1)
         self.addLink(h2, s1)
+        # Linked last so the attacker and victim keep ports s1-eth1/s1-eth2
+        self.addLink(self.addHost(PROBE_HOST), s1)
 
 
 class LessSimpleTopo(Topo):
-    """Extended topology with 3 hosts and 1 switch."""
+    """Extended topology with 3 hosts, a probe host and 1 switch."""
     
     def build(self):
         s1 = self.addSwitch('s1')
@@ -27,4 +31,5 @@ class LessSimpleTopo(Topo):
         self.addLink(h1, s1)
         self.addLink(h2, s1)
         self.addLink(h3, s1)
+        self.addLink(self.addHost(PROBE_HOST), s1)
 
@@ -1,6 +1,19 @@
 """Data visualization module."""
 
-from .create_graphs import create_all_graphs
+import importlib
 
-__all__ = ['create_all_graphs']
+# Exported name -> defining submodule, imported lazily by __getattr__
+_EXPORTS = {
+    'create_all_graphs': '.create_graphs',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import exported names on first access so importing the package stays cheap."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
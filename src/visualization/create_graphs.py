@@ -4,18 +4,83 @@ Visualization module for generating graphs from collected metrics.
 Generates plots for:
 - Network interface bandwidth
 - Controller CPU and memory utilization
+- Per-source packet rate distribution exported by the controller
+- Victim latency percentiles and goodput measured by the probes
+- Drop rule budget utilization of each switch
+
+Figures are rendered with matplotlib's object-oriented API on the Agg canvas,
+so no GUI backend or pyplot global state is involved and plots can be drawn
+in worker processes. Each run directory keeps a small cache of its source
+files' size, mtime and hash; figures whose sources are unchanged are skipped.
+Series longer than the plot is wide are decimated with min/max bucketing
+before drawing.
 """
 
+import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+
+if not __package__:
+    # Run as a script (python src/visualization/create_graphs.py): resolve the
+    # relative imports below against the project root
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    __package__ = 'src.visualization'
+
+from .downsample import downsample_series, pixel_width
+from .loaders import (BANDWIDTH_FILE, CONTROLLER_FILE, FLOW_TABLE_FILE, PROBE_GOODPUT_FILE,
+                      PROBE_LATENCY_FILE, RATE_LOG_FILE, TIMESTAMPS_FILE, load_bandwidth,
+                      load_controller_usage, load_flow_table, load_probe_goodput,
+                      load_probe_latency, load_rate_histograms, load_timestamps,
+                      same_sources, source_state)
+
+CACHE_FILE = '.graph_cache.json'
+GRAPH_VERSION = 2  # bump when rendering changes so cached plots are redrawn
+INTERFACES = ['s1-eth1', 's1-eth2']
+LATENCY_BUCKET = '1s'                 # latency percentiles are computed per bucket
+LATENCY_PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def _plot_series(series, timestamps, xlabel, ylabel, title, output_file):
+    """
+    Render a single time series with DoS start/end markers to a PNG.
+
+    Args:
+        series: pandas Series indexed by time
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+        xlabel, ylabel, title: Axis labels and figure title
+        output_file: Path of the PNG to write
+    """
+    _, dos_start, dos_end, _ = timestamps
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    series = downsample_series(series, pixel_width(fig, ax), [dos_start, dos_end])
+    ax.plot(series.index, series.values)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(True)
+    ax.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
+    ax.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
+    ax.legend()
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(output_file)
+    print(f"  Created: {output_file}")
 
 
 def create_bandwidth_plot(bw_df, interface, timestamps, output_dir):
     """
     Create bandwidth plot for a specific network interface.
-    
+
     Args:
         bw_df: Bandwidth DataFrame
         interface: Interface name (e.g., 's1-eth1')
@@ -23,167 +88,388 @@ def create_bandwidth_plot(bw_df, interface, timestamps, output_dir):
         output_dir: Output directory for the plot
     """
     start, dos_start, dos_end, end = timestamps
-    
+
     # Filter data for the interface
-    eth_data = bw_df.loc[bw_df[1] == interface][[0, 4]]
-    eth_data = eth_data.rename(columns={0: 'epochtime', 4: 'bandwidth'})
-    eth_data['time'] = pd.to_datetime(bw_df.loc[bw_df[1] == interface][0], unit='s')
-    eth_data = eth_data.drop(['epochtime'], axis=1).set_index('time')
-    
+    eth_data = bw_df.loc[bw_df[1] == interface]
+    bandwidth = pd.Series(eth_data[4].values,
+                          index=pd.to_datetime(eth_data[0], unit='s'))
+
     # Filter by time range and smooth
-    eth_data.index = pd.to_datetime(eth_data.index)
-    eth_data = eth_data[eth_data.index >= start]
-    eth_data = eth_data[eth_data.index <= end]
-    eth_data['bandwidth'] = eth_data['bandwidth'].rolling(window=3, min_periods=1).mean()
-    
-    # Create plot
-    eth_data.plot(y='bandwidth', legend=False)
-    plt.xlabel('Time')
-    plt.ylabel('Bandwidth (bytes/sec)')
-    plt.title(f'{interface} Bandwidth Over Time')
-    plt.grid(True)
-    plt.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
-    plt.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
-    plt.legend()
-    plt.tight_layout()
-    
+    bandwidth = bandwidth[(bandwidth.index >= start) & (bandwidth.index <= end)]
+    bandwidth = bandwidth.rolling(window=3, min_periods=1).mean()
+
     output_file = os.path.join(output_dir, f'{interface}_bw_plot.png')
-    plt.savefig(output_file)
-    plt.close()
-    print(f"  Created: {output_file}")
+    _plot_series(bandwidth, timestamps, 'Time', 'Bandwidth (bytes/sec)',
+                 f'{interface} Bandwidth Over Time', output_file)
 
 
 def create_controller_plots(controller_file, timestamps, output_dir):
     """
     Create CPU and memory utilization plots for the controller.
-    
+
     Args:
         controller_file: Path to controller usage log file
         timestamps: List of timestamps [start, dos_start, dos_end, end]
         output_dir: Output directory for the plots
     """
     start, dos_start, dos_end, end = timestamps
-    
-    # Parse controller usage data
-    data = []
-    with open(controller_file, "r") as f:
-        for line in f:
-            parts = line.strip().split(", ")
-            timestamp_str = parts[0]
-            cpu_str = parts[1].replace("CPU: ", "").replace("%", "")
-            mem_str = parts[2].replace("MEM: ", "").replace("%", "")        
-            data.append({
-                "time": pd.to_datetime(timestamp_str),
-                "cpu": float(cpu_str),
-                "mem": float(mem_str)
-            })
-    
-    con_df = pd.DataFrame(data)
-    con_df.set_index("time", inplace=True)
-    
+
+    con_df = load_controller_usage(controller_file)
+    con_df = con_df[(con_df.index >= start) & (con_df.index <= end)]
+
     # Create CPU plot
-    con_cpu_df = con_df[['cpu']]
-    con_cpu_df.index = pd.to_datetime(con_cpu_df.index)
-    con_cpu_df = con_cpu_df[con_cpu_df.index >= start]
-    con_cpu_df = con_cpu_df[con_cpu_df.index <= end]
-    con_cpu_df['cpu'] = con_cpu_df['cpu'].rolling(window=3, min_periods=1).mean()
-    con_cpu_df.plot(y='cpu', legend=False)
-    plt.xlabel('Time')
-    plt.ylabel('CPU (percentage)')
-    plt.title('Controller CPU Utilization Over Time')
-    plt.grid(True)
-    plt.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
-    plt.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
-    plt.legend()
-    plt.tight_layout()
-    
+    cpu = con_df['cpu'].rolling(window=3, min_periods=1).mean()
     cpu_output = os.path.join(output_dir, 'cont_cpu_plot.png')
-    plt.savefig(cpu_output)
-    plt.close()
-    print(f"  Created: {cpu_output}")
-    
+    _plot_series(cpu, timestamps, 'Time', 'CPU (percentage)',
+                 'Controller CPU Utilization Over Time', cpu_output)
+
     # Create Memory plot
-    con_mem_df = con_df[['mem']]
-    con_mem_df.index = pd.to_datetime(con_mem_df.index)
-    con_mem_df = con_mem_df[con_mem_df.index >= start]
-    con_mem_df = con_mem_df[con_mem_df.index <= end]
-    con_mem_df['mem'] = con_mem_df['mem'].rolling(window=3, min_periods=1).mean()
-    con_mem_df.plot(y='mem', legend=False)
-    plt.xlabel('Time')
-    plt.ylabel('Memory (percentage)')
-    plt.title('Controller Memory Utilization Over Time')
-    plt.grid(True)
-    plt.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
-    plt.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
-    plt.legend()
-    plt.tight_layout()
-    
+    mem = con_df['mem'].rolling(window=3, min_periods=1).mean()
     mem_output = os.path.join(output_dir, 'cont_mem_plot.png')
-    plt.savefig(mem_output)
-    plt.close()
-    print(f"  Created: {mem_output}")
+    _plot_series(mem, timestamps, 'Time', 'Memory (percentage)',
+                 'Controller Memory Utilization Over Time', mem_output)
+
+
+def create_rate_heatmap(rate_log, timestamps, output_dir):
+    """
+    Create a heatmap of how many sources sent at each packet rate over time.
+
+    Args:
+        rate_log: Path to the controller's rate histogram log
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+        output_dir: Output directory for the plot
+    """
+    start, dos_start, dos_end, end = timestamps
+
+    times, histograms = load_rate_histograms(rate_log)
+    in_range = (times >= start) & (times <= end)
+    times, histograms = times[in_range], histograms[in_range]
+    if not len(times) or not histograms.any():
+        print(f"Warning: no source rate data in {rate_log} for this run")
+        return
+    buckets = int(np.flatnonzero(histograms.any(axis=0)).max()) + 1
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    mesh = ax.pcolormesh(times, np.arange(buckets), histograms[:, :buckets].T,
+                         shading='nearest', cmap='viridis',
+                         norm=LogNorm(vmin=1, vmax=max(1, histograms.max())))
+    mesh.cmap.set_under('white')
+    fig.colorbar(mesh, ax=ax, label='Sources')
+    ax.set_yticks(np.arange(buckets))
+    ax.set_yticklabels([f'{2 ** i:,}' for i in range(buckets)])
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Packets per source per interval (≥)')
+    ax.set_title('Source Packet Rate Distribution Over Time')
+    ax.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
+    ax.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
+    ax.legend()
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    output_file = os.path.join(output_dir, 'source_rate_heatmap.png')
+    fig.savefig(output_file)
+    print(f"  Created: {output_file}")
 
 
-def create_all_graphs(output_dir='results'):
+def create_probe_latency_plot(latency_file, timestamps, output_dir):
+    """
+    Create a plot of probe round-trip time percentiles and loss over time.
+
+    Args:
+        latency_file: Path to probe_latency.txt
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+        output_dir: Output directory for the plot
+    """
+    start, dos_start, dos_end, end = timestamps
+
+    latency = load_probe_latency(latency_file)
+    latency = latency[(latency.index >= start) & (latency.index <= end)]
+    if latency.empty:
+        print(f"Warning: no latency samples in {latency_file} for this run")
+        return
+    buckets = latency['rtt_ms'].resample(LATENCY_BUCKET)
+    percentiles = buckets.quantile(LATENCY_PERCENTILES).unstack()
+    loss = latency['rtt_ms'].isna().resample(LATENCY_BUCKET).mean() * 100
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for q in LATENCY_PERCENTILES:
+        ax.plot(percentiles.index, percentiles[q].values, label=f'p{q * 100:g}')
+    loss_ax = ax.twinx()
+    loss_ax.fill_between(loss.index, loss.values, step='post', color='grey', alpha=0.3,
+                         label='Loss')
+    loss_ax.set_ylabel('Lost requests (%)')
+    loss_ax.set_ylim(0, 100)
+    ax.set_yscale('log')
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Round-trip time (ms)')
+    ax.set_title('Victim Latency Over Time')
+    ax.grid(True)
+    ax.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
+    ax.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
+    ax.legend(loc='upper left')
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    output_file = os.path.join(output_dir, 'probe_latency_plot.png')
+    fig.savefig(output_file)
+    print(f"  Created: {output_file}")
+
+
+def create_probe_goodput_plot(goodput_file, timestamps, output_dir):
+    """
+    Create a plot of the goodput the probe achieved towards the victim.
+
+    Args:
+        goodput_file: Path to probe_goodput.txt
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+        output_dir: Output directory for the plot
+    """
+    start, _, _, end = timestamps
+
+    goodput = load_probe_goodput(goodput_file)
+    goodput = goodput[(goodput.index >= start) & (goodput.index <= end)]
+    output_file = os.path.join(output_dir, 'probe_goodput_plot.png')
+    _plot_series(goodput, timestamps, 'Time', 'Goodput (bytes/sec)',
+                 'Victim Goodput Over Time', output_file)
+
+
+def create_flow_table_plot(flow_table_file, timestamps, output_dir):
+    """
+    Create a plot of each switch's drop rule budget utilization and evictions.
+
+    Args:
+        flow_table_file: Path to flow_table.txt written by the controller
+        timestamps: List of timestamps [start, dos_start, dos_end, end]
+        output_dir: Output directory for the plot
+    """
+    start, dos_start, dos_end, end = timestamps
+
+    flows = load_flow_table(flow_table_file)
+    flows = flows[(flows.index >= start) & (flows.index <= end)]
+    if flows.empty:
+        print(f"Warning: no flow table samples in {flow_table_file} for this run")
+        return
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    evictions_ax = ax.twinx()
+    for dpid, switch in flows.groupby('dpid'):
+        ax.plot(switch.index, switch['entries'] / switch['capacity'] * 100,
+                label=f'{dpid} utilization')
+        evictions_ax.step(switch.index, switch['evictions'].diff().fillna(0), where='post',
+                          linestyle=':', label=f'{dpid} evictions')
+    evictions_ax.set_ylabel('Evicted rules per sample')
+    evictions_ax.set_ylim(bottom=0)
+    ax.set_ylim(0, 105)
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Drop rule budget used (%)')
+    ax.set_title('Flow Table Utilization Over Time')
+    ax.grid(True)
+    ax.axvline(x=dos_start, color='red', linestyle='--', label='DoS Start')
+    ax.axvline(x=dos_end, color='orange', linestyle='--', label='DoS End')
+    lines, labels = ax.get_legend_handles_labels()
+    more_lines, more_labels = evictions_ax.get_legend_handles_labels()
+    ax.legend(lines + more_lines, labels + more_labels, loc='upper left')
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    output_file = os.path.join(output_dir, 'flow_table_plot.png')
+    fig.savefig(output_file)
+    print(f"  Created: {output_file}")
+
+
+def _render_bandwidth(output_dir, timestamps):
+    """Render bandwidth plots for every known interface of a run."""
+    bw_df = load_bandwidth(os.path.join(output_dir, BANDWIDTH_FILE))
+    for interface in INTERFACES:
+        if interface in bw_df[1].values:
+            create_bandwidth_plot(bw_df, interface, timestamps, output_dir)
+
+
+def _render_controller(output_dir, timestamps):
+    """Render controller CPU and memory plots of a run."""
+    create_controller_plots(os.path.join(output_dir, CONTROLLER_FILE),
+                            timestamps, output_dir)
+
+
+def _render_source_rates(output_dir, timestamps):
+    """Render the source rate heatmap of a run."""
+    create_rate_heatmap(os.path.join(output_dir, RATE_LOG_FILE), timestamps, output_dir)
+
+
+def _render_probes(output_dir, timestamps):
+    """Render probe latency and goodput plots of a run."""
+    create_probe_latency_plot(os.path.join(output_dir, PROBE_LATENCY_FILE),
+                              timestamps, output_dir)
+    create_probe_goodput_plot(os.path.join(output_dir, PROBE_GOODPUT_FILE),
+                              timestamps, output_dir)
+
+
+def _render_flow_table(output_dir, timestamps):
+    """Render the flow table utilization plot of a run."""
+    create_flow_table_plot(os.path.join(output_dir, FLOW_TABLE_FILE), timestamps, output_dir)
+
+
+# Figure groups: name -> (renderer, source files, output files)
+FIGURES = {
+    'bandwidth': (_render_bandwidth, [TIMESTAMPS_FILE, BANDWIDTH_FILE],
+                  [f'{interface}_bw_plot.png' for interface in INTERFACES]),
+    'controller': (_render_controller, [TIMESTAMPS_FILE, CONTROLLER_FILE],
+                   ['cont_cpu_plot.png', 'cont_mem_plot.png']),
+    'source_rates': (_render_source_rates, [TIMESTAMPS_FILE, RATE_LOG_FILE],
+                     ['source_rate_heatmap.png']),
+    'probes': (_render_probes, [TIMESTAMPS_FILE, PROBE_LATENCY_FILE, PROBE_GOODPUT_FILE],
+               ['probe_latency_plot.png', 'probe_goodput_plot.png']),
+    'flow_table': (_render_flow_table, [TIMESTAMPS_FILE, FLOW_TABLE_FILE],
+                   ['flow_table_plot.png']),
+}
+
+
+def _load_cache(output_dir):
+    """Read a run's graph cache, returning an empty cache if unreadable."""
+    try:
+        with open(os.path.join(output_dir, CACHE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(output_dir, cache):
+    """Atomically write a run's graph cache."""
+    cache_path = os.path.join(output_dir, CACHE_FILE)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+
+def _plan_run(output_dir, force=False):
+    """
+    Work out which figure groups of a run need rendering.
+
+    Returns:
+        Tuple (jobs, cache, cached) where jobs is a list of (output_dir,
+        figure, source_state) tuples and cached counts up-to-date figures
+    """
+    if load_timestamps(output_dir) is None:
+        print(f"Error: {os.path.join(output_dir, TIMESTAMPS_FILE)} not found or incomplete")
+        return [], {}, 0
+
+    cache = _load_cache(output_dir)
+    jobs = []
+    cached = 0
+    for figure, (_, sources, outputs) in FIGURES.items():
+        missing = [s for s in sources if not os.path.exists(os.path.join(output_dir, s))]
+        if missing:
+            print(f"Warning: {os.path.join(output_dir, missing[0])} not found, "
+                  f"skipping {figure} plots")
+            continue
+
+        entry = cache.get(figure, {})
+        state = source_state(output_dir, sources, entry.get('sources'))
+        outputs_present = all(os.path.exists(os.path.join(output_dir, o))
+                              for o in entry.get('outputs', outputs))
+        if (not force and entry.get('version') == GRAPH_VERSION
+                and same_sources(state, entry.get('sources')) and outputs_present):
+            cache[figure]['sources'] = state
+            cached += 1
+            continue
+        jobs.append((output_dir, figure, state))
+    return jobs, cache, cached
+
+
+def _render_job(job):
+    """Render one figure group of one run (runs in a worker process)."""
+    output_dir, figure, state = job
+    renderer, _, outputs = FIGURES[figure]
+    for name in outputs:
+        path = os.path.join(output_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    renderer(output_dir, load_timestamps(output_dir))
+    return job, [o for o in outputs if os.path.exists(os.path.join(output_dir, o))]
+
+
+def create_graphs_for_runs(run_dirs, force=False, workers=None):
+    """
+    Generate graphs for many run directories, skipping unchanged figures.
+
+    Stale figure groups of all runs are rendered in a process pool.
+
+    Args:
+        run_dirs: Iterable of run directories
+        force: Re-render every figure regardless of the cache
+        workers: Number of worker processes (default: CPU count); 1 renders
+            in the calling process
+    """
+    caches = {}
+    jobs = []
+    skipped = 0
+    for output_dir in run_dirs:
+        run_jobs, caches[output_dir], cached = _plan_run(output_dir, force)
+        jobs.extend(run_jobs)
+        skipped += cached
+
+    print(f"* Rendering {len(jobs)} figure groups across {len(caches)} runs "
+          f"({skipped} up to date)")
+
+    results = []
+    if workers == 1 or len(jobs) <= 1:
+        # Same per-job error handling as the pool below: one failing figure
+        # group must not stop the others or the cache update
+        for job in jobs:
+            output_dir, figure, _ = job
+            try:
+                results.append(_render_job(job))
+            except Exception as e:
+                print(f"Error: rendering {figure} plots for {output_dir} failed: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_render_job, job) for job in jobs]
+            for (output_dir, figure, _), future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error: rendering {figure} plots for {output_dir} failed: {e}")
+
+    for (output_dir, figure, state), outputs in results:
+        caches[output_dir][figure] = {'version': GRAPH_VERSION, 'sources': state,
+                                      'outputs': outputs}
+    for output_dir, cache in caches.items():
+        if cache:
+            _save_cache(output_dir, cache)
+
+
+def create_all_graphs(output_dir='results', force=False, workers=None):
     """
     Generate all visualization graphs from collected metrics.
-    
+
     Args:
         output_dir: Directory containing metrics files and where plots will be saved
+        force: Re-render plots even if their source files are unchanged
+        workers: Worker processes rendering the figure groups (default: CPU
+            count); 1 renders in the calling process
     """
     print(f"* Generating graphs from data in: {output_dir}")
-    
-    # Clean up old plots
-    plot_files = ['cont_cpu_plot.png', 'cont_mem_plot.png', 
-                  's1-eth1_bw_plot.png', 's1-eth2_bw_plot.png']
-    for plot_file in plot_files:
-        plot_path = os.path.join(output_dir, plot_file)
-        if os.path.exists(plot_path):
-            os.remove(plot_path)
-    
-    # Read timestamps
-    timestamps_file = os.path.join(output_dir, 'timestamps.txt')
-    if not os.path.exists(timestamps_file):
-        print(f"Error: {timestamps_file} not found")
-        return
-    
-    with open(timestamps_file, 'r') as file:
-        timestamps = [float(line.strip()) for line in file]
-    timestamps = pd.to_datetime(timestamps, unit='s')
-    
-    start = timestamps[0]
-    dos_start = timestamps[1]
-    dos_end = timestamps[2]
-    end = timestamps[3] if len(timestamps) > 3 else timestamps[2]
-    
-    # Read bandwidth data
-    bandwidth_file = os.path.join(output_dir, 'bandwidth.txt')
-    if not os.path.exists(bandwidth_file):
-        print(f"Warning: {bandwidth_file} not found, skipping bandwidth plots")
-    else:
-        bw_df = pd.read_csv(bandwidth_file, header=None)
-        
-        # Create bandwidth plots for each interface
-        for interface in ['s1-eth1', 's1-eth2']:
-            if interface in bw_df[1].values:
-                create_bandwidth_plot(bw_df, interface, 
-                                    [start, dos_start, dos_end, end], 
-                                    output_dir)
-    
-    # Create controller plots
-    controller_file = os.path.join(output_dir, 'controller_usage.txt')
-    if not os.path.exists(controller_file):
-        print(f"Warning: {controller_file} not found, skipping controller plots")
-    else:
-        create_controller_plots(controller_file, 
-                              [start, dos_start, dos_end, end], 
-                              output_dir)
-    
+    create_graphs_for_runs([output_dir], force=force, workers=workers)
     print("* Graph generation complete")
 
 
 if __name__ == '__main__':
-    import sys
-    output_dir = sys.argv[1] if len(sys.argv) > 1 else 'results'
-    create_all_graphs(output_dir)
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate graphs for experiment runs')
+    parser.add_argument('run_dirs', nargs='*', default=['results'],
+                        help='Run directories containing metrics files')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render all plots, ignoring the cache')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
 
+    create_graphs_for_runs(args.run_dirs, force=args.force, workers=args.workers)
@@ -0,0 +1,78 @@
+"""
+Time-series decimation for plotting long runs.
+
+Soak tests produce far more samples than a figure has horizontal pixels.
+Min/max bucketing keeps, for every pixel-wide time bucket, the samples with
+the lowest and highest value, so the drawn envelope (including short spikes)
+is the same as plotting every sample while the point count is bounded by
+twice the pixel width.
+"""
+
+import numpy as np
+
+
+def pixel_width(fig, ax):
+    """Return the width of an axes in output pixels."""
+    return int(fig.get_figwidth() * fig.dpi * ax.get_position().width)
+
+
+def minmax_indices(x, y, n_buckets, boundaries=()):
+    """
+    Select sample indices that preserve each time bucket's minimum and maximum.
+
+    Buckets span equal time intervals and are additionally split at the given
+    boundaries (e.g. DoS start/end), so a spike next to a marker never shares
+    a bucket with samples on the other side of it. The first and last samples
+    and the samples on either side of each boundary are always kept.
+
+    Args:
+        x: Sorted sample times as a 1-D numeric array
+        y: Sample values
+        n_buckets: Number of time buckets, usually the plot width in pixels
+        boundaries: Times at which buckets must be split
+
+    Returns:
+        Sorted array of indices into x/y
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_buckets < 1 or n <= 2 * n_buckets + 2 or x[-1] <= x[0]:
+        return np.arange(n)
+
+    inner = np.asarray([b for b in boundaries if x[0] < b < x[-1]], dtype=x.dtype)
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)[:-1].astype(x.dtype)
+    starts = np.searchsorted(x, np.concatenate([edges, inner]), side='left')
+    starts = np.unique(starts[starts < n])
+
+    bucket = np.searchsorted(starts, np.arange(n), side='right') - 1
+    keep = np.zeros(n, dtype=bool)
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        hits = np.flatnonzero(y == extreme[bucket])
+        _, first = np.unique(bucket[hits], return_index=True)
+        keep[hits[first]] = True
+
+    keep[0] = keep[-1] = True
+    split = np.searchsorted(x, inner, side='left')
+    keep[split] = True
+    keep[np.maximum(split - 1, 0)] = True
+    return np.flatnonzero(keep)
+
+
+def downsample_series(series, n_buckets, boundaries=()):
+    """
+    Decimate a time-indexed pandas Series with min/max bucketing.
+
+    Args:
+        series: Series indexed by a DatetimeIndex
+        n_buckets: Number of time buckets (plot width in pixels)
+        boundaries: Timestamps at which buckets must be split
+
+    Returns:
+        Series containing the selected samples
+    """
+    if len(series) <= 2 * n_buckets + 2:
+        return series
+    x = series.index.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    bounds = [np.datetime64(b, 'ns').astype(np.int64) for b in boundaries]
+    return series.iloc[minmax_indices(x, series.to_numpy(), n_buckets, bounds)]
@@ -0,0 +1,130 @@
+"""
+Live viewer for the shared-memory telemetry bus.
+
+Subscribes to the controller, resources and bandwidth channels while an
+experiment runs and shows the latest values, either as a refreshing terminal
+summary or as scrolling matplotlib plots.
+
+Usage:
+    python3 -m src.visualization.live_view [--plot] [--window SAMPLES]
+"""
+
+import time
+from collections import deque
+
+from ..monitoring.telemetry import (KIND_BANDWIDTH, KIND_CONTROL_BYTES, KIND_PACKETS,
+                                    KIND_RESOURCES, TelemetrySubscriber)
+
+
+class LiveState:
+    """Latest values and a bounded history of every telemetry series."""
+
+    def __init__(self, history=600):
+        """
+        Initialize state.
+
+        Args:
+            history: Samples kept per series
+        """
+        self.history = history
+        self.subscribers = [TelemetrySubscriber(channel, from_start=True)
+                            for channel in ('controller', 'resources', 'bandwidth')]
+        self.series = {}
+        self.interfaces = set()
+
+    def _append(self, name, timestamp, value):
+        if name not in self.series:
+            self.series[name] = deque(maxlen=self.history)
+        self.series[name].append((timestamp, value))
+
+    def update(self):
+        """Consume new records from all channels."""
+        for subscriber in self.subscribers:
+            for rec in subscriber.poll():
+                if rec.kind == KIND_PACKETS:
+                    self._append('controller pkt/s', rec.timestamp, rec.a)
+                    self._append('controller sources', rec.timestamp, rec.b)
+                elif rec.kind == KIND_CONTROL_BYTES:
+                    self._append('PacketIn B/s', rec.timestamp, rec.a)
+                    self._append('PacketOut B/s', rec.timestamp, rec.b)
+                elif rec.kind == KIND_RESOURCES:
+                    self._append('CPU %', rec.timestamp, rec.a)
+                    self._append('MEM %', rec.timestamp, rec.b)
+                elif rec.kind == KIND_BANDWIDTH:
+                    interface = subscriber.key_name(rec.key)
+                    if interface != 'total':
+                        self.interfaces.add(f'{interface} B/s')
+                        self._append(f'{interface} B/s', rec.timestamp, rec.a + rec.b)
+
+    def latest(self):
+        """Return {series name: latest value}."""
+        return {name: values[-1][1] for name, values in self.series.items() if values}
+
+    def close(self):
+        for subscriber in self.subscribers:
+            subscriber.close()
+
+
+def run_terminal(state, interval=1.0):
+    """Print the latest value of every series until interrupted."""
+    while True:
+        state.update()
+        latest = state.latest()
+        line = '  '.join(f'{name}: {value:,.1f}' for name, value in sorted(latest.items()))
+        print(f"{time.strftime('%H:%M:%S')}  {line or 'waiting for publishers...'}", flush=True)
+        time.sleep(interval)
+
+
+def run_plot(state, interval=1.0):
+    """Show scrolling plots of controller, resource and bandwidth series."""
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    groups = [
+        ('Controller', ['controller pkt/s', 'controller sources']),
+        ('Resources (%)', ['CPU %', 'MEM %']),
+        ('Bandwidth (B/s)', None),  # every interface series
+    ]
+    fig, axes = plt.subplots(len(groups), 1, sharex=True, figsize=(8, 8))
+
+    def redraw(_):
+        state.update()
+        for ax, (title, names) in zip(axes, groups):
+            ax.clear()
+            ax.set_title(title)
+            ax.grid(True)
+            selected = names or sorted(state.interfaces)
+            for name in selected:
+                values = state.series.get(name)
+                if values:
+                    start = values[0][0]
+                    ax.plot([t - start for t, _ in values], [v for _, v in values], label=name)
+            if ax.lines:
+                ax.legend(loc='upper left')
+        axes[-1].set_xlabel('Time (s)')
+
+    animation = FuncAnimation(fig, redraw, interval=interval * 1000, cache_frame_data=False)
+    plt.show()
+    return animation
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Live telemetry viewer')
+    parser.add_argument('--plot', action='store_true', help='Show plots instead of text')
+    parser.add_argument('--window', type=int, default=600,
+                        help='Samples of history kept per series')
+    parser.add_argument('--interval', type=float, default=1.0, help='Refresh interval (s)')
+    args = parser.parse_args()
+
+    state = LiveState(history=args.window)
+    try:
+        if args.plot:
+            run_plot(state, args.interval)
+        else:
+            run_terminal(state, args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state.close()
@@ -0,0 +1,222 @@
+"""
+Loaders for the raw metrics files written during an experiment run.
+
+Parsing is kept separate from plotting so that other tools can read the
+same files without importing matplotlib.
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+from ..controllers.rate_export import read_rate_log
+
+TIMESTAMPS_FILE = 'timestamps.txt'
+BANDWIDTH_FILE = 'bandwidth.txt'
+CONTROLLER_FILE = 'controller_usage.txt'
+RATE_LOG_FILE = 'rate_hist.bin'
+PROBE_LATENCY_FILE = 'probe_latency.txt'
+PROBE_GOODPUT_FILE = 'probe_goodput.txt'
+FLOW_TABLE_FILE = 'flow_table.txt'
+
+
+def load_timestamps(output_dir):
+    """
+    Read the experiment timestamps of a run.
+
+    Args:
+        output_dir: Run directory containing timestamps.txt
+
+    Returns:
+        List of pandas Timestamps [start, dos_start, dos_end, end], or None if
+        the file is missing or incomplete
+    """
+    timestamps_file = os.path.join(output_dir, TIMESTAMPS_FILE)
+    if not os.path.exists(timestamps_file):
+        return None
+
+    with open(timestamps_file, 'r') as file:
+        timestamps = [float(line.strip()) for line in file if line.strip()]
+    if len(timestamps) < 3:
+        return None
+    timestamps = pd.to_datetime(timestamps, unit='s')
+
+    start = timestamps[0]
+    dos_start = timestamps[1]
+    dos_end = timestamps[2]
+    end = timestamps[3] if len(timestamps) > 3 else timestamps[2]
+    return [start, dos_start, dos_end, end]
+
+
+def load_bandwidth(bandwidth_file):
+    """
+    Read bwm-ng CSV output.
+
+    Args:
+        bandwidth_file: Path to bandwidth.txt
+
+    Returns:
+        DataFrame with the first five of bwm-ng's positional columns
+        (0: epoch seconds, 1: interface, 2: bytes out/s, 3: bytes in/s,
+        4: bytes total/s)
+    """
+    return pd.read_csv(bandwidth_file, header=None, usecols=range(5))
+
+
+def load_controller_usage(controller_file):
+    """
+    Read controller CPU/memory samples written by cpu_track.py.
+
+    Args:
+        controller_file: Path to controller_usage.txt
+
+    Returns:
+        DataFrame indexed by sample time with 'cpu' and 'mem' columns
+    """
+    times, cpu, mem = [], [], []
+    with open(controller_file, "r") as f:
+        for line in f:
+            parts = line.strip().split(", ")
+            if len(parts) < 3:
+                continue
+            times.append(parts[0])
+            cpu.append(float(parts[1].replace("CPU: ", "").replace("%", "")))
+            mem.append(float(parts[2].replace("MEM: ", "").replace("%", "")))
+
+    con_df = pd.DataFrame({"cpu": cpu, "mem": mem},
+                          index=pd.to_datetime(times))
+    con_df.index.name = "time"
+    return con_df
+
+
+def load_rate_histograms(rate_log):
+    """
+    Read the source rate histograms exported by the controllers.
+
+    Args:
+        rate_log: Path to rate_hist.bin (rotated files are included)
+
+    Returns:
+        Tuple (times, histograms) where times is a DatetimeIndex of interval
+        end times and histograms is an array of shape (intervals, buckets);
+        bucket i counts sources that sent [2**i, 2**(i+1)) packets
+    """
+    records = read_rate_log(rate_log)
+    times = pd.to_datetime([r['time'] for r in records], unit='s')
+    histograms = np.array([r['histogram'] for r in records], dtype=np.int64)
+    return times, histograms
+
+
+def load_probe_latency(latency_file):
+    """
+    Read latency probe samples written by probes.py.
+
+    Args:
+        latency_file: Path to probe_latency.txt
+
+    Returns:
+        DataFrame indexed by request send time with 'seq' and 'rtt_ms'
+        columns; rtt_ms is NaN for lost requests
+    """
+    df = pd.read_csv(latency_file, header=None, names=['time', 'seq', 'rtt_ms'])
+    df.index = pd.to_datetime(df.pop('time'), unit='s')
+    return df.sort_index()
+
+
+def load_probe_goodput(goodput_file):
+    """
+    Read goodput probe samples written by probes.py.
+
+    Args:
+        goodput_file: Path to probe_goodput.txt
+
+    Returns:
+        Series of bytes/s received by the victim, indexed by sample time
+    """
+    df = pd.read_csv(goodput_file, header=None, names=['time', 'goodput'])
+    return pd.Series(df['goodput'].values, index=pd.to_datetime(df['time'], unit='s'),
+                     name='goodput')
+
+
+def load_flow_table(flow_table_file):
+    """
+    Read the drop rule counts logged by the rate limiting controller.
+
+    Args:
+        flow_table_file: Path to flow_table.txt
+
+    Returns:
+        DataFrame indexed by sample time with 'dpid', 'entries', 'capacity'
+        and 'evictions' (cumulative) columns
+    """
+    df = pd.read_csv(flow_table_file, header=None,
+                     names=['time', 'dpid', 'entries', 'capacity', 'evictions'])
+    df.index = pd.to_datetime(df.pop('time'), unit='s')
+    return df.sort_index()
+
+
+def load_controller_name(controller_file):
+    """
+    Identify the POX controller module a run was recorded against.
+
+    Args:
+        controller_file: Path to controller_usage.txt
+
+    Returns:
+        Module name such as 'rate_limit', or None if it cannot be determined
+    """
+    with open(controller_file, "r") as f:
+        for line in f:
+            cmd = line.partition("CMD: ")[2]
+            for arg in cmd.split():
+                if arg.startswith("misc."):
+                    return arg[len("misc."):]
+            if cmd:
+                return None
+    return None
+
+
+def file_hash(path):
+    """Return the SHA-1 hex digest of a file."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_state(output_dir, sources, cached=None):
+    """
+    Describe the current state of a run's source files for caching.
+
+    The (size, mtime) pair is compared with the cached entry first; a file is
+    only hashed again when they differ, so touching a file without changing
+    its contents does not invalidate derived results.
+
+    Args:
+        output_dir: Run directory
+        sources: File names inside output_dir
+        cached: Previous state returned by this function, if any
+
+    Returns:
+        Dict of file name -> {'size', 'mtime', 'sha1'}
+    """
+    cached = cached or {}
+    state = {}
+    for name in sources:
+        path = os.path.join(output_dir, name)
+        st = os.stat(path)
+        previous = cached.get(name)
+        if previous and previous['size'] == st.st_size and previous['mtime'] == st.st_mtime_ns:
+            state[name] = previous
+        else:
+            state[name] = {'size': st.st_size, 'mtime': st.st_mtime_ns,
+                           'sha1': file_hash(path)}
+    return state
+
+
+def same_sources(state, cached):
+    """Return True if two source states describe identical file contents."""
+    return ({name: s['sha1'] for name, s in state.items()} ==
+            {name: s['sha1'] for name, s in (cached or {}).items()})
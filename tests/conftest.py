@@ -0,0 +1,6 @@
+"""Shared pytest setup: make the project root importable as `src`."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,28 @@
+"""Tests for run summaries and controller comparison."""
+
+import os
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from src.analysis.compare import compare_runs
+
+
+def write_run(run_dir, bandwidth):
+    os.makedirs(run_dir)
+    with open(os.path.join(run_dir, 'timestamps.txt'), 'w') as f:
+        f.write('1700000000\n1700000005\n1700000010\n1700000015\n')
+    with open(os.path.join(run_dir, 'bandwidth.txt'), 'w') as f:
+        f.write(bandwidth)
+
+
+def test_corrupt_run_is_reported_and_skipped(tmp_path, capsys):
+    rows = ''.join(f'{1700000000 + t},s1-eth2,1000.00,2000.00,3000.00\n' for t in range(16))
+    write_run(str(tmp_path / 'good'), rows)
+    write_run(str(tmp_path / 'corrupt'), 'not,a\nbwm-ng,file,at,all,really\n')
+
+    report = compare_runs([str(tmp_path)], use_cache=False, workers=1)
+
+    assert [os.path.basename(s['path']) for s in report['runs']] == ['good']
+    assert f"summarizing {tmp_path / 'corrupt'} failed" in capsys.readouterr().out
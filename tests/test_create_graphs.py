@@ -0,0 +1,49 @@
+"""Tests for the cached graph rendering of run directories."""
+
+import json
+import os
+
+import pytest
+
+from src.visualization import create_graphs
+from src.visualization.loaders import TIMESTAMPS_FILE
+
+
+def _render_broken(output_dir, timestamps):
+    raise RuntimeError('bad input')
+
+
+def _render_ok(output_dir, timestamps):
+    with open(os.path.join(output_dir, 'ok.png'), 'wb') as f:
+        f.write(b'png')
+
+
+@pytest.fixture
+def run_dir(tmp_path, monkeypatch):
+    (tmp_path / TIMESTAMPS_FILE).write_text('1700000000\n1700000010\n1700000020\n1700000030\n')
+    monkeypatch.setattr(create_graphs, 'FIGURES', {
+        'broken': (_render_broken, [TIMESTAMPS_FILE], ['broken.png']),
+        'ok': (_render_ok, [TIMESTAMPS_FILE], ['ok.png']),
+    })
+    return tmp_path
+
+
+def test_serial_rendering_reports_failures_and_keeps_going(run_dir, capsys):
+    create_graphs.create_graphs_for_runs([str(run_dir)], workers=1)
+
+    assert 'rendering broken plots' in capsys.readouterr().out
+    assert (run_dir / 'ok.png').exists()
+    cache = json.loads((run_dir / create_graphs.CACHE_FILE).read_text())
+    assert set(cache) == {'ok'}
+
+
+def test_cache_from_older_renderer_is_redrawn(run_dir, monkeypatch):
+    create_graphs.create_graphs_for_runs([str(run_dir)], workers=1)
+    (run_dir / 'ok.png').write_bytes(b'stale')
+
+    create_graphs.create_graphs_for_runs([str(run_dir)], workers=1)
+    assert (run_dir / 'ok.png').read_bytes() == b'stale'
+
+    monkeypatch.setattr(create_graphs, 'GRAPH_VERSION', create_graphs.GRAPH_VERSION + 1)
+    create_graphs.create_graphs_for_runs([str(run_dir)], workers=1)
+    assert (run_dir / 'ok.png').read_bytes() == b'png'
@@ -0,0 +1,68 @@
+"""Tests for the per-switch drop rule model."""
+
+from src.controllers.flow_table import FlowTable
+
+
+def test_add_within_budget_and_refresh():
+    table = FlowTable(3)
+    assert table.add('a', 0.0, 5) == []
+    assert table.add('b', 1.0, 5) == []
+    assert table.add('a', 2.0, 5) == []  # re-install refreshes, no new entry
+    assert len(table) == 2 and 'a' in table
+    assert table.entries['a'].expires == 7.0
+    assert list(table.entries) == ['b', 'a']
+    assert table.utilization == 2 / 3
+
+
+def test_eviction_picks_least_recently_hit():
+    table = FlowTable(2)
+    table.add('a', 0.0)
+    table.add('b', 1.0)
+    table.update_stats('a', 10, 2.0)  # a matched packets, b did not
+    assert table.add('c', 3.0) == ['b']
+    assert list(table.entries) == ['a', 'c']
+    assert table.update_stats('a', 10, 4.0)  # no new packets: not a hit
+    assert table.add('d', 5.0) == ['a']
+    assert table.evictions == 2
+    assert not table.update_stats('a', 11, 6.0)
+
+
+def test_shrink_to_a_smaller_budget():
+    table = FlowTable(4)
+    for i, key in enumerate('abcd'):
+        table.add(key, float(i))
+    assert table.shrink(1) == ['a', 'b', 'c']
+    assert list(table.entries) == ['d']
+
+
+def test_reconcile_only_judges_rules_older_than_the_request():
+    table = FlowTable(10)
+    table.add('gone', 0.0)
+    table.add('kept', 1.0)
+    table.add('young', 5.0)  # installed after the request, may be missing
+    assert table.reconcile({'kept'}, since=4.0) == ['gone']
+    assert set(table.entries) == {'kept', 'young'}
+    assert table.evictions == 0
+
+
+def test_expire_drops_timed_out_rules_only():
+    table = FlowTable(10)
+    table.add('short', 0.0, 5)
+    table.add('long', 0.0, 50)
+    table.add('permanent', 0.0)
+    assert table.expire(5.0) == ['short']
+    assert table.expire(100.0) == ['long']
+    assert list(table.entries) == ['permanent']
+    assert table.remove('permanent') and not table.remove('permanent')
+
+
+def test_connection_flows_share_the_budget_with_drop_rules():
+    # Drop rules are keyed by source, connection flows by their 4-tuple
+    table = FlowTable(3)
+    table.add(0x0a000063, 0.0, 5)
+    forward, reverse = (0x0a000001, 0x0a000002, 40000, 80), (0x0a000002, 0x0a000001, 80, 40000)
+    assert table.add(forward, 1.0) == [] and table.add(reverse, 1.0) == []
+    table.update_stats(0x0a000063, 100, 2.0)
+    assert table.add((0x0a000003, 0x0a000002, 40001, 80), 3.0) == [forward]
+    assert table.reconcile({0x0a000063}, since=4.0) == [reverse, (0x0a000003, 0x0a000002, 40001, 80)]
+    assert list(table.entries) == [0x0a000063]
@@ -0,0 +1,93 @@
+"""Tests for the IPv4 prefix trie behind the controller ACLs."""
+
+import ipaddress
+import random
+
+import pytest
+
+from src.controllers.prefix_trie import ACL_ALLOW, ACL_DENY, PrefixTrie, load_acl
+
+
+def ip(text):
+    return int(ipaddress.IPv4Address(text))
+
+
+def make_trie(*prefixes):
+    trie = PrefixTrie()
+    for prefix, value in prefixes:
+        net = ipaddress.IPv4Network(prefix)
+        trie.insert(int(net.network_address), net.prefixlen, value)
+    return trie
+
+
+def test_longest_prefix_wins_for_overlapping_prefixes():
+    trie = make_trie(('10.0.0.0/8', 'a'), ('10.1.0.0/16', 'b'), ('10.1.2.0/24', 'c'))
+    assert trie.lookup(ip('10.1.2.3')) == 'c'
+    assert trie.lookup(ip('10.1.3.3')) == 'b'
+    assert trie.lookup(ip('10.2.0.1')) == 'a'
+    assert trie.lookup(ip('11.0.0.1'), default='none') == 'none'
+    assert len(trie) == 3
+
+
+def test_default_route_and_host_prefixes():
+    trie = make_trie(('0.0.0.0/0', 'any'), ('192.168.1.1/32', 'host'), ('255.255.255.255/32', 'top'))
+    assert trie.lookup(ip('192.168.1.1')) == 'host'
+    assert trie.lookup(ip('192.168.1.2')) == 'any'
+    assert trie.lookup(ip('255.255.255.255')) == 'top'
+    assert trie.lookup(ip('0.0.0.0')) == 'any'
+
+
+def test_insert_replaces_and_rejects_bad_lengths():
+    trie = make_trie(('10.0.0.0/8', 'a'))
+    trie.insert(ip('10.9.9.9'), 8, 'b')  # host bits are ignored
+    assert len(trie) == 1 and trie.lookup(ip('10.0.0.1')) == 'b'
+    with pytest.raises(ValueError):
+        trie.insert(0, 33, 'x')
+
+
+def test_remove():
+    trie = make_trie(('10.0.0.0/8', 'a'), ('10.1.0.0/16', 'b'), ('10.1.2.0/24', 'c'),
+                     ('0.0.0.0/0', 'any'))
+    assert trie.remove(ip('10.1.0.0'), 16)
+    assert not trie.remove(ip('10.1.0.0'), 16)
+    assert not trie.remove(ip('10.2.0.0'), 16)  # never inserted
+    assert trie.lookup(ip('10.1.3.3')) == 'a'
+    assert trie.lookup(ip('10.1.2.3')) == 'c'
+    assert trie.remove(0, 0)
+    assert trie.lookup(ip('11.0.0.1')) is None
+    assert trie.remove(ip('10.0.0.0'), 8) and trie.remove(ip('10.1.2.0'), 24)
+    assert len(trie) == 0 and trie.lookup(ip('10.1.2.3')) is None
+
+
+def test_matches_linear_scan_after_random_inserts_and_removes():
+    rng = random.Random(1)
+    trie, prefixes = PrefixTrie(), {}
+    for i in range(2000):
+        prefix_len = rng.choice([0, 8, 12, 16, 20, 24, 28, 31, 32])
+        network = rng.getrandbits(32) & ((0xffffffff << (32 - prefix_len)) & 0xffffffff)
+        if prefixes and rng.random() < 0.3:
+            network, prefix_len = rng.choice(list(prefixes))
+            assert trie.remove(network, prefix_len)
+            del prefixes[network, prefix_len]
+        else:
+            trie.insert(network, prefix_len, i)
+            prefixes[network, prefix_len] = i
+    assert len(trie) == len(prefixes)
+
+    for _ in range(2000):
+        address = rng.choice([rng.getrandbits(32)] + [n | rng.getrandbits(4) for n, _ in prefixes])
+        matches = [(length, value) for (network, length), value in prefixes.items()
+                   if length == 0 or (address ^ network) >> (32 - length) == 0]
+        assert trie.lookup(address) == (max(matches)[1] if matches else None)
+
+
+def test_load_acl(tmp_path):
+    path = tmp_path / 'acl.txt'
+    path.write_text('allow 10.0.0.254  # gateway\n\ndeny 10.0.0.0/24\n')
+    trie = load_acl(str(path))
+    assert trie.lookup(ip('10.0.0.254')) == ACL_ALLOW
+    assert trie.lookup(ip('10.0.0.1')) == ACL_DENY
+
+    path.write_text('block 10.0.0.1\n')
+    with pytest.raises(ValueError):
+        load_acl(str(path))
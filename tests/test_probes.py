@@ -0,0 +1,64 @@
+"""Loopback tests for the victim latency and goodput probes."""
+
+import socket
+import threading
+
+from src.monitoring.probes import (run_echo_server, run_goodput_sender, run_goodput_sink,
+                                   run_latency_probe)
+
+
+def _free_port(kind):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start(target, *args, **kwargs):
+    thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+    thread.start()
+    return thread
+
+
+def _rows(path):
+    return [line.split(',') for line in path.read_text().splitlines()]
+
+
+def test_latency_probe_logs_rtt_from_echo_server(tmp_path):
+    port = _free_port(socket.SOCK_DGRAM)
+    output = tmp_path / 'latency.txt'
+    stop = threading.Event()
+    server = _start(run_echo_server, port, bind='127.0.0.1', stop=stop)
+    try:
+        sent, lost = run_latency_probe('127.0.0.1', port, str(output), interval=0.05,
+                                       timeout=0.5, duration=1.0)
+    finally:
+        stop.set()
+        server.join(timeout=2)
+
+    rows = _rows(output)
+    assert len(rows) == sent
+    assert sorted(int(seq) for _, seq, _ in rows) == list(range(sent))
+    rtts = [float(rtt) for _, _, rtt in rows if rtt]
+    assert len(rtts) == sent - lost
+    assert len(rtts) >= sent // 2
+    assert all(0 <= rtt < 500 for rtt in rtts)
+
+
+def test_goodput_sink_logs_bytes_from_sender(tmp_path):
+    port = _free_port(socket.SOCK_STREAM)
+    output = tmp_path / 'goodput.txt'
+    stop, ready = threading.Event(), threading.Event()
+    result = {}
+    sink = _start(lambda: result.update(total=run_goodput_sink(
+        port, str(output), interval=0.2, bind='127.0.0.1', stop=stop, ready=ready)))
+    assert ready.wait(timeout=2)
+    try:
+        sent = run_goodput_sender('127.0.0.1', port, rate=200000, duration=1.0)
+    finally:
+        stop.set()
+        sink.join(timeout=2)
+
+    assert sent > 0
+    assert 0 < result['total'] <= sent
+    rates = [float(rate) for _, rate in _rows(output)]
+    assert rates and max(rates) > 0
@@ -0,0 +1,54 @@
+"""Tests for the background source rate exporter."""
+
+import threading
+import time
+
+import pytest
+
+from src.controllers.rate_export import RateExporter, read_rate_log
+
+
+def test_close_flushes_pending_intervals(tmp_path):
+    path = str(tmp_path / 'rate_hist.bin')
+    exporter = RateExporter(path, top_n=2)
+    exporter.submit(1700000000.0, 1.0, {1: 10, 2: 1, 3: 5})
+    exporter.submit(1700000001.0, 1.0, {})
+    assert exporter.close()
+
+    first, second = read_rate_log(path)
+    assert (first['packets'], first['sources'], first['top']) == (16, 3, [(1, 10), (3, 5)])
+    assert second['packets'] == 0
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_close_returns_when_the_worker_died(tmp_path):
+    def broken_key(source):
+        raise RuntimeError('bad source')
+
+    exporter = RateExporter(str(tmp_path / 'rate_hist.bin'), key=broken_key, max_pending=1)
+    exporter.submit(1700000000.0, 1.0, {1: 10})
+    exporter._thread.join(timeout=2)
+    exporter.submit(1700000001.0, 1.0, {1: 10})  # fills the queue nobody reads
+
+    started = time.monotonic()
+    assert exporter.close(timeout=0.2)
+    assert time.monotonic() - started < 1
+
+
+def test_close_gives_up_on_a_stuck_worker(tmp_path):
+    release = threading.Event()
+
+    def stuck_key(source):
+        release.wait()
+        return source
+
+    exporter = RateExporter(str(tmp_path / 'rate_hist.bin'), key=stuck_key, max_pending=1)
+    exporter.submit(1700000000.0, 1.0, {1: 10})
+    time.sleep(0.1)  # worker takes the first interval and blocks
+    exporter.submit(1700000001.0, 1.0, {1: 10})
+
+    started = time.monotonic()
+    assert not exporter.close(timeout=0.2)
+    assert time.monotonic() - started < 1
+    release.set()
+    assert exporter.close()
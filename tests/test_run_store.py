@@ -0,0 +1,131 @@
+"""Tests for the run store: index, reservation, compaction and extraction."""
+
+import os
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from src.analysis import run_store
+from src.analysis.run_store import (STATUS_COMPLETE, STATUS_FAILED, RunStore, _build_archive,
+                                    _read_archive, _write_npz)
+
+BANDWIDTH = ('1700000001.5,s1-eth1,1250.00,20.00,1270.00,40,2500,12.00,1.00,13.00,2,25,0.00,0.00,0,0\n'
+             '1700000001.5,total,1250.00,20.00,1270.00,40,2500,12.00,1.00,13.00,2,25,0.00,0.00,0,0\n'
+             '1700000002.5,s1-et')  # partial last line, no newline
+FILES = {
+    'timestamps.txt': '1700000000.123\n1700000005.0\n1700000010.0\n1700000025.0\n',
+    'bandwidth.txt': BANDWIDTH,
+    'controller_usage.txt': ('2023-11-14 22:13:21, CPU: 12.50%, MEM: 1.25%, CMD: python3 pox.py misc.rate_limit\n'
+                             '2023-11-14 22:13:22, CPU: 99.00%, MEM: 1.50%, CMD: python3 pox.py misc.rate_limit --profile\n'
+                             'garbage\n'),
+    'probe_latency.txt': '1700000001.000000,0,1.250\n1700000001.200000,1,\n',
+    'flow_table.txt': '1700000002.000,00-00-00-00-00-01,3,1000,0\n',
+    'attack.txt': 'HPING 10.0.0.2: NO FLAGS are set\n',
+}
+BINARY = {'rate_hist.bin': bytes(range(256)), os.path.join('profile', 'stages.txt'): b'parse 1.0\n',
+          'probe_goodput.txt': b'\xff not utf-8'}
+
+
+def populate(run_dir):
+    for name, text in FILES.items():
+        with open(os.path.join(run_dir, name), 'w') as f:
+            f.write(text)
+    for name, data in BINARY.items():
+        os.makedirs(os.path.dirname(os.path.join(run_dir, name)), exist_ok=True)
+        with open(os.path.join(run_dir, name), 'wb') as f:
+            f.write(data)
+    with open(os.path.join(run_dir, 'cont_cpu_plot.png'), 'wb') as f:
+        f.write(b'png')
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RunStore(str(tmp_path / 'store'))
+
+
+def test_create_finish_and_query(store):
+    first = store.create({'topology': 'simple'})
+    store.finish(first, STATUS_FAILED)
+    second = store.create({'topology': 'extended'})
+    store.finish(second)
+
+    assert os.path.realpath(os.path.join(store.root, 'current')) == os.path.realpath(store.run_dir(second))
+    assert [e['id'] for e in store.runs(status=STATUS_COMPLETE)] == [second]
+    assert [e['id'] for e in store.runs(topology='simple')] == [first]
+
+
+def test_reserved_directory_is_adopted(store):
+    run_id = store.reserve('exp-1')
+    assert store.create({'topology': 'simple'}, run_id='exp-1') == run_id
+    assert store.create({'topology': 'simple'}, run_id='exp-1') == 'exp-1-2'
+    with pytest.raises(ValueError):
+        store.reserve('exp-1')
+
+
+def test_compact_and_extract_round_trip(store, tmp_path):
+    run_id = store.create({'topology': 'simple'})
+    populate(store.run_dir(run_id))
+    store.finish(run_id)
+
+    [archive] = store.compact(keep=0)
+    assert not os.path.exists(store.run_dir(run_id))
+    assert store.get(run_id)['location'] == os.path.join('archive', os.path.basename(archive))
+    with open(archive, 'rb') as f:
+        archived = f.read()
+
+    run_dir = store.extract(run_id, str(tmp_path / 'extracted'))
+    for name, text in FILES.items():
+        with open(os.path.join(run_dir, name), 'rb') as f:
+            assert f.read() == text.encode(), name
+    for name, data in BINARY.items():
+        with open(os.path.join(run_dir, name), 'rb') as f:
+            assert f.read() == data, name
+    assert not os.path.exists(os.path.join(run_dir, 'cont_cpu_plot.png'))
+
+    # Rewriting the same runs gives a byte-identical archive
+    _write_npz(archive, _build_archive(_read_archive(archive)))
+    with open(archive, 'rb') as f:
+        assert f.read() == archived
+
+    # Later runs of the same month are merged into the archive
+    later = store.create({'topology': 'extended'})
+    store.finish(later)
+    assert store.compact(keep=0) == [archive]
+    assert {r['id'] for r in _read_archive(archive)} == {run_id, later}
+
+
+def test_running_and_recent_runs_are_kept(store):
+    running = store.create({'topology': 'simple'})
+    done = store.create({'topology': 'extended'})
+    store.finish(done)
+    assert store.compact(keep=1) == []
+    assert os.path.isdir(store.run_dir(running)) and os.path.isdir(store.run_dir(done))
+
+
+def test_full_width_bandwidth_rows_are_stored_in_columns(store):
+    run_id = store.create({'topology': 'simple'})
+    populate(store.run_dir(run_id))
+    store.finish(run_id)
+    [archive] = store.compact(keep=0)
+
+    [record] = _read_archive(archive)
+    table = record['tables']['bandwidth']
+    assert len(table['time']) == 2 and table['packets_out'].tolist() == [25.0, 25.0]
+    assert table['lines.text'].tolist() == ['1700000002.5,s1-et']
+    assert record['tables']['controller']['command'].tolist() == [
+        'python3 pox.py misc.rate_limit', 'python3 pox.py misc.rate_limit --profile']
+
+
+def test_runs_that_do_not_read_back_are_kept(store, monkeypatch):
+    run_id = store.create({'topology': 'simple'})
+    populate(store.run_dir(run_id))
+    store.finish(run_id)
+    # An archive that loses the last line of each metrics file
+    format_table = run_store._format_table
+    monkeypatch.setattr(run_store, '_format_table',
+                        lambda *args: format_table(*args).rpartition('\n')[0])
+
+    store.compact(keep=0)
+    assert os.path.isdir(store.run_dir(run_id))
+    assert store.get(run_id)['location'].startswith('runs')
@@ -0,0 +1,53 @@
+"""Tests for live-reloadable controller parameters."""
+
+import pytest
+
+from src.controllers.runtime_config import ControllerConfig, read_config_file
+
+
+def make_config():
+    return ControllerConfig(choices={'detector': {'fixed', 'sliding'}},
+                            positive=('threshold', 'window', 'block_duration'),
+                            non_negative=('syn_rate',), maximum={'block_duration': 0xffff},
+                            threshold=50, window=1.0, block_duration=5, syn_rate=0,
+                            detector='fixed', verbose=False)
+
+
+def test_update_coerces_strings_and_reports_changes():
+    config = make_config()
+    changed = config.update({'threshold': '100', 'window': '1.0', 'verbose': 'yes'})
+    assert changed == {'threshold': 100, 'verbose': True}
+    assert config.as_dict() == {'threshold': 100, 'window': 1.0, 'block_duration': 5,
+                                'syn_rate': 0, 'detector': 'fixed', 'verbose': True}
+
+
+@pytest.mark.parametrize('values', [
+    {'window': '0'},
+    {'window': '-1.5'},
+    {'threshold': 0},
+    {'block_duration': '0'},
+    {'block_duration': -5},
+    {'block_duration': 70000},
+    {'syn_rate': '-1'},
+    {'detector': 'median'},
+    {'threshold': 'many'},
+    {'unknown': 1},
+])
+def test_update_rejects_invalid_values(values):
+    config = make_config()
+    before = config.as_dict()
+    with pytest.raises(ValueError):
+        config.update(dict(values, verbose='on'))
+    assert config.as_dict() == before  # nothing applied
+
+
+def test_update_accepts_zero_syn_rate():
+    config = make_config()
+    assert config.update({'syn_rate': '200'}) == {'syn_rate': 200}
+    assert config.update({'syn_rate': '0'}) == {'syn_rate': 0}
+
+
+def test_read_config_file(tmp_path):
+    path = tmp_path / 'rate_limit.conf'
+    path.write_text('# tuning\nthreshold = 80  # pps\n\nwindow=2\n')
+    assert read_config_file(str(path)) == {'threshold': '80', 'window': '2'}
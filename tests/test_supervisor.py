@@ -0,0 +1,116 @@
+"""Tests for the asyncio process supervisor, using small Python children."""
+
+import signal
+import sys
+import time
+
+import pytest
+
+from src.network.supervisor import FileSink, ProcessSupervisor
+
+
+def python(code):
+    return [sys.executable, '-u', '-c', code]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not met in time')
+        time.sleep(0.01)
+
+
+class LineSink:
+    """Collects lines and records whether the supervisor closed it."""
+
+    def __init__(self):
+        self.lines = []
+        self.closed = False
+
+    def __call__(self, line):
+        self.lines.append(line)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def supervisor():
+    sup = ProcessSupervisor()
+    yield sup
+    sup.close(timeout=1.0)
+
+
+def test_start_stream_stop(supervisor):
+    sink = LineSink()
+    supervisor.start('child', python("print('a'); print('b'); import time; time.sleep(30)"), sink)
+    wait_for(lambda: len(sink.lines) == 2)
+    assert supervisor.running() == ['child']
+
+    assert supervisor.stop('child') == -signal.SIGTERM
+    assert sink.lines == ['a\n', 'b\n']
+    assert sink.closed
+    assert supervisor.running() == []
+
+
+def test_stop_unknown_child(supervisor):
+    assert supervisor.stop('missing') is None
+
+
+def test_start_twice_is_rejected(supervisor):
+    supervisor.start('child', python('import time; time.sleep(30)'))
+    with pytest.raises(RuntimeError):
+        supervisor.start('child', python('pass'))
+
+
+def test_sink_is_closed_when_spawn_fails(supervisor, tmp_path):
+    sink = FileSink(str(tmp_path / 'missing.txt'))
+    with pytest.raises(OSError):
+        supervisor.start('missing', [str(tmp_path / 'no-such-program')], sink)
+    assert sink._file.closed
+    assert supervisor.running() == []
+
+
+def test_sigterm_escalates_to_kill(supervisor):
+    sink = LineSink()
+    code = ("import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            "print('ready'); time.sleep(30)")
+    supervisor.start('stubborn', python(code), sink)
+    wait_for(lambda: sink.lines == ['ready\n'])
+
+    start = time.monotonic()
+    assert supervisor.stop('stubborn', timeout=0.5) == -signal.SIGKILL
+    assert time.monotonic() - start < 5.0
+
+
+def test_stop_drains_output_written_on_exit(supervisor):
+    # Like hping3 on SIGINT: the child prints its statistics while exiting
+    sink = LineSink()
+    code = ("import signal, sys, time\n"
+            "def done(*_):\n"
+            "    print('\\n'.join(f'stat {i}' for i in range(5000)))\n"
+            "    sys.exit(0)\n"
+            "signal.signal(signal.SIGINT, done)\n"
+            "print('ready')\n"
+            "time.sleep(30)\n")
+    supervisor.start('attack', python(code), sink)
+    wait_for(lambda: sink.lines == ['ready\n'])
+
+    assert supervisor.stop('attack', sig=signal.SIGINT) == 0
+    assert len(sink.lines) == 5001
+    assert sink.lines[-1] == 'stat 4999\n'
+
+
+def test_file_sink_and_close(supervisor, tmp_path):
+    path = tmp_path / 'out.txt'
+    supervisor.start_many([
+        ('writer', python("print('x' * 10, flush=True); import time; time.sleep(30)"),
+         FileSink(str(path))),
+        ('sleeper', python('import time; time.sleep(30)'), None),
+    ])
+    wait_for(lambda: path.read_text() == 'x' * 10 + '\n')
+
+    supervisor.close(timeout=1.0)
+    assert supervisor.running() == []
+    supervisor.close()  # closing twice is harmless
@@ -0,0 +1,72 @@
+"""Tests for the rotating Bloom filter and handshake validation of SynGuard."""
+
+from src.controllers.syn_guard import (SYN_DROP, SYN_FORWARD, SYN_REPEAT, RotatingBloomFilter,
+                                       SynGuard)
+
+CLIENT, SERVER, ATTACKER = 0x0a000001, 0x0a000002, 0x0a000063
+CLIENT_PORT, SERVER_PORT, ATTACKER_PORT = (1, 1), (1, 2), (1, 3)
+CLIENT_ISN, SERVER_ISN = 1000, 50000
+
+
+def test_bloom_filter_entries_expire_after_one_to_two_intervals():
+    bloom = RotatingBloomFilter(1 << 12, 3, interval=5.0)
+    bloom.add('a', 0.0)
+    assert bloom.contains('a', 4.9)
+    assert bloom.contains('a', 5.0)  # rotated into the previous generation
+    bloom.add('b', 6.0)
+    assert not bloom.contains('a', 10.0)  # second rotation drops it
+    assert bloom.contains('b', 10.0)
+    assert not bloom.contains('b', 20.0)  # a gap of two intervals clears both
+    assert not bloom.contains('never added', 20.0)
+
+
+def handshake(guard, now=0.0):
+    """Client SYN and server SYN-ACK; returns the SYN verdict and SYN-ACK result."""
+    verdict = guard.syn(CLIENT, SERVER, 40000, 80, CLIENT_ISN, CLIENT_PORT, now)
+    recorded = guard.syn_ack(SERVER, CLIENT, 80, 40000, SERVER_ISN, CLIENT_ISN + 1,
+                             SERVER_PORT, now)
+    return verdict, recorded
+
+
+def test_syn_syn_ack_ack_validates():
+    guard = SynGuard(bits=1 << 16, timeout=5.0)
+    assert handshake(guard) == (SYN_FORWARD, True)
+    assert guard.ack(CLIENT, SERVER, 40000, 80, CLIENT_ISN + 1, SERVER_ISN + 1,
+                     CLIENT_PORT, 1.0)
+    assert guard.validated == 1
+    # The handshake is forgotten once the timeout has rotated it out
+    assert not guard.ack(CLIENT, SERVER, 40000, 80, CLIENT_ISN + 1, SERVER_ISN + 1,
+                         CLIENT_PORT, 11.0)
+
+
+def test_spoofed_acks_are_rejected():
+    guard = SynGuard(bits=1 << 16, timeout=5.0)
+    handshake(guard)
+    # Blind spoofer: right client ISN, guessed server ISN
+    assert not guard.ack(CLIENT, SERVER, 40000, 80, CLIENT_ISN + 1, 12345, CLIENT_PORT, 1.0)
+    # Right numbers from the wrong ingress port
+    assert not guard.ack(CLIENT, SERVER, 40000, 80, CLIENT_ISN + 1, SERVER_ISN + 1,
+                         ATTACKER_PORT, 1.0)
+    # ACK without any SYN
+    assert not guard.ack(ATTACKER, SERVER, 40001, 80, 1, 1, ATTACKER_PORT, 1.0)
+    assert guard.unmatched == 3 and guard.validated == 0
+
+
+def test_syn_ack_forged_from_the_syn_port_is_not_recorded():
+    guard = SynGuard(bits=1 << 16, timeout=5.0)
+    guard.syn(ATTACKER, SERVER, 40000, 80, CLIENT_ISN, ATTACKER_PORT, 0.0)
+    assert not guard.syn_ack(SERVER, ATTACKER, 80, 40000, SERVER_ISN, CLIENT_ISN + 1,
+                             ATTACKER_PORT, 0.0)
+    assert not guard.ack(ATTACKER, SERVER, 40000, 80, CLIENT_ISN + 1, SERVER_ISN + 1,
+                         ATTACKER_PORT, 0.5)
+    # A SYN-ACK that acknowledges no recorded SYN is ignored as well
+    assert not guard.syn_ack(SERVER, CLIENT, 80, 40000, SERVER_ISN, 7, SERVER_PORT, 0.0)
+
+
+def test_repeated_syns_and_rate_budget():
+    guard = SynGuard(bits=1 << 16, timeout=5.0, syn_rate=2)
+    assert guard.syn(CLIENT, SERVER, 40000, 80, 1, CLIENT_PORT, 0.0) == SYN_FORWARD
+    assert guard.syn(CLIENT, SERVER, 40001, 80, 2, CLIENT_PORT, 0.1) == SYN_REPEAT
+    assert guard.syn(ATTACKER, SERVER, 40002, 80, 3, ATTACKER_PORT, 0.2) == SYN_DROP
+    assert guard.syn(ATTACKER, SERVER, 40002, 80, 3, ATTACKER_PORT, 1.2) == SYN_FORWARD
+    assert (guard.syns, guard.dropped) == (4, 1)
@@ -0,0 +1,41 @@
+"""Tests for the shared-memory telemetry bus."""
+
+import os
+
+import pytest
+
+from src.monitoring.telemetry import (KIND_BANDWIDTH, MAX_KEYS, TelemetryPublisher,
+                                      TelemetrySubscriber, bandwidth_sink)
+
+
+@pytest.fixture
+def channel():
+    name = f'test-{os.getpid()}'
+    publisher = TelemetryPublisher(name, capacity=1024)
+    yield name, publisher
+    publisher.close()
+
+
+def test_publish_and_poll(channel):
+    name, publisher = channel
+    subscriber = TelemetrySubscriber(name, from_start=True)
+    publisher.publish(KIND_BANDWIDTH, publisher.key('s1-eth1'), 10.0, 20.0, 1.0)
+
+    [record] = subscriber.poll()
+    assert (record.kind, record.a, record.b, record.timestamp) == (KIND_BANDWIDTH, 10.0, 20.0, 1.0)
+    assert subscriber.key_name(record.key) == 's1-eth1'
+    subscriber.close()
+
+
+def test_bandwidth_sink_drops_interfaces_beyond_max_keys(channel):
+    name, publisher = channel
+    subscriber = TelemetrySubscriber(name, from_start=True)
+    sink = bandwidth_sink(publisher)
+    interfaces = [f'veth{i}' for i in range(MAX_KEYS + 8)]
+    for interface in interfaces:
+        sink(f'1700000000,{interface},100.0,200.0,300.0\n')
+    sink('not,a,bwm-ng,line\n')
+
+    records = subscriber.poll()
+    assert [subscriber.key_name(r.key) for r in records] == interfaces[:MAX_KEYS]
+    subscriber.close()